@@ -1,19 +1,74 @@
 """
 Executor Agent: Executes the plan by calling appropriate tools
 """
-from typing import Dict, Any, List
+import asyncio
+import contextvars
+import copy
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator, AsyncIterable, Tuple
 from tools.github_tool import github_tool
 from tools.weather_tool import weather_tool
+from tools.tool_cache import ToolResultCache
+from utils.single_flight import SingleFlight
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+TOOL_CALL_SECONDS = metrics.histogram(
+    "tool_call_seconds", "Executor step latency per tool action, including cache hits", ["action", "status"]
+)
+BULK_REPOSITORIES = metrics.counter(
+    "github_bulk_repositories_total", "github_info steps served by merged bulk lookups", ["source"]
+)
 
 
 class ExecutorAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        parallel: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+        step_timeout: Optional[float] = None,
+        cache: Optional[ToolResultCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        bulk_github_info: Optional[bool] = None
+    ):
+        self.cache = cache if cache is not None else ToolResultCache(forecast_reducer=weather_tool.forecast_reducer)
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+        
+        # Cache lookups first; on a miss, identical in-flight calls share one request
         self.tool_map = {
-            "github_search": self._github_search,
-            "github_info": self._github_info,
-            "weather_current": self._weather_current,
-            "weather_forecast": self._weather_forecast
+            "github_search": self._cached("github_search", self._coalesced("github_search", self._github_search)),
+            "github_info": self._cached("github_info", self._coalesced("github_info", self._github_info)),
+            "weather_current": self._cached("weather_current", self._coalesced("weather_current", self._weather_current)),
+            "weather_forecast": self._cached("weather_forecast", self._coalesced("weather_forecast", self._weather_forecast)),
+            "weather_batch": self._cached("weather_batch", self._coalesced("weather_batch", self._weather_batch))
+        }
+        self.async_tool_map = {
+            "github_search": self._acached("github_search", self._acoalesced("github_search", self._agithub_search)),
+            "github_info": self._acached("github_info", self._acoalesced("github_info", self._agithub_info)),
+            "weather_current": self._acached("weather_current", self._acoalesced("weather_current", self._aweather_current)),
+            "weather_forecast": self._acached("weather_forecast", self._acoalesced("weather_forecast", self._aweather_forecast)),
+            "weather_batch": self._acached("weather_batch", self._acoalesced("weather_batch", self._aweather_batch))
         }
+        
+        # Planner emits independent steps, so they can safely run concurrently
+        if parallel is None:
+            parallel = os.getenv("EXECUTOR_PARALLEL", "true").lower() in ("1", "true", "yes")
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("EXECUTOR_MAX_CONCURRENCY", "4"))
+        if step_timeout is None:
+            step_timeout = float(os.getenv("EXECUTOR_STEP_TIMEOUT", "30"))
+        
+        self.parallel = parallel
+        self.max_concurrency = max(1, max_concurrency)
+        self.step_timeout = step_timeout if step_timeout > 0 else None
+        
+        # Sibling github_info steps are merged into one GraphQL request
+        if bulk_github_info is None:
+            bulk_github_info = os.getenv("EXECUTOR_BULK_GITHUB_INFO", "true").lower() in ("1", "true", "yes")
+        self.bulk_github_info = bulk_github_info
     
     def execute_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -33,18 +88,272 @@ class ExecutorAgent:
         
         steps = plan.get("steps", [])
         
-        for step in steps:
-            step_result = self._execute_step(step)
-            results["steps_executed"].append(step_result)
+        if self.parallel and len(steps) > 1:
+            results["steps_executed"] = self._execute_parallel(steps)
+        else:
+            prefetched = self._prefetch_repositories(steps)
+            for step in steps:
+                step_result = self._execute_step(step, prefetched)
+                results["steps_executed"].append(step_result)
         
         return results
     
-    def _execute_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+    async def aexecute_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of execute_plan; steps run as concurrent coroutines
+        
+        Args:
+            plan: Plan dictionary from Planner Agent
+        
+        Returns:
+            Dictionary with execution results
+        """
+        step_results = [step_result async for step_result in self.astream_plan(plan)]
+        
+        return {
+            "task_summary": plan.get("task_summary", ""),
+            "steps_executed": sorted(step_results, key=lambda r: r["step_number"]),
+            "errors": []
+        }
+    
+    async def aexecute_plans(
+        self,
+        plans: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Execute many plans at once, running each distinct tool call only once
+        
+        Steps are deduplicated across all plans by their normalized
+        parameters (e.g. 40 plans asking for London weather make one call),
+        then run under a single global concurrency limit.
+        
+        Args:
+            plans: Plan dictionaries from Planner Agent
+            max_concurrency: Global limit on concurrent tool calls
+        
+        Returns:
+            (execution results per plan, call counts with "planned" and "executed")
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+        unique_steps: Dict[str, Dict[str, Any]] = {}
+        planned = 0
+        
+        keyed_plans = []
+        for plan in plans:
+            keyed_steps = []
+            for step in plan.get("steps", []):
+                key = self._call_key(step)
+                unique_steps.setdefault(key, step)
+                keyed_steps.append((key, step))
+                planned += 1
+            keyed_plans.append((plan, keyed_steps))
+        
+        # Repository lookups from every plan share bulk requests, made alongside the other calls
+        prefetch = self._start_aprefetch(list(unique_steps.values()))
+        
+        async def run(step: Dict[str, Any]) -> Dict[str, Any]:
+            prefetched = await self._await_prefetch(step, prefetch)
+            async with semaphore:
+                return await self._aexecute_step(step, prefetched)
+        
+        unique_calls = {key: asyncio.ensure_future(run(step)) for key, step in unique_steps.items()}
+        try:
+            await asyncio.gather(*unique_calls.values())
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+        
+        all_results = []
+        for plan, keyed_steps in keyed_plans:
+            steps_executed = []
+            for key, step in keyed_steps:
+                shared = unique_calls[key].result()
+                steps_executed.append({
+                    **shared,
+                    "step_number": step.get("step_number", 0),
+                    "reasoning": step.get("reasoning", "")
+                })
+            all_results.append({
+                "task_summary": plan.get("task_summary", ""),
+                "steps_executed": sorted(steps_executed, key=lambda r: r["step_number"]),
+                "errors": []
+            })
+        
+        return all_results, {"planned": planned, "executed": len(unique_calls)}
+    
+    def _call_key(self, step: Dict[str, Any]) -> str:
+        """Identity of a tool call, independent of step number and reasoning"""
+        action = step.get("action", "")
+        parameters = step.get("parameters") or {}
+        try:
+            return self.cache.make_key(action, parameters)
+        except (TypeError, ValueError, AttributeError):
+            return f"{action}?{json.dumps(parameters, sort_keys=True, default=str)}"
+    
+    async def astream_plan(self, plan: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the plan, yielding each step result as soon as it completes
+        
+        Args:
+            plan: Plan dictionary from Planner Agent
+        
+        Yields:
+            Step results in completion order (plan order when not parallel)
+        """
+        steps = plan.get("steps", [])
+        prefetch = self._start_aprefetch(steps)
+        
+        async def planned_steps() -> AsyncIterator[Dict[str, Any]]:
+            for step in steps:
+                yield step
+        
+        try:
+            async for step_result in self.astream_steps(planned_steps(), prefetch):
+                yield step_result
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+    
+    async def astream_steps(
+        self,
+        steps: AsyncIterable[Dict[str, Any]],
+        prefetch: Optional[asyncio.Future] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute steps as they arrive, e.g. while the planner is still streaming
+        
+        Args:
+            steps: Async iterable of plan steps
+            prefetch: Running bulk lookup (from _start_aprefetch) that github_info steps wait for
+        
+        Yields:
+            Step results in completion order (arrival order when not parallel)
+        """
+        if not self.parallel:
+            async for step in steps:
+                yield await self._aexecute_step(step, await self._await_prefetch(step, prefetch))
+            return
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed: asyncio.Queue = asyncio.Queue()
+        tasks: List[asyncio.Future] = []
+        
+        async def run(step: Dict[str, Any]):
+            prefetched = await self._await_prefetch(step, prefetch)
+            async with semaphore:
+                await completed.put(await self._aexecute_step(step, prefetched))
+        
+        async def feed():
+            async for step in steps:
+                tasks.append(asyncio.ensure_future(run(step)))
+            await asyncio.gather(*tasks)
+        
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                next_result = asyncio.ensure_future(completed.get())
+                done, _ = await asyncio.wait({next_result, feeder}, return_when=FIRST_COMPLETED)
+                if next_result in done:
+                    yield next_result.result()
+                    continue
+                
+                next_result.cancel()
+                while not completed.empty():
+                    yield completed.get_nowait()
+                feeder.result()  # surface errors from the step source
+                break
+        finally:
+            # Consumer went away (e.g. client disconnected): stop outstanding steps
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+    
+    def _execute_parallel(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute independent steps concurrently on a bounded thread pool
+        
+        Sibling github_info steps are merged into one bulk lookup that runs
+        on the same pool; only those steps wait for it.
+        
+        Args:
+            steps: Plan steps
+        
+        Returns:
+            Step results ordered by step_number
+        """
+        started_at: Dict[int, float] = {}
+        step_results: List[Optional[Dict[str, Any]]] = [None] * len(steps)
+        
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(steps)),
+            thread_name_prefix="executor-step"
+        )
+        # Each worker runs in a copy of the caller's context so step spans
+        # attach to the current trace. The bulk lookup is submitted first, so
+        # a worker picks it up before any step that waits on it
+        prefetch = None
+        if self._bulk_lookups(steps):
+            prefetch = pool.submit(contextvars.copy_context().run, self._prefetch_repositories, steps)
+        
+        def run(index: int, step: Dict[str, Any]) -> Dict[str, Any]:
+            started_at[index] = time.monotonic()
+            waits = prefetch is not None and step.get("action") == "github_info"
+            return self._execute_step(step, prefetch.result() if waits else None)
+        
+        # Steps waiting on the bulk lookup queue behind the ones doing their own requests
+        order = sorted(range(len(steps)), key=lambda i: prefetch is not None and steps[i].get("action") == "github_info")
+        futures = {pool.submit(contextvars.copy_context().run, run, i, steps[i]): i for i in order}
+        pending = set(futures)
+        
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=self._poll_interval(), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    step_results[futures[future]] = future.result()
+                
+                if self.step_timeout is None:
+                    continue
+                
+                # The timeout only counts time a step has actually been running,
+                # not time spent queued behind the concurrency limit
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started_at and now - started_at[index] > self.step_timeout:
+                        pending.discard(future)
+                        step_results[index] = self._timeout_result(steps[index])
+        finally:
+            # Timed-out workers cannot be interrupted; let them finish in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        return sorted(step_results, key=lambda r: r["step_number"])
+    
+    def _poll_interval(self) -> Optional[float]:
+        """How long to block waiting for a step before re-checking timeouts"""
+        if self.step_timeout is None:
+            return None
+        return min(0.1, self.step_timeout)
+    
+    def _timeout_result(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the error result for a step that exceeded step_timeout"""
+        return {
+            "step_number": step.get("step_number", 0),
+            "action": step.get("action", ""),
+            "reasoning": step.get("reasoning", ""),
+            "status": "error",
+            "data": None,
+            "error": f"Step timed out after {self.step_timeout}s"
+        }
+    
+    def _execute_step(self, step: Dict[str, Any], prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute a single step
         
         Args:
             step: Step dictionary with action and parameters
+            prefetched: Results already fetched in bulk, by call key
         
         Returns:
             Step result with data or error
@@ -63,21 +372,251 @@ class ExecutorAgent:
             "error": None
         }
         
-        try:
-            if action in self.tool_map:
-                tool_function = self.tool_map[action]
+        if action not in self.tool_map:
+            result["status"] = "error"
+            result["error"] = f"Unknown tool: {action}"
+            return result
+        
+        started = time.perf_counter()
+        with tracer.span("step", tool=action, step_number=step_number) as span:
+            try:
+                tool_function = self._prefetched_tool(step, prefetched) or self.tool_map[action]
                 data = tool_function(parameters)
                 result["data"] = data
-            else:
+            
+            except Exception as e:
                 result["status"] = "error"
-                result["error"] = f"Unknown tool: {action}"
+                result["error"] = str(e)
+            
+            span.set_attributes(status=result["status"], error=result["error"])
+        
+        TOOL_CALL_SECONDS.observe(time.perf_counter() - started, action=action, status=result["status"])
+        return result
+    
+    async def _aexecute_step(self, step: Dict[str, Any], prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async variant of _execute_step, enforcing step_timeout"""
+        step_number = step.get("step_number", 0)
+        action = step.get("action", "")
+        parameters = step.get("parameters", {})
+        reasoning = step.get("reasoning", "")
+        
+        result = {
+            "step_number": step_number,
+            "action": action,
+            "reasoning": reasoning,
+            "status": "success",
+            "data": None,
+            "error": None
+        }
         
-        except Exception as e:
+        served = self._prefetched_tool(step, prefetched)
+        if served is not None:
+            call = self._aserve(served, parameters)
+        elif action in self.async_tool_map:
+            call = self.async_tool_map[action](parameters)
+        elif action in self.tool_map:
+            # Tools without a native async variant run in a worker thread
+            call = asyncio.to_thread(self.tool_map[action], parameters)
+        else:
             result["status"] = "error"
-            result["error"] = str(e)
+            result["error"] = f"Unknown tool: {action}"
+            return result
         
+        started = time.perf_counter()
+        with tracer.span("step", tool=action, step_number=step_number) as span:
+            try:
+                result["data"] = await asyncio.wait_for(call, timeout=self.step_timeout)
+            
+            except asyncio.TimeoutError:
+                result = self._timeout_result(step)
+                span.set_attributes(status="timeout")
+                TOOL_CALL_SECONDS.observe(time.perf_counter() - started, action=action, status="timeout")
+                return result
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+            
+            span.set_attributes(status=result["status"], error=result["error"])
+        
+        TOOL_CALL_SECONDS.observe(time.perf_counter() - started, action=action, status=result["status"])
         return result
     
+    def _bulk_lookups(self, steps: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str, Dict[str, Any]]]:
+        """
+        Distinct github_info calls worth merging, by call key
+        
+        Returns:
+            (owner, repo, parameters) per call key; empty unless at least two can be merged
+        """
+        if not (self.bulk_github_info and github_tool.bulk_enabled):
+            return {}
+        
+        lookups = {}
+        for step in steps:
+            parameters = step.get("parameters") or {}
+            owner, repo = parameters.get("owner"), parameters.get("repo")
+            if step.get("action") == "github_info" and isinstance(owner, str) and isinstance(repo, str) and owner and repo:
+                lookups.setdefault(self._call_key(step), (owner, repo, parameters))
+        return lookups if len(lookups) > 1 else {}
+    
+    def _split_cached(self, lookups: Dict[str, Tuple[str, str, Dict[str, Any]]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Serve merged calls from the result cache where possible; returns (found, missing keys)"""
+        found, missing = {}, []
+        for key, (_, _, parameters) in lookups.items():
+            hit, value = self.cache.get("github_info", parameters) if self.cache.is_cacheable("github_info") else (False, None)
+            if hit:
+                found[key] = value
+                BULK_REPOSITORIES.inc(source="cache")
+            else:
+                missing.append(key)
+        return found, missing
+    
+    def _store_bulk(
+        self,
+        prefetched: Dict[str, Any],
+        lookups: Dict[str, Tuple[str, str, Dict[str, Any]]],
+        missing: List[str],
+        repositories: List[Optional[Dict[str, Any]]]
+    ):
+        """Record bulk lookup results per call key; unresolved repositories become step errors"""
+        for key, repository in zip(missing, repositories):
+            owner, repo, parameters = lookups[key]
+            if repository is None:
+                prefetched[key] = Exception(f"GitHub API Error: repository {owner}/{repo} not found")
+                continue
+            prefetched[key] = repository
+            if self.cache.is_cacheable("github_info"):
+                self.cache.set("github_info", parameters, repository)
+        BULK_REPOSITORIES.inc(len(missing), source="bulk")
+    
+    def _prefetch_repositories(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge sibling github_info steps into one bulk lookup
+        
+        Args:
+            steps: Plan steps
+        
+        Returns:
+            Result (or exception) per call key for the merged steps; steps
+            not in it run normally, as do all of them if the bulk call fails
+        """
+        lookups = self._bulk_lookups(steps)
+        if not lookups:
+            return {}
+        
+        prefetched, missing = self._split_cached(lookups)
+        if missing:
+            with tracer.span("github_bulk", repositories=len(missing)) as span:
+                try:
+                    repositories = github_tool.get_repositories_info([lookups[key][:2] for key in missing])
+                except Exception as e:
+                    span.set_attributes(error=str(e))
+                    return prefetched
+            self._store_bulk(prefetched, lookups, missing, repositories)
+        return prefetched
+    
+    def _start_aprefetch(self, steps: List[Dict[str, Any]]) -> Optional[asyncio.Future]:
+        """Start the bulk lookup for sibling github_info steps as a task, or None if there is nothing to merge"""
+        if not self._bulk_lookups(steps):
+            return None
+        return asyncio.ensure_future(self._aprefetch_repositories(steps))
+    
+    async def _await_prefetch(self, step: Dict[str, Any], prefetch: Optional[asyncio.Future]) -> Optional[Dict[str, Any]]:
+        """Bulk results once the lookup finishes for github_info steps; None for other steps"""
+        if prefetch is None or step.get("action") != "github_info":
+            return None
+        # Shielded: one step timing out must not cancel the lookup for its siblings
+        return await asyncio.shield(prefetch)
+    
+    async def _aprefetch_repositories(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Async variant of _prefetch_repositories"""
+        lookups = self._bulk_lookups(steps)
+        if not lookups:
+            return {}
+        
+        prefetched, missing = self._split_cached(lookups)
+        if missing:
+            with tracer.span("github_bulk", repositories=len(missing)) as span:
+                try:
+                    repositories = await github_tool.aget_repositories_info([lookups[key][:2] for key in missing])
+                except Exception as e:
+                    span.set_attributes(error=str(e))
+                    return prefetched
+            self._store_bulk(prefetched, lookups, missing, repositories)
+        return prefetched
+    
+    def _prefetched_tool(self, step: Dict[str, Any], prefetched: Optional[Dict[str, Any]]) -> Optional[Callable]:
+        """Tool function serving a step from bulk-prefetched results, or None if it wasn't prefetched"""
+        if not prefetched:
+            return None
+        key = self._call_key(step)
+        if key not in prefetched:
+            return None
+        
+        def serve(params: Dict[str, Any]) -> Any:
+            tracer.set_attributes(bulk=True)
+            value = prefetched[key]
+            if isinstance(value, Exception):
+                raise value
+            return value
+        
+        return serve
+    
+    async def _aserve(self, served: Callable, params: Dict[str, Any]) -> Any:
+        """Awaitable wrapper for a prefetched result"""
+        return served(params)
+    
+    def _coalesced(self, action: str, tool_function: Callable) -> Callable:
+        """
+        Wrap a tool function so concurrent identical calls share one request;
+        each caller gets its own copy of the shared result to mutate
+        """
+        def wrapper(params: Dict[str, Any]) -> Any:
+            key = self._call_key({"action": action, "parameters": params})
+            return copy.deepcopy(self.single_flight.do(key, lambda: tool_function(params), label=action))
+        
+        return wrapper
+    
+    def _acoalesced(self, action: str, tool_function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Wrap an async tool function so concurrent identical calls share one request"""
+        async def wrapper(params: Dict[str, Any]) -> Any:
+            key = self._call_key({"action": action, "parameters": params})
+            return copy.deepcopy(await self.single_flight.ado(key, lambda: tool_function(params), label=action))
+        
+        return wrapper
+    
+    def _cached(self, action: str, tool_function: Callable) -> Callable:
+        """Wrap a tool function with the result cache"""
+        if not self.cache.is_cacheable(action):
+            return tool_function
+        
+        def wrapper(params: Dict[str, Any]) -> Any:
+            found, value = self.cache.get(action, params)
+            tracer.set_attributes(cache_hit=found)
+            if found:
+                return value
+            value = tool_function(params)
+            self.cache.set(action, params, value)
+            return value
+        
+        return wrapper
+    
+    def _acached(self, action: str, tool_function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Wrap an async tool function with the result cache"""
+        if not self.cache.is_cacheable(action):
+            return tool_function
+        
+        async def wrapper(params: Dict[str, Any]) -> Any:
+            found, value = self.cache.get(action, params)
+            tracer.set_attributes(cache_hit=found)
+            if found:
+                return value
+            value = await tool_function(params)
+            self.cache.set(action, params, value)
+            return value
+        
+        return wrapper
+    
     # Tool wrapper methods
     def _github_search(self, params: Dict[str, Any]) -> Any:
         """Execute GitHub search"""
@@ -102,7 +641,53 @@ class ExecutorAgent:
         """Execute weather forecast fetch"""
         city = params.get("city", "")
         units = params.get("units", "metric")
-        return weather_tool.get_forecast(city, units)
+        days = params.get("days")
+        aggregation = params.get("aggregation")
+        series = bool(params.get("series", False))
+        return weather_tool.get_forecast(city, units, days, aggregation, series)
+    
+    def _weather_batch(self, params: Dict[str, Any]) -> Any:
+        """Execute a multi-city weather fetch"""
+        cities = params.get("cities") or []
+        units = params.get("units", "metric")
+        forecast = bool(params.get("forecast", False))
+        return weather_tool.get_weather_batch(cities, units, forecast, params.get("days"), params.get("aggregation"))
+    
+    # Async tool wrapper methods
+    async def _agithub_search(self, params: Dict[str, Any]) -> Any:
+        """Execute GitHub search asynchronously"""
+        query = params.get("query", "")
+        limit = params.get("limit", 5)
+        sort = params.get("sort", "stars")
+        return await github_tool.asearch_repositories(query, sort, limit)
+    
+    async def _agithub_info(self, params: Dict[str, Any]) -> Any:
+        """Execute GitHub repo info fetch asynchronously"""
+        owner = params.get("owner", "")
+        repo = params.get("repo", "")
+        return await github_tool.aget_repository_info(owner, repo)
+    
+    async def _aweather_current(self, params: Dict[str, Any]) -> Any:
+        """Execute current weather fetch asynchronously"""
+        city = params.get("city", "")
+        units = params.get("units", "metric")
+        return await weather_tool.aget_current_weather(city, units)
+    
+    async def _aweather_forecast(self, params: Dict[str, Any]) -> Any:
+        """Execute weather forecast fetch asynchronously"""
+        city = params.get("city", "")
+        units = params.get("units", "metric")
+        days = params.get("days")
+        aggregation = params.get("aggregation")
+        series = bool(params.get("series", False))
+        return await weather_tool.aget_forecast(city, units, days, aggregation, series)
+    
+    async def _aweather_batch(self, params: Dict[str, Any]) -> Any:
+        """Execute a multi-city weather fetch asynchronously"""
+        cities = params.get("cities") or []
+        units = params.get("units", "metric")
+        forecast = bool(params.get("forecast", False))
+        return await weather_tool.aget_weather_batch(cities, units, forecast, params.get("days"), params.get("aggregation"))
 
 
 # Singleton instance
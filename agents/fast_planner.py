@@ -0,0 +1,344 @@
+"""
+Fast-path planner: deterministic intent matching for simple tasks
+
+Recognizes common requests ("weather in X", "forecast for X", "info about
+owner/repo", "top N <topic> repositories") and builds the same plan JSON
+the LLM planner produces, so those tasks skip the LLM round trip. Tasks
+with any clause it cannot confidently map to a tool are left to the LLM.
+"""
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from agents.plan_cache import extract_entities
+from tools.forecast_reducer import MAX_READINGS, READINGS_PER_DAY
+
+_CLAUSE_SPLIT = re.compile(r"\s*([,;&]|\band then\b|\bthen\b|\band also\b|\balso\b|\band\b|\bplus\b)\s*", re.IGNORECASE)
+_FILLER = re.compile(
+    r"\b(?:please|can|could|would|you|tell|show|give|me|us|i|want|need|to|know|find|get|fetch|"
+    r"look|up|check|what's|whats|what|is|are|the|a|an|too|as|well)\b",
+    re.IGNORECASE
+)
+# Words that may appear around a weather/repo mention without changing its meaning
+_INTENT_WORDS = re.compile(
+    r"\b(?:weather|forecast|temperature|current|currently|today|now|right|like|in|for|at|of|"
+    r"\d+-day|\d+|day|days|five|info|information|details?|about|stats|statistics|"
+    r"repo|repository|on|github|stars|how|many|it|does|have)\b",
+    re.IGNORECASE
+)
+_PLACE_ONLY = re.compile(r"^(?:in\s+|for\s+|at\s+)?([A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){0,2})[?.!]*$")
+# "D.C.", "NY", "UK": after a comma these qualify the place before them
+_REGION_ABBREVIATION = re.compile(r"^[A-Z](?:\.?[A-Z]){1,2}\.?$")
+# Words the city pattern can sweep up that are never part of a place name
+_NOT_CITY_WORDS = frozenset((
+    "celsius", "fahrenheit", "kelvin", "metric", "imperial", "degrees", "units",
+    "today", "tomorrow", "tonight", "yesterday", "now", "this", "next", "last", "weekend", "week",
+    "morning", "afternoon", "evening", "night", "monday", "tuesday", "wednesday", "thursday",
+    "friday", "saturday", "sunday",
+    "in", "for", "at", "on", "with", "without", "during", "by", "from", "to", "of", "and", "or"
+))
+_REPO_MENTION = re.compile(r"\b[A-Za-z0-9][\w.-]*/[\w.-]*\w")
+_REPO_INFO_WORDS = re.compile(r"\b(?:info|information|details?|about|stats|statistics|repo|repository|stars)\b", re.IGNORECASE)
+_NUMBER = r"\d+|one|two|three|four|five|six|seven|eight|nine|ten"
+# "for 3 days", "over the next five days", "5-day"
+_DAY_COUNT = re.compile(r"\b(?:(?:for|over)\s+)?(?:the\s+)?(?:next\s+)?(?P<days>" + _NUMBER + r")[\s-]+days?\b", re.IGNORECASE)
+_SORT_MODIFIER = (
+    r"top|best|most\s+popular|popular|most\s+starred|"
+    r"most\s+forked|(?:most\s+)?recently\s+updated"
+)
+_SEARCH = re.compile(
+    r"^(?:(?P<prefix>.*?)\b(?:find|search(?:\s+for)?|get|show|list|give\s+me|what\s+are)\s+)?"
+    r"(?:the\s+)?(?:(?P<sort>" + _SORT_MODIFIER + r")\s+)?"
+    r"(?P<limit>" + _NUMBER + r")?\s*"
+    r"(?:(?P<sort_after>" + _SORT_MODIFIER + r")\s+)?"
+    r"(?P<query>[\w+#.\- ]+?)\s+(?:repositories|repos|projects)\b"
+    r"(?:\s+on\s+github)?[?.!]*$",
+    re.IGNORECASE
+)
+# Ranking words left in a search query ask for an order github_search can't give
+_UNMAPPED_MODIFIERS = re.compile(
+    r"\b(?:most|least|fewest|top|best|popular|starred|forked|forks|updated|recent|recently|"
+    r"newest|oldest|latest|new|old|trending|active|fastest|growing|largest|biggest|smallest)\b",
+    re.IGNORECASE
+)
+_SORTS = {"forked": "forks", "updated": "updated"}
+_SORT_LABELS = {"stars": "top", "forks": "most forked", "updated": "recently updated"}
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
+}
+
+
+def _city_name(text: str) -> Optional[str]:
+    """
+    The leading capitalized words of a captured place, stopping at unit,
+    time or preposition words; None if it doesn't start with a place name
+    """
+    words = []
+    for word in text.split():
+        if not word[0].isupper() or word.lower().strip(".,'") in _NOT_CITY_WORDS:
+            break
+        words.append(word)
+    return " ".join(words) or None
+
+
+def _parse_number(text: str) -> int:
+    """Digits or a number word from one to ten"""
+    text = text.lower()
+    return int(text) if text.isdigit() else _NUMBER_WORDS[text]
+
+
+class FastPathPlanner:
+    def __init__(self, enabled: Optional[bool] = None, min_confidence: Optional[float] = None):
+        """
+        Args:
+            enabled: Use the fast path at all (FAST_PLANNER_ENABLED)
+            min_confidence: Below this, defer to the LLM (FAST_PLANNER_MIN_CONFIDENCE)
+        """
+        if enabled is None:
+            enabled = os.getenv("FAST_PLANNER_ENABLED", "true").lower() in ("1", "true", "yes")
+        if min_confidence is None:
+            min_confidence = float(os.getenv("FAST_PLANNER_MIN_CONFIDENCE", "0.9"))
+        
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._fallbacks = 0
+    
+    def plan(self, user_task: str, available_tools: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Build a plan without the LLM if the task is recognized
+        
+        Args:
+            user_task: Natural language task
+            available_tools: Planner tool catalog; only these tools are used
+        
+        Returns:
+            Plan dictionary, or None to fall back to the LLM
+        """
+        if not self.enabled:
+            return None
+        
+        steps, confidence = self._match(user_task, available_tools)
+        hit = bool(steps) and confidence >= self.min_confidence
+        
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._fallbacks += 1
+        
+        if not hit:
+            return None
+        
+        steps = self._batch_weather(steps, available_tools)
+        return {
+            "task_summary": " ".join(user_task.split()),
+            "steps": [
+                {
+                    "step_number": number,
+                    "action": action,
+                    "parameters": parameters,
+                    "reasoning": reasoning
+                }
+                for number, (action, parameters, reasoning) in enumerate(steps, 1)
+            ]
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Fast-path hit rate"""
+        with self._lock:
+            hits, fallbacks = self._hits, self._fallbacks
+        total = hits + fallbacks
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "fallbacks": fallbacks,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+    
+    def _match(
+        self,
+        user_task: str,
+        available_tools: Dict[str, str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any], str]], float]:
+        """Map each clause of the task to a tool call; confidence is the weakest clause's"""
+        steps = []
+        confidence = 1.0
+        previous = None
+        
+        parts = _CLAUSE_SPLIT.split(user_task.strip())
+        clauses = parts[0::2]
+        separators = [""] + [separator.lower() for separator in parts[1::2]]
+        
+        for index, clause in enumerate(clauses):
+            if not clause or not _FILLER.sub("", clause).strip(" ?.!'"):
+                continue
+            
+            # "Portland, Oregon" is one place, "London, Paris and Rome" three
+            if separators[index] in (",", ";") and not self._in_place_list(clauses, separators, index):
+                return [], 0.0
+            
+            match = self._match_clause(clause, previous)
+            if match is None:
+                return [], 0.0
+            
+            action, parameters, reasoning, clause_confidence = match
+            if action not in available_tools:
+                return [], 0.0
+            
+            if (action, parameters) not in [(a, p) for a, p, _ in steps]:
+                steps.append((action, parameters, reasoning))
+            confidence = min(confidence, clause_confidence)
+            previous = (action, parameters)
+        
+        return steps, confidence
+    
+    def _match_clause(
+        self,
+        clause: str,
+        previous: Optional[Tuple[str, Dict[str, Any]]]
+    ) -> Optional[Tuple[str, Dict[str, Any], str, float]]:
+        """Match one clause against the intent rules; previous is the last clause's (action, parameters)"""
+        lowered = clause.lower()
+        
+        if re.search(r"\b(?:weather|forecast|temperature)\b", lowered):
+            # A day count makes it a forecast; cut it out so it can't run into the city name
+            days = None
+            day_count = _DAY_COUNT.search(clause)
+            if day_count:
+                days = _parse_number(day_count.group("days"))
+                if not 1 <= days <= MAX_READINGS // READINGS_PER_DAY:
+                    return None
+                clause = f"{clause[:day_count.start()]} {clause[day_count.end():]}"
+                lowered = clause.lower()
+            
+            cities = [values["city"] for _, _, values in extract_entities(clause) if "city" in values]
+            if len(cities) != 1:
+                return None
+            cities[0] = _city_name(cities[0])
+            if cities[0] is None:
+                return None
+            # Only the validated name counts as covered; anything swept up after it is leftover
+            confidence = self._coverage_confidence(clause, cities[0])
+            if days:
+                return ("weather_forecast", {"city": cities[0], "days": days},
+                        f"Get the {days}-day weather forecast for {cities[0]}", confidence)
+            if "forecast" in lowered:
+                return ("weather_forecast", {"city": cities[0]},
+                        f"Get the weather forecast for {cities[0]}", confidence)
+            return ("weather_current", {"city": cities[0]},
+                    f"Get the current weather in {cities[0]}", confidence)
+        
+        # "... weather in London and Paris": a bare place name continues the previous weather intent
+        place = _PLACE_ONLY.match(clause.strip())
+        if place and previous is not None and previous[0] in ("weather_current", "weather_forecast"):
+            action, previous_parameters = previous
+            city = _city_name(place.group(1))
+            if city != place.group(1):
+                return None
+            parameters = {"city": city}
+            if "days" in previous_parameters:
+                parameters["days"] = previous_parameters["days"]
+            verb = "forecast for" if action == "weather_forecast" else "current weather in"
+            return (action, parameters, f"Get the {verb} {city}", 0.9)
+        
+        repos = [values for _, _, values in extract_entities(clause) if "repo" in values]
+        if repos:
+            if len(repos) != 1 or not _REPO_INFO_WORDS.search(clause) or len(_REPO_MENTION.findall(clause)) != 1:
+                return None
+            owner, repo = repos[0]["owner"], repos[0]["repo"]
+            return ("github_info", {"owner": owner, "repo": repo},
+                    f"Get details for the {owner}/{repo} repository",
+                    self._coverage_confidence(clause, f"{owner}/{repo}"))
+        
+        search = _SEARCH.match(clause.strip())
+        if search:
+            query = " ".join(search.group("query").split())
+            if not query or _FILLER.fullmatch(query) or _UNMAPPED_MODIFIERS.search(query):
+                return None
+            
+            # "top 3 most forked": a specific order wins over the generic "top"
+            sorts = {
+                _SORTS.get(modifier.split()[-1].lower(), "stars")
+                for modifier in (search.group("sort"), search.group("sort_after")) if modifier
+            }
+            if len(sorts) > 1:
+                sorts.discard("stars")
+            if len(sorts) > 1:
+                return None
+            sort = sorts.pop() if sorts else "stars"
+            
+            limit = _parse_number(search.group("limit")) if search.group("limit") else 5
+            # Words before the search verb that aren't filler may narrow the search
+            confidence = 0.6 if self._leftover(search.group("prefix") or "") else 0.9
+            return ("github_search", {"query": query, "sort": sort, "limit": limit},
+                    f"Search GitHub for {_SORT_LABELS[sort]} {query} repositories", confidence)
+        
+        return None
+    
+    def _in_place_list(self, clauses: List[str], separators: List[str], index: int) -> bool:
+        """
+        Whether a clause after a comma can be read as its own item: anything
+        but a bare place is, while a bare place must not be a region
+        abbreviation and its list must be closed by "and <place>"
+        """
+        place = _PLACE_ONLY.match(clauses[index].strip())
+        if place is None:
+            return True
+        if _REGION_ABBREVIATION.match(place.group(1)):
+            return False
+        for clause, separator in zip(clauses[index + 1:], separators[index + 1:]):
+            if not clause:
+                continue  # "Paris, and Rome"
+            if separator not in (",", ";"):
+                return separator in ("and", "&", "plus") and _PLACE_ONLY.match(clause.strip()) is not None
+            if _PLACE_ONLY.match(clause.strip()) is None:
+                return False
+        return False
+    
+    def _batch_weather(
+        self,
+        steps: List[Tuple[str, Dict[str, Any], str]],
+        available_tools: Dict[str, str]
+    ) -> List[Tuple[str, Dict[str, Any], str]]:
+        """Fold same-kind weather steps for several cities into one weather_batch step"""
+        if "weather_batch" not in available_tools:
+            return steps
+        
+        # Only steps asking for the same thing (kind and horizon) share a batch
+        cities: Dict[Tuple[str, Optional[int]], List[str]] = {}
+        for action, parameters, _ in steps:
+            if action in ("weather_current", "weather_forecast"):
+                cities.setdefault((action, parameters.get("days")), []).append(parameters["city"])
+        
+        batched, folded = [], set()
+        for action, parameters, reasoning in steps:
+            key = (action, parameters.get("days"))
+            if key not in cities or len(cities[key]) < 2:
+                batched.append((action, parameters, reasoning))
+            elif key not in folded:
+                folded.add(key)
+                forecast = action == "weather_forecast"
+                batch = {"cities": cities[key], "forecast": forecast}
+                if key[1]:
+                    batch["days"] = key[1]
+                batched.append((
+                    "weather_batch",
+                    batch,
+                    f"Get the {'weather forecast' if forecast else 'current weather'} for {', '.join(cities[key])}"
+                ))
+        return batched
+    
+    def _coverage_confidence(self, clause: str, entity: str) -> float:
+        """
+        High confidence only when nothing but the entity, intent words and
+        filler remains; leftover words mean the task asks for something more
+        """
+        return 0.95 if not self._leftover(clause.replace(entity, " ")) else 0.6
+    
+    def _leftover(self, text: str) -> str:
+        """What remains of text once filler and intent words are removed"""
+        return re.sub(r"[\W_]", "", _INTENT_WORDS.sub(" ", _FILLER.sub(" ", text)))
@@ -0,0 +1,223 @@
+"""
+Compact encoding of step results for verifier prompts
+
+Step data is projected down to the fields that matter for judging
+completeness, long strings are truncated, and the result is serialized
+as minified JSON. If the payload still exceeds the token budget, the
+longest result lists are halved until it fits.
+"""
+import json
+import math
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.metrics import metrics
+
+# Fields kept per action; nested lists of records use a dict of sub-fields
+VERIFICATION_FIELDS: Dict[str, Dict[str, Any]] = {
+    "github_search": {"full_name": None, "stars": None, "language": None, "description": None},
+    "github_info": {"full_name": None, "stars": None, "forks": None, "language": None, "description": None, "topics": None},
+    "weather_current": {"city": None, "country": None, "temperature": None, "units": None, "description": None, "humidity": None},
+    "weather_forecast": {
+        "city": None,
+        "country": None,
+        "units": None,
+        "aggregation": None,
+        "forecasts": {"date": None, "temperature": None, "temp_min": None, "temp_max": None, "description": None}
+    },
+    "weather_batch": {
+        "query": None,
+        "error": None,
+        "data": {
+            "city": None,
+            "country": None,
+            "temperature": None,
+            "units": None,
+            "description": None,
+            "humidity": None,
+            "aggregation": None,
+            "forecasts": {"date": None, "temperature": None, "temp_min": None, "temp_max": None, "description": None}
+        }
+    }
+}
+
+PAYLOAD_BYTES = metrics.counter(
+    "verifier_payload_bytes_total", "Verifier prompt payload size before and after compaction", ["form"]
+)
+PAYLOAD_TOKENS = metrics.counter(
+    "verifier_payload_tokens_total", "Estimated verifier prompt payload tokens before and after compaction", ["form"]
+)
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def _load_tokenizer():
+    """tiktoken's cl100k_base encoding if installed, else None"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+class PayloadCompactor:
+    def __init__(
+        self,
+        max_string_chars: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        measure_raw: Optional[bool] = None
+    ):
+        """
+        Args:
+            max_string_chars: Longer strings are truncated (VERIFIER_MAX_STRING_CHARS)
+            token_budget: Upper bound on payload tokens (VERIFIER_TOKEN_BUDGET)
+            measure_raw: Also measure the uncompacted payload for stats (VERIFIER_PAYLOAD_STATS)
+        """
+        self.max_string_chars = max_string_chars or int(os.getenv("VERIFIER_MAX_STRING_CHARS", "120"))
+        self.token_budget = token_budget or int(os.getenv("VERIFIER_TOKEN_BUDGET", "1500"))
+        if measure_raw is None:
+            measure_raw = os.getenv("VERIFIER_PAYLOAD_STATS", "true").lower() in ("1", "true", "yes")
+        self.measure_raw = measure_raw
+        self._tokenizer = _load_tokenizer()
+        
+        self._lock = threading.Lock()
+        self._totals = {"payloads": 0, "raw_bytes": 0, "compact_bytes": 0, "raw_tokens": 0, "compact_tokens": 0}
+    
+    def count_tokens(self, text: str) -> int:
+        """
+        Token count from tiktoken when available; otherwise a BPE-like
+        estimate of one token per word piece of up to four characters
+        and one per punctuation mark
+        """
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text))
+        return sum(math.ceil(len(piece) / 4) for piece in _WORD_PATTERN.findall(text))
+    
+    def compact(self, data: list, errors: list) -> Tuple[str, str]:
+        """
+        Encode successful step data and errors for the verifier prompt
+        
+        Args:
+            data: Successful step data ({"step", "action", "data"} entries)
+            errors: Step errors ({"step", "action", "error"} entries)
+        
+        Returns:
+            (data_json, errors_json) minified JSON strings within the token budget
+        """
+        steps = [
+            {
+                "step": item["step"],
+                "action": item["action"],
+                "data": self._project(item["data"], VERIFICATION_FIELDS.get(item["action"]))
+            }
+            for item in data
+        ]
+        compact_errors = [dict(error, error=self._truncate(str(error.get("error")))) for error in errors]
+        
+        data_json, errors_json = self._dump(steps), self._dump(compact_errors)
+        errors_tokens = self.count_tokens(errors_json)
+        data_tokens = self.count_tokens(data_json)
+        while data_tokens + errors_tokens > self.token_budget:
+            if not self._shrink_longest_list(steps):
+                break
+            data_json = self._dump(steps)
+            data_tokens = self.count_tokens(data_json)
+        
+        # Last resort for payloads that cannot be shrunk structurally
+        overflow = data_tokens + errors_tokens - self.token_budget
+        if overflow > 0:
+            keep = max(0, len(data_json) - math.ceil(len(data_json) * overflow / data_tokens))
+            data_json = data_json[:keep] + "...[truncated]"
+            data_tokens = self.count_tokens(data_json)
+        
+        self._record(data, errors, data_json + errors_json, data_tokens + errors_tokens)
+        return data_json, errors_json
+    
+    def stats(self) -> Dict[str, Any]:
+        """Bytes and tokens before and after compaction"""
+        with self._lock:
+            totals = dict(self._totals)
+        if self.measure_raw:
+            totals["bytes_saved"] = totals["raw_bytes"] - totals["compact_bytes"]
+            totals["tokens_saved"] = totals["raw_tokens"] - totals["compact_tokens"]
+        else:
+            del totals["raw_bytes"], totals["raw_tokens"]
+        totals["tokenizer"] = "tiktoken" if self._tokenizer is not None else "estimate"
+        return totals
+    
+    def _project(self, value: Any, fields: Optional[Dict[str, Any]]) -> Any:
+        """Keep only the given fields (all fields when None) and truncate strings"""
+        if isinstance(value, list):
+            return [self._project(item, fields) for item in value]
+        if isinstance(value, dict):
+            if fields is None:
+                return {key: self._project(item, None) for key, item in value.items() if item is not None}
+            return {
+                key: self._project(value[key], sub_fields)
+                for key, sub_fields in fields.items()
+                if value.get(key) is not None
+            }
+        if isinstance(value, str):
+            return self._truncate(value)
+        return value
+    
+    def _truncate(self, text: str) -> str:
+        if len(text) <= self.max_string_chars:
+            return text
+        return text[:self.max_string_chars - 1] + "…"
+    
+    def _shrink_longest_list(self, steps: List[Dict[str, Any]]) -> bool:
+        """Halve the longest list in any step's data; False if nothing can shrink"""
+        longest: Optional[Tuple[Dict[str, Any], Optional[str], int]] = None
+        
+        for step in steps:
+            data = step["data"]
+            if isinstance(data, list):
+                candidates = [(None, data)]
+            elif isinstance(data, dict):
+                candidates = [(key, value) for key, value in data.items() if isinstance(value, list)]
+            else:
+                candidates = []
+            
+            for key, items in candidates:
+                if len(items) > 1 and (longest is None or len(items) > longest[2]):
+                    longest = (step, key, len(items))
+        
+        if longest is None:
+            return False
+        
+        step, key, length = longest
+        keep = math.ceil(length / 2)
+        if key is None:
+            step["data"] = step["data"][:keep]
+        else:
+            step["data"][key] = step["data"][key][:keep]
+        step["omitted"] = step.get("omitted", 0) + length - keep
+        return True
+    
+    def _dump(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    
+    def _record(self, data: list, errors: list, compact: str, compact_tokens: int):
+        """Count payload sizes; compact tokens are already known from the budget check"""
+        compact_bytes = len(compact.encode("utf-8"))
+        raw_bytes = raw_tokens = 0
+        if self.measure_raw:
+            # Tokenizing the raw payload would cost more than compacting it, so its
+            # tokens are extrapolated from the compact form's bytes per token
+            raw_bytes = len(self._dump([data, errors]).encode("utf-8"))
+            raw_tokens = round(raw_bytes * compact_tokens / compact_bytes) if compact_bytes else 0
+            PAYLOAD_BYTES.inc(raw_bytes, form="raw")
+            PAYLOAD_TOKENS.inc(raw_tokens, form="raw")
+        
+        PAYLOAD_BYTES.inc(compact_bytes, form="compact")
+        PAYLOAD_TOKENS.inc(compact_tokens, form="compact")
+        
+        with self._lock:
+            self._totals["payloads"] += 1
+            self._totals["raw_bytes"] += raw_bytes
+            self._totals["compact_bytes"] += compact_bytes
+            self._totals["raw_tokens"] += raw_tokens
+            self._totals["compact_tokens"] += compact_tokens
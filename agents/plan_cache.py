@@ -0,0 +1,273 @@
+"""
+Plan cache: reuse plans for repeated tasks instead of calling the LLM
+
+Exact mode keys plans on normalized task text, the tool catalog and the
+model name. Template mode additionally recognizes tasks that differ only
+in entities (city names, owner/repo) and reuses the cached plan shape
+with the new entities substituted into its parameters.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.cache import CacheStats, create_cache_backend, MISSING
+
+# "owner/repo" references
+_REPO_PATTERN = re.compile(r"\b([A-Za-z0-9][\w.-]*)/([\w.-]*\w)")
+
+# City after a weather keyword: "weather in San Francisco", "forecast for London"
+_STOP_WORDS = r"(?:and|or|then|plus|with|today|tomorrow|tonight|now|please|right)\b"
+_CITY_PATTERN = re.compile(
+    r"\b(?:weather|forecast|temperature)\b[^.?!]*?\b(?:in|for|at)\s+"
+    r"((?!" + _STOP_WORDS + r")[A-Za-z][\w.'-]*(?:\s+(?!" + _STOP_WORDS + r")[A-Za-z][\w.'-]*){0,2})",
+    re.IGNORECASE
+)
+# Further cities listed after one: "in London, Paris and Tokyo"
+_NEXT_CITY = re.compile(
+    r"(?:\s*,\s*(?:(?i:and)\s+)?|\s+(?i:and)\s+|\s*&\s*)"
+    r"((?!" + _STOP_WORDS + r")[A-Z][\w.'-]*(?:\s+(?!" + _STOP_WORDS + r")[A-Z][\w.'-]*){0,2})"
+)
+
+# Step parameters that carry task entities, and list parameters holding one entity per item
+_ENTITY_PARAMS = ("city", "owner", "repo")
+_ENTITY_LIST_PARAMS = {"cities": "city"}
+
+
+def normalize_task(task: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return " ".join(task.split()).lower().rstrip(".?! ")
+
+
+def extract_entities(task: str) -> List[Tuple[int, int, Dict[str, str]]]:
+    """
+    Find entity mentions in a task
+    
+    Args:
+        task: Natural language task
+    
+    Returns:
+        (start, end, values) spans ordered by position; values maps
+        parameter names (city/owner/repo) to the mentioned value
+    """
+    spans = []
+    for match in _REPO_PATTERN.finditer(task):
+        spans.append((match.start(), match.end(), {"owner": match.group(1), "repo": match.group(2)}))
+    for match in _CITY_PATTERN.finditer(task):
+        found = [match]
+        while True:
+            following = _NEXT_CITY.match(task, found[-1].end(1))
+            if following is None:
+                break
+            found.append(following)
+        for city in found:
+            start, end = city.span(1)
+            if not any(s < end and start < e for s, e, _ in spans):
+                spans.append((start, end, {"city": city.group(1)}))
+    return sorted(spans, key=lambda span: span[0])
+
+
+class PlanCache:
+    def __init__(
+        self,
+        backend: Any = MISSING,
+        ttl: Optional[float] = None,
+        template_mode: Optional[bool] = None
+    ):
+        """
+        Args:
+            backend: Cache backend; None disables caching. Defaults to PLAN_CACHE_BACKEND
+            ttl: Seconds a cached plan stays valid
+            template_mode: Also match tasks that differ only in entities
+        """
+        if backend is MISSING:
+            backend = create_cache_backend(
+                os.getenv("PLAN_CACHE_BACKEND", "memory"),
+                path=os.getenv("PLAN_CACHE_PATH", os.path.join(".cache", "plan_cache.sqlite3")),
+                max_entries=int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "512"))
+            )
+        if ttl is None:
+            ttl = float(os.getenv("PLAN_CACHE_TTL", "3600"))
+        if template_mode is None:
+            template_mode = os.getenv("PLAN_CACHE_TEMPLATES", "false").lower() in ("1", "true", "yes")
+        
+        self.backend = backend
+        self.ttl = ttl
+        self.template_mode = template_mode
+        self.counters = CacheStats("plan")
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+    
+    def get(self, task: str, tools: Dict[str, str], model: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a plan for a task
+        
+        Args:
+            task: Natural language task
+            tools: Planner tool catalog
+            model: LLM model name
+        
+        Returns:
+            Cached plan, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        scope = self._scope(tools, model)
+        plan = self.backend.get(f"exact:{scope}:{normalize_task(task)}")
+        if plan is not MISSING:
+            self.counters.record("exact", True)
+            return plan
+        self.counters.record("exact", False)
+        
+        if not self.template_mode:
+            return None
+        
+        entities = extract_entities(task)
+        if not entities:
+            return None
+        
+        template = self.backend.get(f"template:{scope}:{self._template_key(task, entities)}")
+        if template is MISSING:
+            self.counters.record("template", False)
+            return None
+        self.counters.record("template", True)
+        return self._fill(template, entities)
+    
+    def put(self, task: str, tools: Dict[str, str], model: str, plan: Dict[str, Any]):
+        """
+        Store a freshly generated plan
+        
+        Args:
+            task: Natural language task
+            tools: Planner tool catalog
+            model: LLM model name
+            plan: Plan returned by the LLM
+        """
+        if not self.enabled or not plan.get("steps"):
+            return
+        
+        scope = self._scope(tools, model)
+        self.backend.set(f"exact:{scope}:{normalize_task(task)}", plan, self.ttl)
+        
+        if self.template_mode:
+            entities = extract_entities(task)
+            template = self._make_template(plan, entities) if entities else None
+            if template is not None:
+                key = f"template:{scope}:{self._template_key(task, entities)}"
+                self.backend.set(key, template, self.ttl)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for exact and template lookups"""
+        snapshot = self.counters.snapshot()
+        snapshot["enabled"] = self.enabled
+        snapshot["template_mode"] = self.template_mode
+        return snapshot
+    
+    def _scope(self, tools: Dict[str, str], model: str) -> str:
+        """Hash of the tool catalog and model, so catalog/model changes invalidate plans"""
+        catalog = json.dumps(tools, sort_keys=True)
+        return hashlib.sha256(f"{model}\n{catalog}".encode()).hexdigest()[:16]
+    
+    def _template_key(self, task: str, entities: List[Tuple[int, int, Dict[str, str]]]) -> str:
+        """Task text with entity mentions replaced by positional placeholders"""
+        parts = []
+        cursor = 0
+        for index, (start, end, values) in enumerate(entities):
+            kind = "repo" if "repo" in values else "city"
+            parts.append(task[cursor:start])
+            parts.append(f"<{kind}_{index}>")
+            cursor = end
+        parts.append(task[cursor:])
+        return normalize_task("".join(parts))
+    
+    def _make_template(
+        self,
+        plan: Dict[str, Any],
+        entities: List[Tuple[int, int, Dict[str, str]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Replace entity values in a plan with placeholders
+        
+        Returns None unless every entity parameter in the plan maps to an
+        entity mentioned in the task; otherwise the plan depends on text
+        the template key does not capture and reusing it would be wrong.
+        """
+        template = json.loads(json.dumps(plan))
+        
+        for step in template.get("steps", []):
+            parameters = step.get("parameters") or {}
+            for name in _ENTITY_PARAMS:
+                if name not in parameters:
+                    continue
+                placeholder = self._placeholder(name, parameters[name], entities)
+                if placeholder is None:
+                    return None
+                parameters[name] = placeholder
+            for name, entity in _ENTITY_LIST_PARAMS.items():
+                if name not in parameters:
+                    continue
+                if not isinstance(parameters[name], list):
+                    return None
+                placeholders = [self._placeholder(entity, item, entities) for item in parameters[name]]
+                if None in placeholders:
+                    return None
+                parameters[name] = placeholders
+            if "reasoning" in step:
+                step["reasoning"] = self._mask_text(step["reasoning"], entities)
+        
+        if "task_summary" in template:
+            template["task_summary"] = self._mask_text(template["task_summary"], entities)
+        return template
+    
+    def _placeholder(
+        self,
+        name: str,
+        value: Any,
+        entities: List[Tuple[int, int, Dict[str, str]]]
+    ) -> Optional[str]:
+        """Placeholder for the task entity a parameter value came from, or None if it isn't one"""
+        value = str(value).casefold()
+        for index, (_, _, values) in enumerate(entities):
+            if values.get(name, "").casefold() == value:
+                return f"{{{{{name}_{index}}}}}"
+        return None
+    
+    def _mask_text(self, text: str, entities: List[Tuple[int, int, Dict[str, str]]]) -> str:
+        """Replace entity mentions inside free text with placeholders"""
+        if not isinstance(text, str):
+            return text
+        for index, (_, _, values) in enumerate(entities):
+            if "repo" in values:
+                mention, placeholder = f"{values['owner']}/{values['repo']}", f"{{{{owner_{index}}}}}/{{{{repo_{index}}}}}"
+            else:
+                mention, placeholder = values["city"], f"{{{{city_{index}}}}}"
+            text = re.sub(re.escape(mention), placeholder, text, flags=re.IGNORECASE)
+        return text
+    
+    def _fill(
+        self,
+        template: Dict[str, Any],
+        entities: List[Tuple[int, int, Dict[str, str]]]
+    ) -> Dict[str, Any]:
+        """Substitute a task's entities into a cached plan template"""
+        replacements = {}
+        for index, (_, _, values) in enumerate(entities):
+            for name, value in values.items():
+                replacements[f"{{{{{name}_{index}}}}}"] = value
+        
+        def fill(value: Any) -> Any:
+            if isinstance(value, str):
+                for placeholder, replacement in replacements.items():
+                    value = value.replace(placeholder, replacement)
+                return value
+            if isinstance(value, dict):
+                return {k: fill(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [fill(v) for v in value]
+            return value
+        
+        return fill(template)
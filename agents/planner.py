@@ -1,17 +1,31 @@
 """
 Planner Agent: Converts user input into actionable step-by-step plan
 """
-from typing import Dict, Any, List
-from llm.llm_client import llm_client
+import hashlib
+import json
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
+from llm.router import llm_router
+from agents.plan_cache import PlanCache
+from agents.fast_planner import FastPathPlanner
+from utils.tracing import tracer
 
 
 class PlannerAgent:
-    def __init__(self):
-        self.llm = llm_client
+    def __init__(
+        self,
+        plan_cache: Optional[PlanCache] = None,
+        fast_path: Optional[FastPathPlanner] = None
+    ):
+        self.llm = llm_router
+        self.plan_cache = plan_cache if plan_cache is not None else PlanCache()
+        self.fast_path = fast_path if fast_path is not None else FastPathPlanner()
+        # Assigning the catalog renders the system prompt for it
         self.available_tools = {
             "github_search": "Search GitHub repositories by query, returns top repositories with stars and info",
+            "github_info": "Get detailed information about a specific repository (owner and repo)",
             "weather_current": "Get current weather for a city",
-            "weather_forecast": "Get 5-day weather forecast for a city"
+            "weather_forecast": "Get daily weather forecast for a city: min/max/mean temperature and main condition per day (optional days 1-5; series=true adds 3-hour readings)",
+            "weather_batch": "Get current weather for several cities at once (cities list; forecast=true for daily forecasts)"
         }
     
     def create_plan(self, user_task: str) -> Dict[str, Any]:
@@ -24,7 +38,110 @@ class PlannerAgent:
         Returns:
             Dictionary with plan structure
         """
-        system_prompt = f"""You are a planning agent. Your job is to break down user tasks into step-by-step plans.
+        plan = self._plan_without_llm(user_task)
+        if plan is not None:
+            return plan
+        
+        system_prompt, user_prompt = self._build_prompts(user_task)
+        
+        try:
+            plan = self.llm.generate_json(user_prompt, system_prompt)
+        except Exception as e:
+            raise Exception(f"Planner Agent Error: {str(e)}")
+        
+        self.plan_cache.put(user_task, self.available_tools, self.llm.model, plan)
+        return plan
+    
+    async def acreate_plan(self, user_task: str) -> Dict[str, Any]:
+        """Async variant of create_plan"""
+        plan = self._plan_without_llm(user_task)
+        if plan is not None:
+            return plan
+        
+        system_prompt, user_prompt = self._build_prompts(user_task)
+        
+        try:
+            plan = await self.llm.agenerate_json(user_prompt, system_prompt)
+        except Exception as e:
+            raise Exception(f"Planner Agent Error: {str(e)}")
+        
+        self.plan_cache.put(user_task, self.available_tools, self.llm.model, plan)
+        return plan
+    
+    async def astream_plan(self, user_task: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Create a plan, emitting each step as soon as the LLM has written it
+        
+        Args:
+            user_task: Natural language description of task
+        
+        Yields:
+            ("step", step) for each planned step, then ("plan", plan)
+        """
+        plan = self._plan_without_llm(user_task)
+        
+        if plan is not None:
+            for step in plan.get("steps", []):
+                yield "step", step
+        else:
+            system_prompt, user_prompt = self._build_prompts(user_task)
+            try:
+                async for kind, payload in self.llm.agenerate_json_stream(user_prompt, system_prompt):
+                    if kind == "item":
+                        yield "step", payload
+                    else:
+                        plan = payload
+            except Exception as e:
+                raise Exception(f"Planner Agent Error: {str(e)}")
+            
+            self.plan_cache.put(user_task, self.available_tools, self.llm.model, plan)
+        
+        yield "plan", plan
+    
+    def _plan_without_llm(self, user_task: str) -> Optional[Dict[str, Any]]:
+        """Try the plan cache, then the rule-based fast path"""
+        cached = self.plan_cache.get(user_task, self.available_tools, self.llm.model)
+        if cached is not None:
+            tracer.set_attributes(plan_source="cache")
+            return cached
+        plan = self.fast_path.plan(user_task, self.available_tools)
+        tracer.set_attributes(plan_source="fast_path" if plan is not None else "llm")
+        return plan
+    
+    def _build_prompts(self, user_task: str) -> Tuple[str, str]:
+        """
+        Build the (system, user) prompt pair for a task
+        
+        The system prompt is identical across calls for a given tool
+        catalog, and everything task-specific comes after it, so
+        provider-side prompt caching can reuse the prefix.
+        """
+        user_prompt = f"""Task: {user_task}
+
+Create a step-by-step plan to accomplish this task using the available tools."""
+        
+        return self.system_prompt(), user_prompt
+    
+    @property
+    def available_tools(self) -> Dict[str, str]:
+        """Tool catalog; assign a new dict to change it, since the prompt is only re-rendered then"""
+        return self._available_tools
+    
+    @available_tools.setter
+    def available_tools(self, tools: Dict[str, str]):
+        self._available_tools = dict(tools)
+        # Short hash of the catalog, in prompt order
+        catalog = json.dumps(list(self._available_tools.items()))
+        self.catalog_version = hashlib.sha256(catalog.encode("utf-8")).hexdigest()[:12]
+        self._system_prompt = self._render_system_prompt()
+    
+    def system_prompt(self) -> str:
+        """System prompt for the current tool catalog, rendered when the catalog was set"""
+        return self._system_prompt
+    
+    def _render_system_prompt(self) -> str:
+        """Planner instructions with the tool catalog embedded"""
+        return f"""You are a planning agent. Your job is to break down user tasks into step-by-step plans.
 
 Available tools:
 {self._format_tools()}
@@ -48,16 +165,6 @@ JSON Schema:
         }}
     ]
 }}"""
-
-        user_prompt = f"""Task: {user_task}
-
-Create a step-by-step plan to accomplish this task using the available tools."""
-
-        try:
-            plan = self.llm.generate_json(user_prompt, system_prompt)
-            return plan
-        except Exception as e:
-            raise Exception(f"Planner Agent Error: {str(e)}")
     
     def _format_tools(self) -> str:
         """Format available tools for prompt"""
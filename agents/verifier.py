@@ -1,13 +1,57 @@
 """
 Verifier Agent: Validates execution results and ensures completeness
 """
-from typing import Dict, Any
-from llm.llm_client import llm_client
+import json
+import os
+import re
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
+from llm.router import llm_router
+from llm.json_stream import partial_string_value
+from agents.payload_compactor import PayloadCompactor
+from agents.plan_cache import extract_entities
+
+VERIFICATION_MODES = ("llm", "rule_first", "rule_only")
+
+# What a task asks for, so rule verification can check the results cover it
+_WEATHER_WORDS = re.compile(r"\b(?:weather|forecasts?|temperatures?|rain|raining|snow|snowing|humidity)\b", re.IGNORECASE)
+_FORECAST_WORDS = re.compile(
+    r"\b(?:forecasts?|tomorrow|week|weekend|upcoming|next\s+\w+\s+days?|\w+-day)\b", re.IGNORECASE
+)
+_GITHUB_WORDS = re.compile(
+    r"\b(?:github|repos?|repository|repositories|projects|stars?|forks?)\b", re.IGNORECASE
+)
+
+# Static so every verification call shares a byte-identical prompt prefix
+VERIFIER_SYSTEM_PROMPT = """You are a verification agent. Analyze execution results and assess:
+1. Were all required steps completed?
+2. Is the data sufficient to answer the user's task?
+3. What information is missing (if any)?
+4. Provide a human-readable summary
+
+Output ONLY valid JSON with this schema:
+{
+    "is_complete": true/false,
+    "missing_items": ["item1", "item2"] or [],
+    "summary": "Human-readable summary of results",
+    "confidence": "high/medium/low"
+}"""
 
 
 class VerifierAgent:
-    def __init__(self):
-        self.llm = llm_client
+    def __init__(self, mode: Optional[str] = None, compactor: Optional[PayloadCompactor] = None):
+        """
+        Args:
+            mode: "llm" always asks the LLM, "rule_first" uses deterministic
+                checks when every step succeeded with well-formed data that
+                covers the tools and entities the task names, and the LLM
+                otherwise, "rule_only" never calls the LLM (VERIFIER_MODE)
+            compactor: Encodes step data for the verification prompt
+        """
+        self.llm = llm_router
+        self.compactor = compactor or PayloadCompactor()
+        self.mode = (mode or os.getenv("VERIFIER_MODE", "rule_first")).lower()
+        if self.mode not in VERIFICATION_MODES:
+            raise ValueError(f"Unknown verifier mode: {self.mode}")
     
     def verify_and_format(
         self, 
@@ -24,13 +68,78 @@ class VerifierAgent:
         Returns:
             Verified and formatted final output
         """
-        # Check for errors
-        has_errors = any(
-            step.get("status") == "error" 
-            for step in execution_results.get("steps_executed", [])
-        )
+        successful_data, errors = self._split_results(execution_results)
         
-        # Extract successful data
+        verification = self._rule_verify(original_task, successful_data, errors)
+        if verification is None:
+            # Use LLM to verify completeness and format output
+            verification = self._llm_verify(
+                original_task, 
+                successful_data, 
+                errors
+            )
+        
+        return self._format_output(original_task, verification, successful_data, errors)
+    
+    async def averify_and_format(
+        self, 
+        original_task: str,
+        execution_results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Async variant of verify_and_format"""
+        successful_data, errors = self._split_results(execution_results)
+        
+        verification = self._rule_verify(original_task, successful_data, errors)
+        if verification is None:
+            verification = await self._allm_verify(
+                original_task, 
+                successful_data, 
+                errors
+            )
+        
+        return self._format_output(original_task, verification, successful_data, errors)
+    
+    async def astream_verify_and_format(
+        self, 
+        original_task: str,
+        execution_results: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Verify results, streaming the summary as the LLM writes it
+        
+        Args:
+            original_task: Original user task
+            execution_results: Results from Executor Agent
+        
+        Yields:
+            ("summary_delta", text) events followed by one ("result", final_output)
+        """
+        successful_data, errors = self._split_results(execution_results)
+        
+        verification = self._rule_verify(original_task, successful_data, errors)
+        if verification is not None:
+            yield "summary_delta", verification["summary"]
+        else:
+            system_prompt, user_prompt = self._build_prompts(original_task, successful_data, errors)
+            buffer = ""
+            emitted = 0
+            try:
+                async for chunk in self.llm.agenerate_stream(
+                    user_prompt, system_prompt, json_mode=True, temperature=0.3
+                ):
+                    buffer += chunk
+                    summary = partial_string_value(buffer, "summary")
+                    if summary is not None and len(summary) > emitted:
+                        yield "summary_delta", summary[emitted:]
+                        emitted = len(summary)
+                verification = json.loads(buffer)
+            except Exception:
+                verification = self._fallback_verification(errors)
+        
+        yield "result", self._format_output(original_task, verification, successful_data, errors)
+    
+    def _split_results(self, execution_results: Dict[str, Any]) -> Tuple[list, list]:
+        """Separate successful step data from step errors"""
         successful_data = []
         errors = []
         
@@ -48,21 +157,181 @@ class VerifierAgent:
                     "error": step["error"]
                 })
         
-        # Use LLM to verify completeness and format output
-        verification = self._llm_verify(
-            original_task, 
-            successful_data, 
-            errors
-        )
-        
+        return successful_data, errors
+    
+    def _format_output(
+        self, 
+        original_task: str,
+        verification: Dict[str, Any],
+        successful_data: list,
+        errors: list
+    ) -> Dict[str, Any]:
+        """Assemble the final verified result"""
         return {
             "task": original_task,
-            "status": "partial_success" if has_errors else "success",
+            "status": "partial_success" if errors else "success",
             "verification": verification,
             "data": successful_data,
             "errors": errors if errors else None
         }
     
+    def _rule_verify(self, task: str, data: list, errors: list) -> Optional[Dict[str, Any]]:
+        """
+        Verify results without the LLM when the mode allows it
+        
+        Args:
+            task: Original task
+            data: Successful step data
+            errors: Any errors encountered
+        
+        Returns:
+            Verification assessment, or None when the LLM should decide
+        """
+        if self.mode == "llm":
+            return None
+        
+        gaps = self._coverage_gaps(task, data)
+        if gaps is None and self.mode == "rule_first":
+            # Nothing in the task to check the results against
+            return None
+        
+        summaries = []
+        missing_items = [f"Step {error['step']} ({error['action']}): {error['error']}" for error in errors]
+        missing_items.extend(gaps or [])
+        
+        for item in data:
+            summary = self._summarize_step(item["action"], item["data"])
+            if summary is None:
+                missing_items.append(f"Step {item['step']} ({item['action']}): no usable data")
+            else:
+                summaries.append(summary)
+        
+        if missing_items and self.mode == "rule_first":
+            return None
+        
+        if not summaries:
+            summaries.append("No results were produced.")
+        
+        return {
+            "is_complete": not missing_items,
+            "missing_items": missing_items,
+            "summary": " ".join(summaries),
+            "confidence": "high" if not missing_items and gaps is not None else "medium"
+        }
+    
+    def _coverage_gaps(self, task: str, data: list) -> Optional[List[str]]:
+        """
+        Parts of the task that the successful steps don't cover
+        
+        Args:
+            task: Original task
+            data: Successful step data
+        
+        Returns:
+            Missing items (empty when covered), or None if the task names
+            no tool kind or entity to check against
+        """
+        actions = {item["action"] for item in data}
+        places, repos, has_forecast = self._covered_entities(data)
+        gaps = []
+        checked = False
+        
+        if _WEATHER_WORDS.search(task):
+            checked = True
+            if not actions & {"weather_current", "weather_forecast", "weather_batch"}:
+                gaps.append("Task asks for weather, but no weather data was fetched")
+            elif _FORECAST_WORDS.search(task) and not has_forecast:
+                gaps.append("Task asks for a forecast, but only current weather was fetched")
+        
+        entities = extract_entities(task)
+        if _GITHUB_WORDS.search(task) or any("repo" in values for _, _, values in entities):
+            checked = True
+            if not actions & {"github_search", "github_info"}:
+                gaps.append("Task asks about GitHub, but no repository data was fetched")
+        
+        for _, _, values in entities:
+            checked = True
+            if "repo" in values:
+                name = f"{values['owner']}/{values['repo']}"
+                if name.casefold() not in repos:
+                    gaps.append(f"No data for repository {name}")
+            else:
+                mention = values["city"].casefold()
+                if not any(mention == place or mention.startswith(place + " ") for place in places):
+                    gaps.append(f"No weather data for {values['city']}")
+        
+        return gaps if checked else None
+    
+    def _covered_entities(self, data: list) -> Tuple[set, set, bool]:
+        """Case-folded places and repository names in step data, and whether any forecast arrived"""
+        places, repos = set(), set()
+        has_forecast = False
+        for item in data:
+            entries = item["data"] if isinstance(item["data"], list) else [item["data"]]
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    continue
+                if item["action"] == "weather_batch":
+                    places.add(str(entry.get("query", "")).split(",")[0].strip().casefold())
+                    entry = entry.get("data")
+                    if not isinstance(entry, dict):
+                        continue
+                if "city" in entry:
+                    places.add(str(entry["city"]).casefold())
+                    has_forecast = has_forecast or "forecasts" in entry
+                if "full_name" in entry:
+                    repos.add(str(entry["full_name"]).casefold())
+        return places, repos, has_forecast
+    
+    def _summarize_step(self, action: str, data: Any) -> Optional[str]:
+        """Templated summary for one step's data; None if it isn't well-formed"""
+        try:
+            if action == "github_search":
+                if not data:
+                    return None
+                repos = ", ".join(f"{repo['full_name']} ({repo['stars']:,} stars)" for repo in data)
+                noun = "repository" if len(data) == 1 else "repositories"
+                return f"Found {len(data)} {noun}: {repos}."
+            
+            if action == "github_info":
+                language = f", written in {data['language']}" if data.get("language") else ""
+                return (
+                    f"{data['full_name']} has {data['stars']:,} stars and {data['forks']:,} forks{language}."
+                )
+            
+            if action == "weather_current":
+                return (
+                    f"Current weather in {data['city']}, {data['country']}: "
+                    f"{data['temperature']}{data['units']}, {data['description']} "
+                    f"(feels like {data['feels_like']}{data['units']}, humidity {data['humidity']}%)."
+                )
+            
+            if action == "weather_forecast":
+                if not data["forecasts"]:
+                    return None
+                days = "; ".join(
+                    f"{day['date']}: {day['temp_min']} to {day['temp_max']}{data['units']}, {day['description']}"
+                    for day in data["forecasts"]
+                )
+                return f"Forecast for {data['city']}, {data['country']}: {days}."
+            
+            if action == "weather_batch":
+                if not data or any("data" not in entry for entry in data):
+                    return None
+                summaries = [
+                    self._summarize_step(
+                        "weather_forecast" if "forecasts" in entry["data"] else "weather_current",
+                        entry["data"]
+                    )
+                    for entry in data
+                ]
+                return None if None in summaries else " ".join(summaries)
+        
+        except (KeyError, TypeError, ValueError):
+            return None
+        
+        return None
+    
     def _llm_verify(
         self, 
         task: str, 
@@ -80,41 +349,52 @@ class VerifierAgent:
         Returns:
             Verification assessment
         """
-        system_prompt = """You are a verification agent. Analyze execution results and assess:
-1. Were all required steps completed?
-2. Is the data sufficient to answer the user's task?
-3. What information is missing (if any)?
-4. Provide a human-readable summary
-
-Output ONLY valid JSON with this schema:
-{
-    "is_complete": true/false,
-    "missing_items": ["item1", "item2"] or [],
-    "summary": "Human-readable summary of results",
-    "confidence": "high/medium/low"
-}"""
-
+        system_prompt, user_prompt = self._build_prompts(task, data, errors)
+        
+        try:
+            verification = self.llm.generate_json(user_prompt, system_prompt)
+            return verification
+        except Exception as e:
+            # Fallback verification if LLM fails
+            return self._fallback_verification(errors)
+    
+    async def _allm_verify(
+        self, 
+        task: str, 
+        data: list, 
+        errors: list
+    ) -> Dict[str, Any]:
+        """Async variant of _llm_verify"""
+        system_prompt, user_prompt = self._build_prompts(task, data, errors)
+        
+        try:
+            return await self.llm.agenerate_json(user_prompt, system_prompt)
+        except Exception:
+            return self._fallback_verification(errors)
+    
+    def _build_prompts(self, task: str, data: list, errors: list) -> Tuple[str, str]:
+        """Build the (system, user) prompt pair for verification"""
+        data_json, errors_json = self.compactor.compact(data, errors)
         user_prompt = f"""Original Task: {task}
 
 Successful Data:
-{data}
+{data_json}
 
 Errors (if any):
-{errors}
+{errors_json}
 
 Verify if the execution successfully accomplished the task."""
-
-        try:
-            verification = self.llm.generate_json(user_prompt, system_prompt)
-            return verification
-        except Exception as e:
-            # Fallback verification if LLM fails
-            return {
-                "is_complete": len(errors) == 0,
-                "missing_items": [],
-                "summary": "Verification completed with errors" if errors else "Task executed successfully",
-                "confidence": "low"
-            }
+        
+        return VERIFIER_SYSTEM_PROMPT, user_prompt
+    
+    def _fallback_verification(self, errors: list) -> Dict[str, Any]:
+        """Verification used when the LLM call fails"""
+        return {
+            "is_complete": len(errors) == 0,
+            "missing_items": [],
+            "summary": "Verification completed with errors" if errors else "Task executed successfully",
+            "confidence": "low"
+        }
 
 
 # Singleton instance
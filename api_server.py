@@ -1,11 +1,19 @@
 """
 FastAPI REST API Server for AI Operations Assistant
 """
-from fastapi import FastAPI, HTTPException
+import os
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional, AsyncIterator, List
 from main import AIOperationsAssistant
-import uvicorn
+from utils.http_pool import http_pool
+from utils.rate_limiter import rate_limits
+from utils.resilience import circuit_breakers
+from utils.metrics import metrics
+from utils.serialization import ResponseEncoder, dumps, parse_fields, project
+from tools.github_tool import github_tool
+from tools.weather_tool import weather_tool
 
 
 app = FastAPI(
@@ -15,6 +23,21 @@ app = FastAPI(
 )
 
 assistant = AIOperationsAssistant()
+encoder = ResponseEncoder()
+
+# Largest task list /process/batch accepts
+BATCH_MAX_TASKS = int(os.getenv("BATCH_MAX_TASKS", "100"))
+
+RESPONSE_BYTES = metrics.counter(
+    "api_response_bytes_total", "Response body bytes before and after compression", ["form"]
+)
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Release pooled async HTTP connections"""
+    await http_pool.aclose()
+    http_pool.close()
 
 
 class TaskRequest(BaseModel):
@@ -25,6 +48,37 @@ class TaskRequest(BaseModel):
 class TaskResponse(BaseModel):
     status: str
     result: dict
+    trace_id: Optional[str] = None
+
+
+class BatchTaskRequest(BaseModel):
+    tasks: List[str]
+    max_concurrency: Optional[int] = None
+
+
+class BatchTaskResponse(BaseModel):
+    status: str
+    results: List[dict]
+    timing: dict
+    tool_calls: dict
+
+
+def json_response(payload: Any, request: Request) -> Response:
+    """
+    Serialize a response body directly, compressing it if the client accepts it
+    
+    Handlers return this instead of a pydantic model so large results skip
+    FastAPI's generic encoder; the response_model still documents the shape.
+    """
+    body = dumps(payload)
+    encoded, encoding = encoder.compress(body, request.headers.get("accept-encoding"))
+    RESPONSE_BYTES.inc(len(body), form="raw")
+    RESPONSE_BYTES.inc(len(encoded), form="sent")
+    
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(encoded, media_type="application/json", headers=headers)
 
 
 @app.get("/")
@@ -38,23 +92,77 @@ async def root():
 
 
 @app.post("/process", response_model=TaskResponse)
-async def process_task(request: TaskRequest):
+async def process_task(request: TaskRequest, http_request: Request, fields: Optional[str] = None):
     """
     Process a natural language task
     
     Args:
         request: Task request with task description
+        fields: Comma-separated result fields to return, dotted for nested
+            ones (e.g. "verification" drops the step data)
     
     Returns:
         Structured result from multi-agent processing
     """
     try:
-        result = assistant.process_task(request.task, verbose=request.verbose)
-        return TaskResponse(status="success", result=result)
+        result = await assistant.aprocess_task(request.task, verbose=request.verbose)
+        trace_id = result.pop("trace_id", None)
+        return json_response(
+            {"status": "success", "result": project(result, parse_fields(fields)), "trace_id": trace_id},
+            http_request
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/process/batch", response_model=BatchTaskResponse)
+async def process_batch(request: BatchTaskRequest, http_request: Request, fields: Optional[str] = None):
+    """
+    Process many tasks in one request
+    
+    Identical tool calls across tasks are made once and all work shares
+    one concurrency limit.
+    
+    Args:
+        request: List of tasks (at most BATCH_MAX_TASKS) and optional
+            concurrency limit (capped at BATCH_MAX_CONCURRENCY)
+        fields: Comma-separated fields to keep in each result
+    
+    Returns:
+        Per-task results in input order plus aggregate timing
+    """
+    if len(request.tasks) > BATCH_MAX_TASKS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_TASKS} tasks per batch")
+    
+    try:
+        batch = await assistant.aprocess_batch(request.tasks, request.max_concurrency)
+        batch["results"] = project(batch["results"], parse_fields(fields))
+        return json_response({"status": "success", **batch}, http_request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/process/stream")
+async def process_task_stream(request: TaskRequest):
+    """
+    Process a task, streaming progress as newline-delimited JSON
+    
+    Events arrive as soon as they are available: the plan, each step
+    result, chunks of the verifier summary, and finally the full result.
+    
+    Args:
+        request: Task request with task description
+    
+    Returns:
+        application/x-ndjson stream of {"event": ..., "data": ...} objects
+    """
+    async def events() -> AsyncIterator[bytes]:
+        async for event in assistant.astream_task(request.task):
+            yield dumps(event) + b"\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
@@ -65,10 +173,30 @@ async def health_check():
             "executor": "ready",
             "verifier": "ready"
         },
-        "tools": ["github_search", "github_info", "weather_current", "weather_forecast"]
+        "tools": ["github_search", "github_info", "weather_current", "weather_forecast", "weather_batch"],
+        "http_pool": http_pool.stats(),
+        "tool_cache": assistant.executor.cache.stats(),
+        "github_conditional_requests": github_tool.etag_stats.snapshot(),
+        "geocode_cache": weather_tool.geocode_stats.snapshot(),
+        "plan_cache": assistant.planner.plan_cache.stats(),
+        "fast_planner": assistant.planner.fast_path.stats(),
+        "verifier_payload": assistant.verifier.compactor.stats(),
+        "single_flight": {
+            "tools": assistant.executor.single_flight.stats(),
+            "llm": assistant.planner.llm.single_flight.stats()
+        },
+        "llm_router": assistant.planner.llm.stats(),
+        "rate_limits": rate_limits.stats(),
+        "circuit_breakers": circuit_breakers.stats()
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Latency histograms and counters in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     print("""
     ╔═══════════════════════════════════════════════╗
@@ -79,8 +207,12 @@ if __name__ == "__main__":
     
     Endpoints:
     - POST /process - Process a task
+    - POST /process/stream - Process a task, streaming NDJSON events
+    - POST /process/batch - Process many tasks with shared tool calls
     - GET /health  - Health check
+    - GET /metrics - Prometheus metrics
     - GET /docs    - API documentation
     """)
     
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,305 @@
+"""
+Pipeline benchmark against local upstream stand-ins
+
+Runs AIOperationsAssistant.process_task (and optionally POST /process on
+the API server) against stub GitHub, OpenWeather and LLM upstreams with
+injected latency, and reports throughput, p50/p95/p99 latency and a
+per-stage breakdown for serial, parallel and cached configurations.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py
+    python benchmarks/pipeline_benchmark.py --mode both --requests 50 --concurrency 8
+    python benchmarks/pipeline_benchmark.py --json results.json
+    python benchmarks/pipeline_benchmark.py --baseline results.json --tolerance 0.25
+
+With --baseline the script exits non-zero when any configuration's p95
+latency or throughput regresses by more than the tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstreams import StubUpstreams
+
+STAGES = ("planning", "execution", "verification")
+CONFIGS = ("serial", "parallel", "cached")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+class StageCollector:
+    """Tracing exporter that keeps stage durations per trace"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}
+    
+    def export(self, spans):
+        durations = {span.name: span.duration_ms / 1000 for span in spans if span.name in STAGES}
+        with self._lock:
+            self.stages[spans[0].trace_id] = durations
+    
+    def take(self, trace_ids: List[str]) -> Dict[str, List[float]]:
+        with self._lock:
+            found = [self.stages.pop(trace_id, {}) for trace_id in trace_ids]
+        return {stage: [d[stage] for d in found if stage in d] for stage in STAGES}
+
+
+def point_at_stubs(stub: StubUpstreams):
+    """
+    Route every upstream to the stand-ins. Must run before the
+    application modules are imported, since they read configuration at
+    import time.
+    """
+    os.environ["LLM_PROVIDERS"] = "ollama"
+    os.environ["OLLAMA_HOST"] = f"{stub.url}/ollama"
+    os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+    # A token enables bulk GraphQL repository lookups
+    os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+    # Keep resolved coordinates out of the local .cache directory
+    os.environ.setdefault("GEOCODE_CACHE_BACKEND", "memory")
+    # Benchmarks measure the pipeline, not the upstream rate budgets
+    for name in ("GITHUB_SEARCH_RATE_PER_MIN", "GITHUB_CORE_RATE_PER_HOUR", "OPENWEATHER_RATE_PER_MIN"):
+        os.environ[name] = "1000000"
+    
+    from tools.github_tool import github_tool
+    from tools.weather_tool import weather_tool
+    github_tool.base_url = f"{stub.url}/github"
+    weather_tool.base_url = f"{stub.url}/openweather/data/2.5"
+    weather_tool.geo_url = f"{stub.url}/openweather/geo/1.0"
+
+
+def configure(assistant, config: str, max_concurrency: int):
+    """Swap in agents for one benchmark configuration"""
+    from agents.planner import PlannerAgent
+    from agents.plan_cache import PlanCache
+    from agents.fast_planner import FastPathPlanner
+    from agents.executor import ExecutorAgent
+    from agents.verifier import VerifierAgent
+    from tools.tool_cache import ToolResultCache
+    from utils.cache import MemoryCache
+    
+    cached = config == "cached"
+    assistant.planner = PlannerAgent(
+        plan_cache=PlanCache(backend=MemoryCache() if cached else None),
+        fast_path=FastPathPlanner(enabled=cached)
+    )
+    assistant.executor = ExecutorAgent(
+        parallel=config != "serial",
+        max_concurrency=max_concurrency,
+        cache=ToolResultCache(backend=MemoryCache() if cached else None)
+    )
+    assistant.verifier = VerifierAgent(mode="rule_first" if cached else "llm")
+
+
+def run_pipeline(assistant, tasks: List[str], concurrency: int) -> Dict[str, Any]:
+    """Call process_task from a pool of client threads"""
+    latencies, trace_ids, errors = [], [], 0
+    lock = threading.Lock()
+    
+    def one(task: str):
+        nonlocal errors
+        started = time.perf_counter()
+        result = assistant.process_task(task)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            trace_ids.append(result.get("trace_id"))
+            if result.get("status") == "error":
+                errors += 1
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, tasks))
+    return {"wall": time.perf_counter() - started, "latencies": latencies, "trace_ids": trace_ids, "errors": errors}
+
+
+def run_api(base_url: str, tasks: List[str], concurrency: int) -> Dict[str, Any]:
+    """POST /process with a bounded number of in-flight requests"""
+    import httpx
+    
+    async def main():
+        latencies, trace_ids, errors = [], [], 0
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            async def one(task: str):
+                nonlocal errors
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post("/process", json={"task": task})
+                    latencies.append(time.perf_counter() - started)
+                    body = response.json() if response.status_code == 200 else {}
+                    trace_ids.append(body.get("trace_id"))
+                    if response.status_code != 200 or body.get("result", {}).get("status") == "error":
+                        errors += 1
+            
+            started = time.perf_counter()
+            await asyncio.gather(*(one(task) for task in tasks))
+            wall = time.perf_counter() - started
+        return {"wall": wall, "latencies": latencies, "trace_ids": trace_ids, "errors": errors}
+    
+    return asyncio.run(main())
+
+
+def start_api_server():
+    """Run api_server.app under uvicorn on a free port; returns (base URL, assistant)"""
+    import uvicorn
+    import api_server
+    
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    
+    server = uvicorn.Server(uvicorn.Config(api_server.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="benchmark-api", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", api_server.assistant
+
+
+def summarize(run: Dict[str, Any], stages: Dict[str, List[float]]) -> Dict[str, Any]:
+    """Throughput, latency percentiles and per-stage breakdown in ms"""
+    ms = lambda value: round(value * 1000, 1) if value is not None else None
+    latencies = run["latencies"]
+    return {
+        "requests": len(latencies),
+        "errors": run["errors"],
+        "throughput_rps": round(len(latencies) / run["wall"], 2) if run["wall"] else None,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "stages": {
+            stage: {
+                "mean_ms": ms(sum(values) / len(values)) if values else None,
+                "p95_ms": ms(percentile(values, 0.95))
+            }
+            for stage, values in stages.items()
+        }
+    }
+
+
+def print_table(results: Dict[str, Dict[str, Any]]):
+    header = f"{'run':<18}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>5}   " + "  ".join(
+        f"{stage:>13}" for stage in STAGES
+    )
+    print(header)
+    print("-" * len(header))
+    for name, summary in results.items():
+        stages = "  ".join(
+            f"{str(summary['stages'][stage]['mean_ms']):>6}/{str(summary['stages'][stage]['p95_ms']):>6}"
+            for stage in STAGES
+        )
+        print(
+            f"{name:<18}{summary['throughput_rps']:>8}{summary['p50_ms']:>9}{summary['p95_ms']:>9}"
+            f"{summary['p99_ms']:>9}{summary['errors']:>5}   {stages}"
+        )
+    print("\nLatencies in ms; stage columns are mean/p95 per request.")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Regressions against a previous --json run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    
+    regressions = []
+    for name, summary in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and summary["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {summary['p95_ms']}ms")
+        if before["throughput_rps"] and summary["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {summary['throughput_rps']} req/s")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=("pipeline", "api", "both"), default="pipeline")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help="Comma-separated subset of serial,parallel,cached")
+    parser.add_argument("--requests", type=int, default=30, help="Measured requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent client requests")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Executor step concurrency")
+    parser.add_argument("--github-latency", type=float, default=0.1)
+    parser.add_argument("--weather-latency", type=float, default=0.08)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.2, help="Random +/- fraction of injected latency")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--baseline", help="Fail on regressions against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression fraction")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stub = StubUpstreams(args.github_latency, args.weather_latency, args.llm_latency, args.jitter).start()
+    point_at_stubs(stub)
+    
+    from main import AIOperationsAssistant
+    from utils.tracing import tracer
+    
+    collector = StageCollector()
+    tracer.exporter = collector
+    
+    fixture_tasks = [entry["task"] for entry in stub.fixtures["tasks"]]
+    tasks = [fixture_tasks[i % len(fixture_tasks)] for i in range(args.requests)]
+    configs = [c.strip() for c in args.configs.split(",") if c.strip()]
+    
+    targets = []
+    if args.mode in ("pipeline", "both"):
+        targets.append(("pipeline", AIOperationsAssistant(), None))
+    if args.mode in ("api", "both"):
+        base_url, api_assistant = start_api_server()
+        targets.append(("api", api_assistant, base_url))
+    
+    results = {}
+    for target, assistant, base_url in targets:
+        for config in configs:
+            configure(assistant, config, args.max_concurrency)
+            
+            if config == "cached":
+                # Warm the caches so the measured run reflects steady state
+                run_pipeline(assistant, fixture_tasks, 1)
+            
+            if base_url:
+                run = run_api(base_url, tasks, args.concurrency)
+            else:
+                run = run_pipeline(assistant, tasks, args.concurrency)
+            results[f"{target}/{config}"] = summarize(run, collector.take(run["trace_ids"]))
+    
+    stub.stop()
+    print_table(results)
+    print(f"Upstream requests: {stub.requests}")
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions beyond tolerance.")
+
+
+if __name__ == "__main__":
+    main()
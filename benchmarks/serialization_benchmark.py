@@ -0,0 +1,172 @@
+"""
+Response serialization and payload size benchmark
+
+Builds /process responses for GitHub searches of increasing size (plus a
+multi-city forecast) from the recorded fixtures and compares FastAPI's
+generic path (pydantic response model, jsonable_encoder, json.dumps) with
+the direct serializer, field projection and gzip/zstd compression.
+
+Usage:
+    python benchmarks/serialization_benchmark.py
+    python benchmarks/serialization_benchmark.py --limits 10,100,500 --runs 200
+    python benchmarks/serialization_benchmark.py --fields verification --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstreams import FIXTURES_PATH
+
+
+def search_result(repository: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """Verified result of a github_search step returning `limit` repositories"""
+    from tools.github_tool import github_tool
+    
+    items = [
+        dict(repository, name=f"repo-{i}", full_name=f"owner{i}/repo-{i}",
+             stargazers_count=repository["stargazers_count"] // (i + 1))
+        for i in range(limit)
+    ]
+    repositories = github_tool._parse_search({"items": items})
+    return {
+        "task": f"Find the top {limit} Python repositories",
+        "status": "success",
+        "verification": {
+            "is_complete": True,
+            "missing_items": [],
+            "summary": f"Found {limit} repositories; the most starred is {repositories[0]['full_name']}.",
+            "confidence": "high"
+        },
+        "data": [{"step": 1, "action": "github_search", "data": repositories}],
+        "errors": None
+    }
+
+
+def forecast_result(cities: int) -> Dict[str, Any]:
+    """Verified result of a weather_batch forecast step with a 3-hour series per city"""
+    from tools.forecast_reducer import ForecastReducer
+    
+    reducer = ForecastReducer()
+    readings = [
+        {
+            "dt": 1700000000 + 3 * 60 * 60 * i,
+            "dt_txt": f"2023-11-{14 + i // 8:02d} {3 * (i % 8):02d}:00:00",
+            "main": {"temp": round(12 + 6 * ((i % 8) / 7), 1), "humidity": 60 + i % 20},
+            "weather": [{"main": "Clouds", "description": "scattered clouds"}]
+        }
+        for i in range(40)
+    ]
+    batch = [
+        {
+            "query": f"City {i}",
+            "data": {
+                "city": f"City {i}",
+                "country": "XX",
+                "forecasts": reducer.reduce(readings),
+                "aggregation": reducer.aggregation,
+                "units": "°C",
+                "series": reducer.series(readings)
+            }
+        }
+        for i in range(cities)
+    ]
+    return {
+        "task": f"Forecast for {cities} cities",
+        "status": "success",
+        "verification": {"is_complete": True, "missing_items": [], "summary": "Forecasts retrieved.", "confidence": "high"},
+        "data": [{"step": 1, "action": "weather_batch", "data": batch}],
+        "errors": None
+    }
+
+
+def fastapi_body(result: Dict[str, Any]) -> bytes:
+    """What FastAPI sends for a TaskResponse through its generic encoder"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from api_server import TaskResponse
+    
+    model = TaskResponse(status="success", result=result, trace_id="0" * 32)
+    return JSONResponse(jsonable_encoder(model)).body
+
+
+def timed(fn: Callable[[], Any], runs: int) -> float:
+    """Median microseconds per call"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def measure(result: Dict[str, Any], fields: str, runs: int) -> Dict[str, Any]:
+    from utils.serialization import ResponseEncoder, dumps, parse_fields, project
+    
+    payload = {"status": "success", "result": result, "trace_id": "0" * 32}
+    projected = {"status": "success", "result": project(result, parse_fields(fields)), "trace_id": "0" * 32}
+    body = dumps(payload)
+    
+    rows = {
+        "fastapi": {"us": timed(lambda: fastapi_body(result), runs), "bytes": len(fastapi_body(result))},
+        "direct": {"us": timed(lambda: dumps(payload), runs), "bytes": len(body)},
+        f"fields={fields}": {"us": timed(lambda: dumps(projected), runs), "bytes": len(dumps(projected))}
+    }
+    for encoding in ("gzip", "zstd"):
+        encoder = ResponseEncoder(encodings=[encoding], min_bytes=0)
+        if not encoder.encodings:
+            continue
+        compressed, _ = encoder.compress(body, encoding)
+        rows[encoding] = {"us": timed(lambda: encoder.compress(dumps(payload), encoding), runs), "bytes": len(compressed)}
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--limits", default="10,30,100,300", help="Comma-separated github_search result counts")
+    parser.add_argument("--cities", type=int, default=10, help="Cities in the forecast batch payload (0 to skip)")
+    parser.add_argument("--fields", default="verification", help="Projection to compare against the full body")
+    parser.add_argument("--runs", type=int, default=100, help="Timed runs per measurement")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    from utils import serialization
+    
+    with open(FIXTURES_PATH, encoding="utf-8") as f:
+        repository = json.load(f)["github_repository"]
+    
+    payloads = {
+        f"github_search limit={limit}": search_result(repository, int(limit))
+        for limit in args.limits.split(",") if limit.strip()
+    }
+    if args.cities:
+        payloads[f"weather_batch cities={args.cities}"] = forecast_result(args.cities)
+    
+    results = {name: measure(result, args.fields, args.runs) for name, result in payloads.items()}
+    
+    print(f"Serializer: {'orjson' if serialization.orjson is not None else 'json'}\n")
+    for name, rows in results.items():
+        print(name)
+        baseline = rows["fastapi"]
+        for form, row in rows.items():
+            print(
+                f"    {form:<24}{row['us']:>10.1f}us {baseline['us'] / row['us'] if row['us'] else 0:>6.1f}x"
+                f"{row['bytes']:>10} B {row['bytes'] / baseline['bytes']:>6.1%}"
+            )
+    print("\nTimes are medians per response, relative to FastAPI's encoder; sizes relative to its body.")
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
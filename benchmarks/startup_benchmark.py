@@ -0,0 +1,134 @@
+"""
+Cold-start benchmark for the CLI and API server entry points
+
+Imports main and api_server in fresh interpreters and reports the median
+import time, the slowest modules from -X importtime, and whether any LLM
+provider SDK was loaded. Provider SDKs and HTTP clients are created on
+first use, so none should be imported at startup.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --budget-main 0.4 --budget-api 1.5
+    LLM_PROVIDERS=groq,openai python benchmarks/startup_benchmark.py
+
+Exits non-zero when a module's median import time exceeds its budget or
+a provider SDK is imported at startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROVIDER_SDKS = ("groq", "openai", "google.generativeai")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "sdks": [name for name in {sdks!r} if name in sys.modules]}}))
+"""
+
+
+def run_probe(module: str) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter; returns import seconds, process seconds and loaded SDKs"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, sdks=PROVIDER_SDKS)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    process_seconds = time.perf_counter() - started
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_seconds"] = process_seconds
+    return result
+
+
+def slowest_imports(module: str, top: int) -> List[Dict[str, Any]]:
+    """Direct imports of a module with the largest cumulative time, from -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative_us) / 1000))
+    
+    # Children are reported before their parent: walk back from the module's own row
+    end = max(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == module)
+    children = []
+    for depth, name, cumulative_ms in reversed(rows[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append({"module": name, "cumulative_ms": cumulative_ms})
+    return sorted(children, key=lambda row: row["cumulative_ms"], reverse=True)[:top]
+
+
+def measure(module: str, runs: int, top: int) -> Dict[str, Any]:
+    probes = [run_probe(module) for _ in range(runs)]
+    return {
+        "median_ms": round(statistics.median(p["seconds"] for p in probes) * 1000, 1),
+        "max_ms": round(max(p["seconds"] for p in probes) * 1000, 1),
+        "process_median_ms": round(statistics.median(p["process_seconds"] for p in probes) * 1000, 1),
+        "provider_sdks": sorted({name for p in probes for name in p["sdks"]}),
+        "slowest_imports": slowest_imports(module, top)
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to list")
+    parser.add_argument("--budget-main", type=float, default=0.5, help="Import budget for main, in seconds")
+    parser.add_argument("--budget-api", type=float, default=2.0, help="Import budget for api_server, in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    budgets = {"main": args.budget_main, "api_server": args.budget_api}
+    
+    # Warm the bytecode cache so the first run doesn't include compilation
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "."], cwd=ROOT, check=False)
+    
+    results = {module: measure(module, args.runs, args.top) for module in budgets}
+    
+    failures = []
+    for module, result in results.items():
+        budget_ms = budgets[module] * 1000
+        print(
+            f"{module:<12} import median {result['median_ms']:>7}ms  max {result['max_ms']:>7}ms  "
+            f"process {result['process_median_ms']:>7}ms  budget {budget_ms:.0f}ms"
+        )
+        for row in result["slowest_imports"]:
+            print(f"    {row['module']:<28}{row['cumulative_ms']:>9.1f}ms")
+        if result["median_ms"] > budget_ms:
+            failures.append(f"{module}: {result['median_ms']}ms exceeds the {budget_ms:.0f}ms budget")
+        if result["provider_sdks"]:
+            failures.append(f"{module}: provider SDKs imported at startup: {', '.join(result['provider_sdks'])}")
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    
+    if failures:
+        print("\nStartup budget exceeded:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nWithin startup budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Local stand-ins for GitHub, OpenWeather and the LLM provider
+
+Serves recorded fixtures with configurable injected latency so the
+pipeline can be benchmarked without network access or API keys. The LLM
+stand-in speaks the Ollama /api/generate protocol (blocking and
+streaming) and answers planner prompts with the fixture plan for the
+task, and verifier prompts with a canned verification.
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures.json")
+
+VERIFICATION = {
+    "is_complete": True,
+    "missing_items": [],
+    "summary": "All requested information was retrieved successfully.",
+    "confidence": "high"
+}
+
+
+class StubUpstreams:
+    def __init__(
+        self,
+        github_latency: float = 0.1,
+        weather_latency: float = 0.08,
+        llm_latency: float = 0.3,
+        jitter: float = 0.2,
+        fixtures_path: str = FIXTURES_PATH
+    ):
+        """
+        Args:
+            github_latency: Seconds added to every GitHub response
+            weather_latency: Seconds added to every OpenWeather response
+            llm_latency: Seconds added to every LLM response
+            jitter: Random +/- fraction applied to each latency
+            fixtures_path: Recorded responses and per-task plans
+        """
+        self.latency = {"github": github_latency, "openweather": weather_latency, "ollama": llm_latency}
+        self.jitter = jitter
+        with open(fixtures_path, encoding="utf-8") as f:
+            self.fixtures = json.load(f)
+        self.plans = {entry["task"]: entry["plan"] for entry in self.fixtures["tasks"]}
+        self.requests = {"github": 0, "openweather": 0, "ollama": 0}
+        self.places: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "StubUpstreams":
+        """Serve on an ephemeral localhost port from a daemon thread"""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                stub._handle(self, None)
+            
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                stub._handle(self, json.loads(self.rfile.read(length) or b"{}"))
+            
+            def log_message(self, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+    
+    def _sleep(self, upstream: str):
+        latency = self.latency[upstream]
+        if latency > 0:
+            time.sleep(max(0.0, latency * (1 + random.uniform(-self.jitter, self.jitter))))
+    
+    def _handle(self, handler: BaseHTTPRequestHandler, body: Optional[Dict[str, Any]]):
+        parsed = urlparse(handler.path)
+        upstream, _, path = parsed.path.lstrip("/").partition("/")
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        
+        if upstream not in self.latency:
+            return self._send(handler, 404, {"message": "Not Found"})
+        with self._lock:
+            self.requests[upstream] += 1
+        self._sleep(upstream)
+        
+        if upstream == "github":
+            return self._send(handler, *self._github(path, query, handler.headers, body))
+        if upstream == "openweather":
+            return self._send(handler, *self._openweather(path, query))
+        if body and body.get("stream"):
+            return self._stream_ollama(handler, self._ollama_text(body["prompt"]))
+        return self._send(handler, 200, self._ollama_response(self._ollama_text(body["prompt"]), done=True))
+    
+    def _github(self, path: str, query: Dict[str, str], headers, body: Optional[Dict[str, Any]]):
+        repository = self.fixtures["github_repository"]
+        if path == "graphql":
+            return 200, {"data": self._github_graphql(repository, body["variables"])}
+        if path == "search/repositories":
+            limit = int(query.get("per_page", 5))
+            words = re.sub(r"\W+", "-", query.get("q", "repo")).strip("-") or "repo"
+            items = [
+                dict(repository, name=f"{words}-{i}", full_name=f"owner{i}/{words}-{i}",
+                     stargazers_count=repository["stargazers_count"] // (i + 1))
+                for i in range(limit)
+            ]
+            return 200, {"total_count": limit, "items": items}
+        
+        match = re.fullmatch(r"repos/([^/]+)/([^/]+)", path)
+        if match:
+            owner, repo = match.groups()
+            # Repositories never change here, so their ETag is just the name
+            etag = f'"{owner}/{repo}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, None, {"ETag": etag}
+            return 200, dict(repository, name=repo, full_name=f"{owner}/{repo}",
+                             html_url=f"https://github.com/{owner}/{repo}"), {"ETag": etag}
+        return 404, {"message": "Not Found"}
+    
+    def _github_graphql(self, repository: Dict[str, Any], variables: Dict[str, str]) -> Dict[str, Any]:
+        """Answer a bulk repository query (aliases r0..rN) from the fixture"""
+        data = {}
+        for i in range(len(variables) // 2):
+            owner, name = variables[f"owner{i}"], variables[f"name{i}"]
+            data[f"r{i}"] = {
+                "name": name,
+                "nameWithOwner": f"{owner}/{name}",
+                "description": repository.get("description"),
+                "stargazerCount": repository["stargazers_count"],
+                "forkCount": repository["forks_count"],
+                "primaryLanguage": {"name": repository["language"]} if repository.get("language") else None,
+                "url": f"https://github.com/{owner}/{name}",
+                "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in repository.get("topics", [])]},
+                "createdAt": repository["created_at"],
+                "updatedAt": repository["updated_at"]
+            }
+        return data
+    
+    def _openweather(self, path: str, query: Dict[str, str]):
+        if path == "geo/1.0/direct":
+            # Deterministic coordinates per name, remembered for coordinate lookups
+            name = query["q"].split(",")[0].strip()
+            digest = sum(ord(char) * (i + 1) for i, char in enumerate(name.lower()))
+            lat, lon = round(digest % 180 - 90 + 0.5, 4), round(digest * 7 % 360 - 180 + 0.5, 4)
+            self.places[f"{lat},{lon}"] = name
+            return 200, [{"name": name, "lat": lat, "lon": lon, "country": "XX"}]
+        city = query.get("q") or self.places.get(f"{query.get('lat')},{query.get('lon')}", "City")
+        if path.endswith("/weather"):
+            return 200, dict(self.fixtures["weather_current"], name=city)
+        if path.endswith("/forecast"):
+            start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            conditions = self.fixtures["forecast_conditions"]
+            readings = []
+            for i in range(min(40, int(query.get("cnt", 40)))):
+                main, description = conditions[(i // 3) % len(conditions)]
+                readings.append({
+                    "dt": int((start + timedelta(hours=3 * i)).timestamp()),
+                    "dt_txt": (start + timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "main": {"temp": round(12 + 6 * ((i % 8) / 7), 1), "humidity": 60 + i % 20},
+                    "weather": [{"main": main, "description": description}]
+                })
+            return 200, {"list": readings, "city": {"name": city, "country": "XX", "timezone": 0}}
+        return 404, {"message": "Not Found"}
+    
+    def _ollama_text(self, prompt: str) -> str:
+        if "planning agent" in prompt:
+            match = re.search(r"^Task: (.*)$", prompt, re.MULTILINE)
+            task = match.group(1).strip() if match else ""
+            plan = self.plans.get(task) or self.fixtures["tasks"][0]["plan"]
+            return json.dumps(plan)
+        return json.dumps(VERIFICATION)
+    
+    def _ollama_response(self, text: str, done: bool) -> Dict[str, Any]:
+        response = {"model": "llama3.2", "response": text, "done": done}
+        if done:
+            response.update(prompt_eval_count=400, eval_count=max(1, len(text) // 4))
+        return response
+    
+    def _stream_ollama(self, handler: BaseHTTPRequestHandler, text: str):
+        """Stream the response as NDJSON chunks, as Ollama does"""
+        chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        for chunk in chunks + [""]:
+            line = json.dumps(self._ollama_response(chunk, done=not chunk)).encode("utf-8") + b"\n"
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+    
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        if payload is not None:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
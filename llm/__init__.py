@@ -1,3 +1,9 @@
-from .llm_client import llm_client, LLMClient
+from .llm_client import llm_client, LLMClient, BaseLLMClient
+from .json_stream import JSONArrayStreamParser, partial_string_value
+from .router import llm_router, LLMRouter
 
-__all__ = ['llm_client', 'LLMClient']
+__all__ = [
+    'llm_client', 'LLMClient', 'BaseLLMClient',
+    'JSONArrayStreamParser', 'partial_string_value',
+    'llm_router', 'LLMRouter'
+]
@@ -0,0 +1,211 @@
+"""
+Incremental parsing of JSON objects streamed by an LLM
+"""
+import json
+from typing import Any, List, Optional
+
+
+class _TopLevelKeyScanner:
+    """
+    Find where a key's value starts in the outermost object of a streamed
+    document, skipping string contents and keys of nested objects
+    """
+    
+    def __init__(self, key: str):
+        """
+        Args:
+            key: Key of the outermost object to look for
+        """
+        self.key = key
+        self._position = 0       # next character to scan
+        self._depth = 0          # object/array nesting depth
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._candidate = None   # string just closed at the top level, maybe a key
+        self._after_key = False  # key and its ":" seen, value not yet started
+    
+    def scan(self, buffer: str) -> Optional[int]:
+        """
+        Continue scanning a buffer that has grown since the last call
+        
+        Args:
+            buffer: Document text received so far
+        
+        Returns:
+            Index of the value's first character, or None if not arrived yet
+        """
+        while self._position < len(buffer):
+            position = self._position
+            char = buffer[position]
+            self._position += 1
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._candidate = buffer[self._string_start:position + 1]
+                continue
+            if char.isspace():
+                continue
+            if self._after_key:
+                return position
+            
+            if char == ":" and self._depth == 1 and self._is_key(self._candidate):
+                self._after_key = True
+            elif char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+            self._candidate = None
+        
+        return None
+    
+    def _is_key(self, candidate: Optional[str]) -> bool:
+        """Whether a complete JSON string token spells the key"""
+        if candidate is None:
+            return False
+        try:
+            return json.loads(candidate) == self.key
+        except json.JSONDecodeError:
+            return False
+
+
+class JSONArrayStreamParser:
+    """
+    Emit elements of a top-level array (e.g. a plan's "steps") as soon as
+    each one is complete, without waiting for the rest of the document
+    """
+    
+    def __init__(self, key: str):
+        """
+        Args:
+            key: Top-level key whose array elements should be emitted
+        """
+        self.key = key
+        self.buffer = ""
+        self._key_scanner = _TopLevelKeyScanner(key)
+        self._position = 0       # next character to scan
+        self._array_start = None  # index just past the array's "["
+        self._element_start = None
+        self._depth = 0          # nesting depth inside the array
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add streamed text
+        
+        Args:
+            chunk: Next piece of the response
+        
+        Returns:
+            Array elements completed by this chunk
+        """
+        self.buffer += chunk
+        if self._done:
+            return []
+        
+        if self._array_start is None:
+            start = self._key_scanner.scan(self.buffer)
+            if start is None:
+                return []
+            if self.buffer[start] != "[":
+                # The key holds something other than an array
+                self._done = True
+                return []
+            self._array_start = self._position = start + 1
+        
+        elements = []
+        buffer = self.buffer
+        
+        while self._position < len(buffer):
+            char = buffer[self._position]
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+                if self._element_start is None:
+                    self._element_start = self._position
+            elif char in "{[":
+                if self._element_start is None:
+                    self._element_start = self._position
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    self._flush(elements, self._position)
+                    self._done = True
+                    self._position += 1
+                    break
+                self._depth -= 1
+            elif char == "," and self._depth == 0:
+                self._flush(elements, self._position)
+            elif not char.isspace() and self._element_start is None:
+                self._element_start = self._position
+            
+            self._position += 1
+        
+        return elements
+    
+    def _flush(self, elements: List[Any], end: int):
+        """Parse the element ending just before `end`"""
+        if self._element_start is not None:
+            try:
+                elements.append(json.loads(self.buffer[self._element_start:end]))
+            except json.JSONDecodeError as e:
+                raise Exception(f"Failed to parse LLM response as JSON: {self.buffer}") from e
+        self._element_start = None
+
+
+def partial_string_value(buffer: str, key: str) -> Optional[str]:
+    """
+    Decode as much of a string value as has arrived in a partially
+    streamed JSON object
+    
+    Args:
+        buffer: JSON text received so far
+        key: Key whose string value to read
+    
+    Returns:
+        Value text so far, or None if the key hasn't started yet
+    """
+    start = _TopLevelKeyScanner(key).scan(buffer)
+    if start is None or buffer[start] != '"':
+        return None
+    
+    raw = []
+    index = start + 1
+    while index < len(buffer):
+        char = buffer[index]
+        if char == '"':
+            break
+        if char == "\\":
+            # Escape sequences are only decoded once complete
+            length = 6 if buffer[index + 1:index + 2] == "u" else 2
+            if index + length > len(buffer):
+                break
+            raw.append(buffer[index:index + length])
+            index += length
+            continue
+        raw.append(char)
+        index += 1
+    
+    try:
+        return json.loads('"' + "".join(raw) + '"')
+    except json.JSONDecodeError:
+        return None
@@ -5,20 +5,244 @@ LLM Client supporting multiple FREE providers:
 - Ollama (FREE, local)
 - OpenAI (paid backup)
 """
+import asyncio
 import os
 import json
-import requests
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+import hashlib
+import threading
+import weakref
+from typing import Dict, Any, Optional, AsyncIterator, Iterator, Tuple
+from utils.http_pool import http_pool
+from utils.single_flight import SingleFlight
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.resilience import RetryPolicy, CircuitOpenError, circuit_breakers, call_with_retry, acall_with_retry
+from llm.json_stream import JSONArrayStreamParser
 
-load_dotenv()
+LLM_CALL_SECONDS = metrics.histogram(
+    "llm_call_seconds", "Latency of each non-streaming LLM provider attempt", ["provider", "status"]
+)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens_total", "Tokens reported by LLM providers", ["provider", "kind"]
+)
 
 
-class LLMClient:
+# Provider preference order and the environment variable that enables each
+PROVIDER_ENV_VARS = {
+    "groq": "GROQ_API_KEY",
+    "gemini": "GOOGLE_API_KEY",
+    "ollama": "OLLAMA_HOST",
+    "openai": "OPENAI_API_KEY",
+}
+
+
+class BaseLLMClient:
+    """
+    Interface shared by single-provider clients and the router
+    
+    Subclasses set provider and model and implement _generate/_agenerate
+    (one uncoalesced call), the two streaming methods and aclose. Request
+    coalescing and JSON parsing live here.
+    """
+    
     def __init__(self):
+        self.single_flight = SingleFlight()
+    
+    def generate(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Generate a response from the LLM
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            json_mode: Enable JSON response format
+            temperature: Sampling temperature
+        
+        Returns:
+            LLM response as string
+        """
+        # Identical concurrent prompts share one provider call
+        key = self._request_key(prompt, system_prompt, json_mode, temperature)
+        return self.single_flight.do(
+            key,
+            lambda: self._generate(prompt, system_prompt, json_mode, temperature),
+            label=self.provider
+        )
+    
+    async def agenerate(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Async variant of generate that does not block the event loop
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            json_mode: Enable JSON response format
+            temperature: Sampling temperature
+        
+        Returns:
+            LLM response as string
+        """
+        key = self._request_key(prompt, system_prompt, json_mode, temperature)
+        return await self.single_flight.ado(
+            key,
+            lambda: self._agenerate(prompt, system_prompt, json_mode, temperature),
+            label=self.provider
+        )
+    
+    def generate_json(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate and parse JSON response from LLM
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+        
+        Returns:
+            Parsed JSON as dictionary
+        """
+        response = self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            json_mode=True,
+            temperature=0.3  # Lower temperature for structured output
+        )
+        
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            raise Exception(f"Failed to parse LLM response as JSON: {response}")
+    
+    async def agenerate_json(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async variant of generate_json"""
+        response = await self.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            json_mode=True,
+            temperature=0.3
+        )
+        
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            raise Exception(f"Failed to parse LLM response as JSON: {response}")
+    
+    def generate_json_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        array_key: str = "steps"
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream a JSON response, emitting array elements as soon as they parse
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            array_key: Top-level array whose elements are emitted early
+        
+        Yields:
+            ("item", element) for each completed element of array_key,
+            then ("result", parsed_document)
+        """
+        parser = JSONArrayStreamParser(array_key)
+        for chunk in self.generate_stream(prompt, system_prompt, json_mode=True, temperature=0.3):
+            for item in parser.feed(chunk):
+                yield "item", item
+        
+        try:
+            yield "result", json.loads(parser.buffer)
+        except json.JSONDecodeError:
+            raise Exception(f"Failed to parse LLM response as JSON: {parser.buffer}")
+    
+    async def agenerate_json_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        array_key: str = "steps"
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Async variant of generate_json_stream"""
+        parser = JSONArrayStreamParser(array_key)
+        async for chunk in self.agenerate_stream(prompt, system_prompt, json_mode=True, temperature=0.3):
+            for item in parser.feed(chunk):
+                yield "item", item
+        
+        try:
+            yield "result", json.loads(parser.buffer)
+        except json.JSONDecodeError:
+            raise Exception(f"Failed to parse LLM response as JSON: {parser.buffer}")
+    
+    def _request_key(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Identity of a generation request for coalescing"""
+        payload = json.dumps([self.provider, self.model, system_prompt, prompt, json_mode, temperature])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _generate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """One blocking generation call"""
+        raise NotImplementedError
+    
+    async def _agenerate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """One async generation call"""
+        raise NotImplementedError
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """Stream the response as text chunks"""
+        raise NotImplementedError
+    
+    def agenerate_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """Async variant of generate_stream"""
+        raise NotImplementedError
+    
+    async def aclose(self):
+        """Close async clients bound to the running event loop"""
+        raise NotImplementedError
+
+
+class LLMClient(BaseLLMClient):
+    def __init__(self, provider: Optional[str] = None):
+        """
+        Args:
+            provider: groq, gemini, ollama or openai; detected from API keys if omitted
+        """
         # Choose provider based on available API keys
-        self.provider = self._detect_provider()
+        self.provider = provider or self._detect_provider()
+        if self.provider not in PROVIDER_ENV_VARS:
+            raise ValueError(f"Unknown LLM provider: {self.provider}")
+        super().__init__()
         self._setup_client()
+        self.retry_policy = RetryPolicy()
+        self.breaker = circuit_breakers.get(f"llm:{self.provider}")
     
     def _detect_provider(self) -> str:
         """Detect which LLM provider to use based on environment variables"""
@@ -35,54 +259,172 @@ class LLMClient:
             return "groq"
     
     def _setup_client(self):
-        """Setup client based on provider"""
+        """Setup provider settings; SDK clients are created on first use"""
+        self._client = None
+        # Async SDK clients are bound to the event loop they were created in
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._client_lock = threading.Lock()
         if self.provider == "groq":
-            from groq import Groq
-            self.client = Groq(api_key=os.getenv("GROQ_API_KEY", ""))
             self.model = "llama-3.3-70b-versatile" # FREE Groq model
         elif self.provider == "gemini":
-            import google.generativeai as genai
-            genai.configure(api_key=os.getenv("GOOGLE_API_KEY", ""))
-            self.client = genai.GenerativeModel('gemini-1.5-flash')  # FREE tier
-            self.model = "gemini-1.5-flash"
+            self.model = "gemini-1.5-flash"  # FREE tier
         elif self.provider == "ollama":
             self.base_url = os.getenv("OLLAMA_HOST", "http://localhost:11434")
             self.model = "llama3.2"  # FREE local model
+            # Keep the model (and its cached prompt prefix) loaded between calls
+            self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+            self.http = http_pool
         elif self.provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
             self.model = "gpt-4o-mini"
     
-    def generate(
-        self, 
-        prompt: str, 
-        system_prompt: Optional[str] = None,
-        json_mode: bool = False,
-        temperature: float = 0.7
-    ) -> str:
-        """
-        Generate a response from the LLM
-        
-        Args:
-            prompt: User prompt
-            system_prompt: System instructions
-            json_mode: Enable JSON response format
-            temperature: Sampling temperature
-        
-        Returns:
-            LLM response as string
-        """
+    @property
+    def client(self):
+        """Blocking provider SDK client (imported and created on first use)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client(use_async=False)
+        return self._client
+    
+    @property
+    def async_client(self):
+        """Async provider SDK client for the running event loop (imported and created on first use)"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            with self._client_lock:
+                client = self._async_clients.get(loop)
+                if client is None:
+                    client = self._async_clients[loop] = self._build_client(use_async=True)
+        return client
+    
+    async def aclose(self):
+        """Close the running loop's async SDK client, if one was created"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        close = getattr(client, "close", None)
+        if close is not None and asyncio.iscoroutinefunction(close):
+            await close()
+    
+    def _build_client(self, use_async: bool):
+        """Import the provider SDK and create its client; Ollama uses the shared HTTP pool instead"""
+        if self.provider == "groq":
+            from groq import Groq, AsyncGroq
+            # Retries are handled by our retry policy, not the SDK
+            return (AsyncGroq if use_async else Groq)(api_key=os.getenv("GROQ_API_KEY", ""), max_retries=0)
+        if self.provider == "gemini":
+            # One model object serves both blocking and async calls
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GOOGLE_API_KEY", ""))
+            return genai.GenerativeModel(self.model)
+        if self.provider == "openai":
+            from openai import OpenAI, AsyncOpenAI
+            return (AsyncOpenAI if use_async else OpenAI)(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+        raise AttributeError(f"{self.provider} has no SDK client")
+    
+    def _generate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Blocking provider call with retries and circuit breaking"""
         try:
+            return call_with_retry(
+                lambda: self._dispatch(prompt, system_prompt, json_mode, temperature),
+                self.retry_policy,
+                self.breaker
+            )
+        except Exception as e:
+            raise Exception(f"LLM API Error ({self.provider}): {str(e)}") from e
+    
+    def _dispatch(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Dispatch a blocking call to the configured provider"""
+        with self._span(prompt, system_prompt, json_mode) as span, LLM_CALL_SECONDS.time(provider=self.provider):
             if self.provider == "groq":
-                return self._generate_groq(prompt, system_prompt, json_mode, temperature)
+                text = self._generate_groq(prompt, system_prompt, json_mode, temperature)
             elif self.provider == "gemini":
-                return self._generate_gemini(prompt, system_prompt, json_mode, temperature)
+                text = self._generate_gemini(prompt, system_prompt, json_mode, temperature)
             elif self.provider == "ollama":
-                return self._generate_ollama(prompt, system_prompt, json_mode, temperature)
+                text = self._generate_ollama(prompt, system_prompt, json_mode, temperature)
             elif self.provider == "openai":
-                return self._generate_openai(prompt, system_prompt, json_mode, temperature)
+                text = self._generate_openai(prompt, system_prompt, json_mode, temperature)
+            span.set_attributes(response_chars=len(text or ""))
+            return text
+    
+    async def _agenerate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Async provider call with retries and circuit breaking"""
+        try:
+            return await acall_with_retry(
+                lambda: self._adispatch(prompt, system_prompt, json_mode, temperature),
+                self.retry_policy,
+                self.breaker
+            )
         except Exception as e:
-            raise Exception(f"LLM API Error ({self.provider}): {str(e)}")
+            raise Exception(f"LLM API Error ({self.provider}): {str(e)}") from e
+    
+    async def _adispatch(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Dispatch an async call to the configured provider"""
+        with self._span(prompt, system_prompt, json_mode) as span, LLM_CALL_SECONDS.time(provider=self.provider):
+            if self.provider in ("groq", "openai"):
+                text = await self._agenerate_chat(prompt, system_prompt, json_mode, temperature)
+            elif self.provider == "gemini":
+                text = await self._agenerate_gemini(prompt, system_prompt, json_mode, temperature)
+            elif self.provider == "ollama":
+                text = await self._agenerate_ollama(prompt, system_prompt, json_mode, temperature)
+            span.set_attributes(response_chars=len(text or ""))
+            return text
+    
+    def _record_stream_error(self, error: Exception, started: bool):
+        """Count a failed stream towards the circuit breaker"""
+        if isinstance(error, CircuitOpenError):
+            return
+        if self.retry_policy.is_retryable(error):
+            self.breaker.record_failure()
+        elif not started:
+            self.breaker.record_success()
+    
+    def _span(self, prompt, system_prompt, json_mode):
+        """Tracing span for one provider attempt"""
+        return tracer.span(
+            "llm.generate",
+            provider=self.provider,
+            model=self.model,
+            json_mode=json_mode,
+            prompt_chars=len(prompt) + len(system_prompt or "")
+        )
+    
+    def _record_usage(
+        self,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        cached_tokens: Optional[int] = None
+    ):
+        """Count provider-reported token usage, including prompt tokens served from the provider's cache"""
+        if prompt_tokens:
+            LLM_TOKENS.inc(prompt_tokens, provider=self.provider, kind="prompt")
+        if completion_tokens:
+            LLM_TOKENS.inc(completion_tokens, provider=self.provider, kind="completion")
+        if cached_tokens:
+            LLM_TOKENS.inc(cached_tokens, provider=self.provider, kind="cached_prompt")
+        tracer.set_attributes(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens
+        )
+    
+    def _record_chat_usage(self, response):
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            self._record_usage(
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                getattr(details, "cached_tokens", None)
+            )
+    
+    def _record_gemini_usage(self, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self._record_usage(
+                usage.prompt_token_count,
+                usage.candidates_token_count,
+                getattr(usage, "cached_content_token_count", None)
+            )
     
     def _generate_groq(self, prompt, system_prompt, json_mode, temperature) -> str:
         """Generate using Groq (FREE)"""
@@ -100,6 +442,7 @@ class LLMClient:
             kwargs["response_format"] = {"type": "json_object"}
         
         response = self.client.chat.completions.create(**kwargs)
+        self._record_chat_usage(response)
         return response.choices[0].message.content
     
     def _generate_gemini(self, prompt, system_prompt, json_mode, temperature) -> str:
@@ -112,6 +455,7 @@ class LLMClient:
             full_prompt,
             generation_config={"temperature": temperature}
         )
+        self._record_gemini_usage(response)
         return response.text
     
     def _generate_ollama(self, prompt, system_prompt, json_mode, temperature) -> str:
@@ -125,12 +469,15 @@ class LLMClient:
             "model": self.model,
             "prompt": full_prompt,
             "stream": False,
-            "temperature": temperature
+            "temperature": temperature,
+            "keep_alive": self.keep_alive
         }
         
-        response = requests.post(url, json=payload, timeout=60)
+        response = self.http.session.post(url, json=payload, timeout=60)
         response.raise_for_status()
-        return response.json()["response"]
+        data = response.json()
+        self._record_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+        return data["response"]
     
     def _generate_openai(self, prompt, system_prompt, json_mode, temperature) -> str:
         """Generate using OpenAI (paid)"""
@@ -148,34 +495,276 @@ class LLMClient:
             kwargs["response_format"] = {"type": "json_object"}
         
         response = self.client.chat.completions.create(**kwargs)
+        self._record_chat_usage(response)
         return response.choices[0].message.content
     
-    def generate_json(
+    async def _agenerate_chat(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Generate using the async Groq/OpenAI clients (same chat completions API)"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        response = await self.async_client.chat.completions.create(**kwargs)
+        self._record_chat_usage(response)
+        return response.choices[0].message.content
+    
+    async def _agenerate_gemini(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Generate using Google Gemini's async API"""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
+        
+        response = await self.client.generate_content_async(
+            full_prompt,
+            generation_config={"temperature": temperature}
+        )
+        self._record_gemini_usage(response)
+        return response.text
+    
+    async def _agenerate_ollama(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Generate using Ollama over an async HTTP client"""
+        url = f"{self.base_url}/api/generate"
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
+        
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": False,
+            "temperature": temperature,
+            "keep_alive": self.keep_alive
+        }
+        
+        response = await self.http.async_client.post(url, json=payload, timeout=60)
+        response.raise_for_status()
+        data = response.json()
+        self._record_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+        return data["response"]
+    
+    async def agenerate_stream(
         self, 
         prompt: str, 
-        system_prompt: Optional[str] = None
-    ) -> Dict[str, Any]:
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
         """
-        Generate and parse JSON response from LLM
+        Stream response text from the LLM as the provider produces it
         
         Args:
             prompt: User prompt
             system_prompt: System instructions
+            json_mode: Enable JSON response format
+            temperature: Sampling temperature
         
-        Returns:
-            Parsed JSON as dictionary
+        Yields:
+            Text chunks in generation order
         """
-        response = self.generate(
-            prompt=prompt,
-            system_prompt=system_prompt,
-            json_mode=True,
-            temperature=0.3  # Lower temperature for structured output
+        # Streams can't be replayed once text has been yielded, so they
+        # aren't retried; they still count towards the circuit breaker
+        started = False
+        probe = False
+        try:
+            probe = self.breaker.before_call()
+            if self.provider in ("groq", "openai"):
+                stream = self._astream_chat(prompt, system_prompt, json_mode, temperature)
+            elif self.provider == "gemini":
+                stream = self._astream_gemini(prompt, system_prompt, json_mode, temperature)
+            else:
+                stream = self._astream_ollama(prompt, system_prompt, json_mode, temperature)
+            
+            async for chunk in stream:
+                if chunk:
+                    if not started:
+                        started = True
+                        self.breaker.record_success()
+                    yield chunk
+            if not started:
+                # An empty stream still means the provider answered
+                self.breaker.record_success()
+        except Exception as e:
+            self._record_stream_error(e, started)
+            raise Exception(f"LLM API Error ({self.provider}): {str(e)}") from e
+        finally:
+            # Cancelled or abandoned before the first chunk: no verdict, but free the probe slot
+            if probe and not started:
+                self.breaker.release()
+    
+    async def _astream_chat(self, prompt, system_prompt, json_mode, temperature) -> AsyncIterator[str]:
+        """Stream from the async Groq/OpenAI chat completions API"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        stream = await self.async_client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+    
+    async def _astream_gemini(self, prompt, system_prompt, json_mode, temperature) -> AsyncIterator[str]:
+        """Stream from Google Gemini's async API"""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
+        
+        response = await self.client.generate_content_async(
+            full_prompt,
+            generation_config={"temperature": temperature},
+            stream=True
         )
+        async for chunk in response:
+            yield chunk.text
+    
+    async def _astream_ollama(self, prompt, system_prompt, json_mode, temperature) -> AsyncIterator[str]:
+        """Stream newline-delimited JSON chunks from Ollama"""
+        url = f"{self.base_url}/api/generate"
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
         
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": True,
+            "temperature": temperature,
+            "keep_alive": self.keep_alive
+        }
+        
+        async with self.http.async_client.stream("POST", url, json=payload, timeout=60) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                yield chunk.get("response", "")
+                if chunk.get("done"):
+                    break
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """
+        Stream response text from the LLM as the provider produces it
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            json_mode: Enable JSON response format
+            temperature: Sampling temperature
+        
+        Yields:
+            Text chunks in generation order
+        """
+        started = False
+        probe = False
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            raise Exception(f"Failed to parse LLM response as JSON: {response}")
+            probe = self.breaker.before_call()
+            if self.provider in ("groq", "openai"):
+                stream = self._stream_chat(prompt, system_prompt, json_mode, temperature)
+            elif self.provider == "gemini":
+                stream = self._stream_gemini(prompt, system_prompt, json_mode, temperature)
+            else:
+                stream = self._stream_ollama(prompt, system_prompt, json_mode, temperature)
+            
+            for chunk in stream:
+                if chunk:
+                    if not started:
+                        started = True
+                        self.breaker.record_success()
+                    yield chunk
+            if not started:
+                # An empty stream still means the provider answered
+                self.breaker.record_success()
+        except Exception as e:
+            self._record_stream_error(e, started)
+            raise Exception(f"LLM API Error ({self.provider}): {str(e)}") from e
+        finally:
+            # Cancelled or abandoned before the first chunk: no verdict, but free the probe slot
+            if probe and not started:
+                self.breaker.release()
+    
+    def _stream_chat(self, prompt, system_prompt, json_mode, temperature) -> Iterator[str]:
+        """Stream from the Groq/OpenAI chat completions API"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        for chunk in self.client.chat.completions.create(**kwargs):
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+    
+    def _stream_gemini(self, prompt, system_prompt, json_mode, temperature) -> Iterator[str]:
+        """Stream from Google Gemini"""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
+        
+        response = self.client.generate_content(
+            full_prompt,
+            generation_config={"temperature": temperature},
+            stream=True
+        )
+        for chunk in response:
+            yield chunk.text
+    
+    def _stream_ollama(self, prompt, system_prompt, json_mode, temperature) -> Iterator[str]:
+        """Stream newline-delimited JSON chunks from Ollama"""
+        url = f"{self.base_url}/api/generate"
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        if json_mode:
+            full_prompt += "\n\nRespond ONLY with valid JSON."
+        
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": True,
+            "temperature": temperature,
+            "keep_alive": self.keep_alive
+        }
+        
+        with self.http.session.post(url, json=payload, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                yield chunk.get("response", "")
+                if chunk.get("done"):
+                    break
 
 
 # Singleton instance
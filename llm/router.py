@@ -0,0 +1,350 @@
+"""
+Multi-provider LLM router
+
+Holds one LLMClient per configured provider, tracks rolling latency and
+error rates for each, and sends every call to the fastest healthy
+provider. Failed calls (including 429s) fail over to the next provider,
+and an optional hedge fires a second provider when the first is slow.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator
+
+from llm.llm_client import BaseLLMClient, LLMClient, llm_client
+from utils.resilience import RetryPolicy, is_rate_limited
+
+
+class ProviderStats:
+    """Rolling window of call outcomes for one provider"""
+    
+    def __init__(self, window: int = 100):
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # (latency seconds or None, ok)
+        self.cooldown_until = 0.0
+    
+    def record(self, ok: bool, latency: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append((latency, ok))
+    
+    def latencies(self) -> List[float]:
+        with self._lock:
+            return sorted(latency for latency, ok in self._outcomes if ok and latency is not None)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile over successful calls in the window"""
+        values = self.latencies()
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+    
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+    
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+
+class LLMRouter(BaseLLMClient):
+    def __init__(
+        self,
+        clients: List[LLMClient],
+        hedge_after: Optional[float] = None,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        error_cooldown: float = 10.0,
+        rate_limit_cooldown: float = 60.0
+    ):
+        """
+        Args:
+            clients: One client per provider, in preference order
+            hedge_after: Seconds before a second provider is also tried (None disables hedging)
+            min_samples: Calls needed before a provider is ranked by latency
+            max_error_rate: Rolling error rate above which a provider is skipped
+            error_cooldown: Seconds a provider is skipped after an error
+            rate_limit_cooldown: Seconds a provider is skipped after a 429
+        """
+        if not clients:
+            raise ValueError("LLMRouter needs at least one provider")
+        
+        super().__init__()
+        self.clients = clients
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.error_cooldown = error_cooldown
+        self.rate_limit_cooldown = rate_limit_cooldown
+        
+        self.provider = "+".join(client.provider for client in clients)
+        self.model = "+".join(client.model for client in clients)
+        self.stats_by_provider = {client.provider: ProviderStats() for client in clients}
+        self._hedges = {"fired": 0, "won": 0}
+        self._lock = threading.Lock()
+        
+        if len(clients) > 1:
+            # With a fallback, a 429 fails over at once instead of backing off on the same provider
+            for client in clients:
+                policy = getattr(client, "retry_policy", None)
+                if policy is not None and 429 in policy.retry_on_status:
+                    client.retry_policy = RetryPolicy(
+                        policy.max_attempts, policy.base_delay, policy.max_delay, policy.retry_on_status - {429}
+                    )
+    
+    @classmethod
+    def from_env(cls) -> "LLMRouter":
+        """
+        Build a router from LLM_PROVIDERS (comma-separated, in preference
+        order); defaults to the single auto-detected provider
+        """
+        names = [name.strip() for name in os.getenv("LLM_PROVIDERS", "").split(",") if name.strip()]
+        if not names:
+            names = [llm_client.provider]
+        
+        clients = [llm_client if name == llm_client.provider else LLMClient(name) for name in names]
+        hedge_after = os.getenv("LLM_HEDGE_AFTER")
+        return cls(clients, hedge_after=float(hedge_after) if hedge_after else None)
+    
+    def ranked_clients(self) -> List[LLMClient]:
+        """
+        Providers in the order they should be tried: healthy before
+        unhealthy (cooling down, error-prone or with an open circuit),
+        measured providers by p50 latency, then unmeasured ones in
+        configured order
+        """
+        now = time.monotonic()
+        
+        def rank(indexed):
+            index, client = indexed
+            stats = self.stats_by_provider[client.provider]
+            unhealthy = client.breaker.is_open or stats.cooldown_until > now or (
+                stats.samples >= self.min_samples and stats.error_rate > self.max_error_rate
+            )
+            p50 = stats.percentile(0.5)
+            measured = p50 is not None and stats.samples >= self.min_samples
+            return (unhealthy, not measured, p50 if measured else 0.0, index)
+        
+        return [client for _, client in sorted(enumerate(self.clients), key=rank)]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Rolling latency, error rate and health per provider"""
+        now = time.monotonic()
+        providers = {}
+        for provider, stats in self.stats_by_provider.items():
+            p50, p95 = stats.percentile(0.5), stats.percentile(0.95)
+            providers[provider] = {
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "error_rate": round(stats.error_rate, 4),
+                "samples": stats.samples,
+                "cooldown_seconds": round(max(0.0, stats.cooldown_until - now), 1)
+            }
+        with self._lock:
+            hedges = dict(self._hedges)
+        return {
+            "order": [client.provider for client in self.ranked_clients()],
+            "providers": providers,
+            "hedges": hedges
+        }
+    
+    async def aclose(self):
+        """Close every provider's async client for the running event loop"""
+        for client in self.clients:
+            await client.aclose()
+    
+    def _record(self, client: LLMClient, started: float, error: Optional[Exception] = None):
+        """Record a call outcome and put failing providers into cooldown"""
+        stats = self.stats_by_provider[client.provider]
+        if error is None:
+            stats.record(True, time.monotonic() - started)
+            return
+        
+        stats.record(False)
+        cooldown = self.rate_limit_cooldown if is_rate_limited(error) else self.error_cooldown
+        stats.cooldown_until = time.monotonic() + cooldown
+    
+    def _count_win(self, client: LLMClient, hedges: set):
+        """Count a hedge as won only when the hedged call, not a failover, answered first"""
+        if client in hedges:
+            with self._lock:
+                self._hedges["won"] += 1
+    
+    def _call(self, client: LLMClient, prompt, system_prompt, json_mode, temperature) -> str:
+        """One provider call with outcome tracking"""
+        started = time.monotonic()
+        try:
+            result = client.generate(prompt, system_prompt, json_mode, temperature)
+        except Exception as e:
+            self._record(client, started, e)
+            raise
+        self._record(client, started)
+        return result
+    
+    async def _acall(self, client: LLMClient, prompt, system_prompt, json_mode, temperature) -> str:
+        """One async provider call with outcome tracking"""
+        started = time.monotonic()
+        try:
+            result = await client.agenerate(prompt, system_prompt, json_mode, temperature)
+        except Exception as e:
+            self._record(client, started, e)
+            raise
+        self._record(client, started)
+        return result
+    
+    def _generate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Route a blocking call, failing over and hedging as configured"""
+        clients = self.ranked_clients()
+        if self.hedge_after is None or len(clients) == 1:
+            errors = []
+            for client in clients:
+                try:
+                    return self._call(client, prompt, system_prompt, json_mode, temperature)
+                except Exception as e:
+                    errors.append(str(e))
+            raise Exception("All LLM providers failed: " + "; ".join(errors))
+        
+        pool = ThreadPoolExecutor(max_workers=len(clients), thread_name_prefix="llm-hedge")
+        try:
+            remaining = list(clients)
+            running = {}
+            hedges = set()
+            errors = []
+            
+            def launch(hedge: bool = False):
+                client = remaining.pop(0)
+                if hedge:
+                    hedges.add(client)
+                running[pool.submit(
+                    contextvars.copy_context().run, self._call, client, prompt, system_prompt, json_mode, temperature
+                )] = client
+            
+            launch()
+            while running:
+                timeout = self.hedge_after if remaining else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Primary is slow: hedge with the next provider
+                    with self._lock:
+                        self._hedges["fired"] += 1
+                    launch(hedge=True)
+                    continue
+                for future in done:
+                    client = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Fail over at once, even while a hedge is still in flight
+                        errors.append(str(e))
+                        if remaining:
+                            launch()
+                        continue
+                    self._count_win(client, hedges)
+                    return result
+            raise Exception("All LLM providers failed: " + "; ".join(errors))
+        finally:
+            # The losing call can't be interrupted; let it finish in the background
+            pool.shutdown(wait=False)
+    
+    async def _agenerate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        """Route an async call, failing over and hedging as configured"""
+        clients = self.ranked_clients()
+        remaining = list(clients)
+        running = {}
+        hedges = set()
+        errors = []
+        
+        def launch(hedge: bool = False):
+            client = remaining.pop(0)
+            if hedge:
+                hedges.add(client)
+            task = asyncio.ensure_future(self._acall(client, prompt, system_prompt, json_mode, temperature))
+            running[task] = client
+        
+        launch()
+        try:
+            while running:
+                timeout = self.hedge_after if remaining and self.hedge_after is not None else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    with self._lock:
+                        self._hedges["fired"] += 1
+                    launch(hedge=True)
+                    continue
+                for task in done:
+                    client = running.pop(task)
+                    if task.exception() is not None:
+                        # Fail over at once, even while a hedge is still in flight
+                        errors.append(str(task.exception()))
+                        if remaining:
+                            launch()
+                        continue
+                    self._count_win(client, hedges)
+                    return task.result()
+            raise Exception("All LLM providers failed: " + "; ".join(errors))
+        finally:
+            for task in running:
+                task.cancel()
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> Iterator[str]:
+        """Stream from the best provider, failing over until the first chunk arrives"""
+        errors = []
+        for client in self.ranked_clients():
+            started = time.monotonic()
+            streamed = False
+            try:
+                for chunk in client.generate_stream(prompt, system_prompt, json_mode, temperature):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                self._record(client, started, e)
+                if streamed:
+                    raise
+                errors.append(str(e))
+                continue
+            self.stats_by_provider[client.provider].record(True)
+            return
+        raise Exception("All LLM providers failed: " + "; ".join(errors))
+    
+    async def agenerate_stream(
+        self, 
+        prompt: str, 
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """Async variant of generate_stream"""
+        errors = []
+        for client in self.ranked_clients():
+            started = time.monotonic()
+            streamed = False
+            try:
+                async for chunk in client.agenerate_stream(prompt, system_prompt, json_mode, temperature):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                self._record(client, started, e)
+                if streamed:
+                    raise
+                errors.append(str(e))
+                continue
+            self.stats_by_provider[client.provider].record(True)
+            return
+        raise Exception("All LLM providers failed: " + "; ".join(errors))
+
+
+# Singleton instance
+llm_router = LLMRouter.from_env()
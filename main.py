@@ -2,11 +2,22 @@
 AI Operations Assistant - Main Orchestrator
 Coordinates Planner, Executor, and Verifier agents
 """
-import json
-from typing import Dict, Any
+import asyncio
+import os
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional
 from agents.planner import planner_agent
 from agents.executor import executor_agent
 from agents.verifier import verifier_agent
+from utils.http_pool import http_pool
+from utils.rate_limiter import request_priority, BATCH
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.serialization import dumps
+
+PIPELINE_STAGE_SECONDS = metrics.histogram(
+    "pipeline_stage_seconds", "Time spent in each stage of a single-task pipeline", ["stage", "status"]
+)
 
 
 class AIOperationsAssistant:
@@ -26,6 +37,15 @@ class AIOperationsAssistant:
         Returns:
             Final structured result
         """
+        started = time.perf_counter()
+        with tracer.span("process_task", task_chars=len(user_task)) as span:
+            result = self._process_task(user_task, verbose)
+            span.set_attributes(status=result.get("status"))
+        self._observe_total(started, result)
+        return {**result, "trace_id": span.trace_id}
+    
+    def _process_task(self, user_task: str, verbose: bool) -> Dict[str, Any]:
+        """Pipeline body of process_task"""
         if verbose:
             print(f"\n{'='*60}")
             print(f"TASK: {user_task}")
@@ -36,11 +56,11 @@ class AIOperationsAssistant:
             print("📋 PLANNER: Creating execution plan...")
         
         try:
-            plan = self.planner.create_plan(user_task)
+            with tracer.span("planning"), PIPELINE_STAGE_SECONDS.time(stage="planning"):
+                plan = self.planner.create_plan(user_task)
             if verbose:
                 print(f"✓ Plan created with {len(plan.get('steps', []))} steps\n")
-                print(json.dumps(plan, indent=2))
-                print()
+                self._print_plan(plan)
         except Exception as e:
             return {
                 "status": "error",
@@ -53,7 +73,8 @@ class AIOperationsAssistant:
             print("⚙️  EXECUTOR: Running plan steps...")
         
         try:
-            execution_results = self.executor.execute_plan(plan)
+            with tracer.span("execution"), PIPELINE_STAGE_SECONDS.time(stage="execution"):
+                execution_results = self.executor.execute_plan(plan)
             if verbose:
                 print(f"✓ Executed {len(execution_results['steps_executed'])} steps\n")
         except Exception as e:
@@ -69,13 +90,14 @@ class AIOperationsAssistant:
             print("✅ VERIFIER: Validating results...")
         
         try:
-            final_result = self.verifier.verify_and_format(user_task, execution_results)
+            with tracer.span("verification"), PIPELINE_STAGE_SECONDS.time(stage="verification"):
+                final_result = self.verifier.verify_and_format(user_task, execution_results)
             if verbose:
-                print(f"✓ Verification complete\n")
+                print("✓ Verification complete\n")
                 print(f"{'='*60}")
                 print("FINAL RESULT:")
                 print(f"{'='*60}\n")
-                print(json.dumps(final_result, indent=2))
+                self._print_result(final_result)
         except Exception as e:
             return {
                 "status": "error",
@@ -85,7 +107,323 @@ class AIOperationsAssistant:
             }
         
         return final_result
-
+    
+    async def aprocess_task(self, user_task: str, verbose: bool = False) -> Dict[str, Any]:
+        """
+        Async variant of process_task for use inside an event loop
+        
+        Args:
+            user_task: Natural language task description
+            verbose: Print intermediate steps
+        
+        Returns:
+            Final structured result
+        """
+        started = time.perf_counter()
+        with tracer.span("process_task", task_chars=len(user_task)) as span:
+            result = await self._aprocess_task(user_task, verbose)
+            span.set_attributes(status=result.get("status"))
+        self._observe_total(started, result)
+        return {**result, "trace_id": span.trace_id}
+    
+    async def _aprocess_task(self, user_task: str, verbose: bool) -> Dict[str, Any]:
+        """Pipeline body of aprocess_task"""
+        if verbose:
+            print(f"\n{'='*60}")
+            print(f"TASK: {user_task}")
+            print(f"{'='*60}\n")
+            print("📋 PLANNER: Creating execution plan...")
+        
+        try:
+            with tracer.span("planning"), PIPELINE_STAGE_SECONDS.time(stage="planning"):
+                plan = await self.planner.acreate_plan(user_task)
+            if verbose:
+                print(f"✓ Plan created with {len(plan.get('steps', []))} steps\n")
+                self._print_plan(plan)
+        except Exception as e:
+            return {
+                "status": "error",
+                "stage": "planning",
+                "error": str(e)
+            }
+        
+        if verbose:
+            print("⚙️  EXECUTOR: Running plan steps...")
+        
+        try:
+            with tracer.span("execution"), PIPELINE_STAGE_SECONDS.time(stage="execution"):
+                execution_results = await self.executor.aexecute_plan(plan)
+            if verbose:
+                print(f"✓ Executed {len(execution_results['steps_executed'])} steps\n")
+        except Exception as e:
+            return {
+                "status": "error",
+                "stage": "execution",
+                "error": str(e),
+                "plan": plan
+            }
+        
+        if verbose:
+            print("✅ VERIFIER: Validating results...")
+        
+        try:
+            with tracer.span("verification"), PIPELINE_STAGE_SECONDS.time(stage="verification"):
+                final_result = await self.verifier.averify_and_format(user_task, execution_results)
+            if verbose:
+                print("✓ Verification complete\n")
+                self._print_result(final_result)
+        except Exception as e:
+            return {
+                "status": "error",
+                "stage": "verification",
+                "error": str(e),
+                "execution_results": execution_results
+            }
+        
+        return final_result
+    
+    def _print_plan(self, plan: Dict[str, Any]):
+        """One line per planned step"""
+        for step in plan.get("steps", []):
+            params = dumps(step.get("parameters", {})).decode("utf-8")
+            print(f"  {step.get('step_number')}. {step.get('action')} {params}")
+        print()
+    
+    def _print_result(self, result: Dict[str, Any]):
+        """Verification summary and one compact line of data per step"""
+        verification = result.get("verification") or {}
+        print(f"Status: {result.get('status')}")
+        print(f"Summary: {verification.get('summary')}")
+        if verification.get("missing_items"):
+            print(f"Missing: {', '.join(map(str, verification['missing_items']))}")
+        for item in result.get("data") or []:
+            print(f"  [{item.get('step')}] {item.get('action')}: {dumps(item.get('data')).decode('utf-8')}")
+        for error in result.get("errors") or []:
+            print(f"  [{error.get('step')}] {error.get('action')} failed: {error.get('error')}")
+    
+    def _observe_total(self, started: float, result: Dict[str, Any]):
+        """Record end-to-end latency of a single-task pipeline"""
+        status = "error" if result.get("status") == "error" else "ok"
+        PIPELINE_STAGE_SECONDS.observe(time.perf_counter() - started, stage="total", status=status)
+    
+    def process_batch(self, tasks: List[str], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process many tasks in one call (blocking wrapper around aprocess_batch)
+        
+        Args:
+            tasks: Natural language task descriptions
+            max_concurrency: Global limit on concurrent LLM and tool calls
+        
+        Returns:
+            Per-task results plus aggregate timing
+        """
+        return asyncio.run(self._run_batch(tasks, max_concurrency))
+    
+    async def _run_batch(self, tasks: List[str], max_concurrency: Optional[int]) -> Dict[str, Any]:
+        """
+        aprocess_batch on the private loop started by process_batch; async
+        HTTP and SDK clients are bound to that loop, so close them with it
+        """
+        try:
+            return await self.aprocess_batch(tasks, max_concurrency)
+        finally:
+            await http_pool.aclose()
+            await self.planner.llm.aclose()
+            if self.verifier.llm is not self.planner.llm:
+                await self.verifier.llm.aclose()
+    
+    async def aprocess_batch(self, tasks: List[str], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Plan, execute and verify many tasks together
+        
+        Identical tool calls across all plans run once, and every stage
+        shares one global concurrency limit.
+        
+        Args:
+            tasks: Natural language task descriptions
+            max_concurrency: Global limit on concurrent LLM and tool calls
+                (defaults to, and is capped at, BATCH_MAX_CONCURRENCY)
+        
+        Returns:
+            {"results": [...], "timing": {...}, "tool_calls": {...}} with one
+            result per task, in input order
+        """
+        # Callers may lower the global limit but not raise it
+        limit = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+        max_concurrency = min(max_concurrency or limit, limit)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        started = time.perf_counter()
+        
+        async def plan(task: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    plan = await self.planner.acreate_plan(task)
+                except Exception as e:
+                    return {"status": "error", "stage": "planning", "error": str(e)}
+                if "steps" not in plan:
+                    return {
+                        "status": "error",
+                        "stage": "planning",
+                        "error": str(plan.get("error") or "Plan has no steps"),
+                        "plan": plan
+                    }
+                return plan
+        
+        async def verify(task: str, execution: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.verifier.averify_and_format(task, execution)
+                except Exception as e:
+                    return {
+                        "status": "error",
+                        "stage": "verification",
+                        "error": str(e),
+                        "execution_results": execution
+                    }
+        
+        with tracer.span("process_batch", tasks=len(tasks)):
+            # Upstream rate budgets favour interactive requests over batch work
+            priority_token = request_priority.set(BATCH)
+            try:
+                plans = await asyncio.gather(*(plan(task) for task in tasks))
+                planned_at = time.perf_counter()
+                
+                planned = [i for i, p in enumerate(plans) if "steps" in p]
+                execution_results, tool_calls = await self.executor.aexecute_plans(
+                    [plans[i] for i in planned], max_concurrency
+                )
+                executed_at = time.perf_counter()
+                
+                verified = await asyncio.gather(*(
+                    verify(tasks[i], execution) for i, execution in zip(planned, execution_results)
+                ))
+                finished = time.perf_counter()
+            finally:
+                request_priority.reset(priority_token)
+        
+        results = list(plans)
+        for i, result in zip(planned, verified):
+            results[i] = result
+        
+        return {
+            "results": results,
+            "timing": {
+                "planning_seconds": round(planned_at - started, 4),
+                "execution_seconds": round(executed_at - planned_at, 4),
+                "verification_seconds": round(finished - executed_at, 4),
+                "total_seconds": round(finished - started, 4),
+                "tasks_per_second": round(len(tasks) / (finished - started), 2) if finished > started else None
+            },
+            "tool_calls": tool_calls
+        }
+    
+    async def astream_task(self, user_task: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a task, yielding events as each stage produces output
+        
+        Steps start executing as soon as the planner has streamed them,
+        before the rest of the plan is generated.
+        
+        Args:
+            user_task: Natural language task description
+        
+        Yields:
+            Event dictionaries: "plan_step" for each planned step, "plan"
+            once planning is done, one "step" per completed step,
+            "summary_delta" chunks of the verifier summary, then "result"
+            (or "error" with the failing stage)
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.ensure_future(self._astream_task(user_task, events))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # Consumer went away (e.g. client disconnected): stop the pipeline
+            runner.cancel()
+    
+    async def _astream_task(self, user_task: str, events: asyncio.Queue):
+        """
+        Pipeline of astream_task, run as one task so its spans never cross
+        a yield to the consumer. Puts events on the queue, then None.
+        """
+        started = time.perf_counter()
+        try:
+            with tracer.span("process_task", task_chars=len(user_task), streaming=True) as span:
+                result = await self._astream_stages(user_task, events)
+                span.set_attributes(status=result.get("status"))
+            self._observe_total(started, result)
+            if result.get("status") == "error":
+                await events.put({"event": "error", "stage": result["stage"], "error": result["error"]})
+            else:
+                await events.put({"event": "result", "data": {**result, "trace_id": span.trace_id}})
+        finally:
+            await events.put(None)
+    
+    async def _astream_stages(self, user_task: str, events: asyncio.Queue) -> Dict[str, Any]:
+        """Stages of astream_task; intermediate events go on the queue, the final result is returned"""
+        planned: asyncio.Queue = asyncio.Queue()
+        planning = {}
+        
+        async def plan():
+            try:
+                with tracer.span("planning"), PIPELINE_STAGE_SECONDS.time(stage="planning"):
+                    async for kind, payload in self.planner.astream_plan(user_task):
+                        if kind == "step":
+                            await events.put({"event": "plan_step", "data": payload})
+                            await planned.put(payload)
+                        else:
+                            planning["plan"] = payload
+                            await events.put({"event": "plan", "data": payload})
+            except Exception as e:
+                planning["error"] = str(e)
+            finally:
+                await planned.put(None)
+        
+        async def planned_steps() -> AsyncIterator[Dict[str, Any]]:
+            while True:
+                step = await planned.get()
+                if step is None:
+                    return
+                yield step
+        
+        # Steps start executing while the planner is still streaming
+        planner = asyncio.ensure_future(plan())
+        step_results = []
+        try:
+            with tracer.span("execution"), PIPELINE_STAGE_SECONDS.time(stage="execution"):
+                async for step_result in self.executor.astream_steps(planned_steps()):
+                    step_results.append(step_result)
+                    await events.put({"event": "step", "data": step_result})
+        except Exception as e:
+            return {"status": "error", "stage": "execution", "error": str(e)}
+        finally:
+            planner.cancel()
+        
+        if "error" in planning:
+            return {"status": "error", "stage": "planning", "error": planning["error"]}
+        
+        plan = planning["plan"]
+        execution_results = {
+            "task_summary": plan.get("task_summary", ""),
+            "steps_executed": sorted(step_results, key=lambda r: r["step_number"]),
+            "errors": []
+        }
+        
+        try:
+            with tracer.span("verification"), PIPELINE_STAGE_SECONDS.time(stage="verification"):
+                async for kind, payload in self.verifier.astream_verify_and_format(user_task, execution_results):
+                    if kind == "summary_delta":
+                        await events.put({"event": "summary_delta", "data": payload})
+                    else:
+                        final_result = payload
+        except Exception as e:
+            return {"status": "error", "stage": "verification", "error": str(e)}
+        
+        return final_result
 
 def main():
     """CLI Interface"""
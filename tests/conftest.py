@@ -0,0 +1,32 @@
+"""
+Shared test setup
+
+Application modules read their settings at import time, so every upstream
+is pointed at the local stand-ins from benchmarks/stub_upstreams.py before
+any test imports them. No network access or API keys are needed.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_upstreams import StubUpstreams
+from benchmarks.pipeline_benchmark import point_at_stubs
+
+for name in ("TOOL_CACHE_BACKEND", "PLAN_CACHE_BACKEND", "GEOCODE_CACHE_BACKEND", "GITHUB_ETAG_CACHE_BACKEND"):
+    os.environ[name] = "memory"
+
+_stub = StubUpstreams(github_latency=0, weather_latency=0, llm_latency=0, jitter=0).start()
+point_at_stubs(_stub)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _stub.stop()
+
+
+@pytest.fixture
+def upstreams() -> StubUpstreams:
+    """The running upstream stand-ins"""
+    return _stub
@@ -0,0 +1,74 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import api_server
+import main
+from agents.executor import ExecutorAgent
+from agents.fast_planner import FastPathPlanner
+from agents.plan_cache import PlanCache
+from agents.planner import PlannerAgent
+from agents.verifier import VerifierAgent
+from main import AIOperationsAssistant
+from tools.tool_cache import ToolResultCache
+from utils.tracing import tracer
+
+
+def test_batch_task_count_is_capped(monkeypatch):
+    monkeypatch.setattr(api_server, "BATCH_MAX_TASKS", 2)
+    response = TestClient(api_server.app).post("/process/batch", json={"tasks": ["a", "b", "c"]})
+    assert response.status_code == 413
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.traces = []
+    
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+def test_stream_events_arrive_in_pipeline_order(upstreams, monkeypatch):
+    assistant = AIOperationsAssistant()
+    assistant.planner = PlannerAgent(plan_cache=PlanCache(backend=None), fast_path=FastPathPlanner(enabled=False))
+    assistant.executor = ExecutorAgent(cache=ToolResultCache(backend=None))
+    assistant.verifier = VerifierAgent(mode="llm")
+    monkeypatch.setattr(api_server, "assistant", assistant)
+    exporter = CollectingExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    stages = []
+    monkeypatch.setattr(main.PIPELINE_STAGE_SECONDS, "observe", lambda value, **labels: stages.append(labels["stage"]))
+    
+    task = upstreams.fixtures["tasks"][0]["task"]
+    response = TestClient(api_server.app).post("/process/stream", json={"task": task})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    kinds = [event["event"] for event in events]
+    
+    assert kinds[0] == "plan_step"
+    assert kinds[-1] == "result"
+    assert "error" not in kinds
+    planned = [event["data"]["step_number"] for event in events if event["event"] == "plan_step"]
+    for position, event in enumerate(events):
+        if event["event"] == "step":
+            # A step only runs after the planner has streamed it
+            assert event["data"]["step_number"] in planned[:kinds[:position].count("plan_step")]
+    assert sorted(event["data"]["step_number"] for event in events if event["event"] == "step") == sorted(planned)
+    first_delta = kinds.index("summary_delta")
+    assert kinds.index("plan") < first_delta
+    assert max(i for i, kind in enumerate(kinds) if kind == "step") < first_delta
+    assert set(kinds[first_delta:-1]) == {"summary_delta"}
+    
+    result = events[-1]["data"]
+    assert result["status"] == "success"
+    assert "".join(event["data"] for event in events if event["event"] == "summary_delta") == result["verification"]["summary"]
+    
+    # Same trace and stage metrics as process_task
+    assert len(exporter.traces) == 1
+    spans = {span.name: span for span in exporter.traces[0]}
+    assert spans["process_task"].trace_id == result["trace_id"]
+    assert spans["process_task"].attributes["status"] == "success"
+    for stage in ("planning", "execution", "verification"):
+        assert spans[stage].parent_id == spans["process_task"].span_id
+    assert sorted(stages) == ["execution", "planning", "total", "verification"]
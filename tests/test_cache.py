@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from utils.cache import MISSING, MemoryCache, SQLiteCache
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+
+
+def test_sqlite_hits_are_not_written_one_by_one(sqlite_cache):
+    sqlite_cache.set("a", {"n": 1}, 60)
+    writes = sqlite_cache._conn.total_changes
+    for _ in range(10):
+        assert sqlite_cache.get("a") == {"n": 1}
+    assert sqlite_cache._conn.total_changes == writes
+
+
+def test_sqlite_eviction_honours_hits_recorded_in_memory(sqlite_cache):
+    sqlite_cache.set("a", 1, 60)
+    time.sleep(0.01)
+    sqlite_cache.set("b", 2, 60)
+    time.sleep(0.01)
+    assert sqlite_cache.get("a") == 1
+    sqlite_cache.set("c", 3, 60)
+    assert sqlite_cache.get("a") == 1
+    assert sqlite_cache.get("b") is MISSING
+
+
+def test_sqlite_touches_are_flushed_in_batches(sqlite_cache, monkeypatch):
+    monkeypatch.setattr(SQLiteCache, "TOUCH_BATCH", 2)
+    sqlite_cache.set("a", 1, 60)
+    sqlite_cache.set("b", 2, 60)
+    sqlite_cache.get("a")
+    sqlite_cache.get("a")
+    assert list(sqlite_cache._touched) == ["a"]
+    sqlite_cache.get("b")
+    assert not sqlite_cache._touched
+
+
+def test_sqlite_rewrite_is_not_overwritten_by_an_older_touch(sqlite_cache):
+    sqlite_cache.set("a", 1, 60)
+    sqlite_cache.get("a")
+    sqlite_cache.set("a", 2, 60)
+    assert "a" not in sqlite_cache._touched
+    assert sqlite_cache.get("a") == 2
+
+
+@pytest.mark.parametrize("make_cache", [MemoryCache, lambda: SQLiteCache(":memory:")])
+def test_len_skips_expired_entries(make_cache):
+    cache = make_cache()
+    cache.set("fresh", 1, 60)
+    cache.set("stale", 2, -1)
+    assert len(cache) == 1
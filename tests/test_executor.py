@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+from agents.executor import ExecutorAgent
+from tools.github_tool import github_tool
+from tools.tool_cache import ToolResultCache
+
+PLAN = {
+    "task_summary": "Two repositories and the weather",
+    "steps": [
+        {"step_number": 1, "action": "github_info", "parameters": {"owner": "facebook", "repo": "react"}},
+        {"step_number": 2, "action": "github_info", "parameters": {"owner": "vuejs", "repo": "vue"}},
+        {"step_number": 3, "action": "weather_current", "parameters": {"city": "London"}}
+    ]
+}
+
+
+def executor() -> ExecutorAgent:
+    return ExecutorAgent(parallel=True, max_concurrency=2, step_timeout=5, cache=ToolResultCache(backend=None))
+
+
+def repository(owner: str, repo: str) -> dict:
+    return {"full_name": f"{owner}/{repo}"}
+
+
+def test_bulk_lookup_runs_alongside_other_steps(monkeypatch):
+    bulk_started, weather_started = threading.Event(), threading.Event()
+    
+    def get_repositories_info(repositories):
+        bulk_started.set()
+        assert weather_started.wait(2), "bulk lookup ran before the other steps"
+        return [repository(owner, repo) for owner, repo in repositories]
+    
+    def weather(params):
+        weather_started.set()
+        assert bulk_started.wait(2), "weather step ran before the bulk lookup"
+        return {"city": params["city"]}
+    
+    monkeypatch.setattr(github_tool, "get_repositories_info", get_repositories_info)
+    agent = executor()
+    agent.tool_map["weather_current"] = weather
+    
+    steps = agent.execute_plan(PLAN)["steps_executed"]
+    assert [step["status"] for step in steps] == ["success"] * 3
+    assert [step["data"] for step in steps] == [
+        repository("facebook", "react"), repository("vuejs", "vue"), {"city": "London"}
+    ]
+
+
+def test_async_bulk_lookup_runs_alongside_other_steps(monkeypatch):
+    async def main():
+        bulk_started, weather_started = asyncio.Event(), asyncio.Event()
+        
+        async def aget_repositories_info(repositories):
+            bulk_started.set()
+            await asyncio.wait_for(weather_started.wait(), 2)
+            return [repository(owner, repo) for owner, repo in repositories]
+        
+        async def weather(params):
+            weather_started.set()
+            await asyncio.wait_for(bulk_started.wait(), 2)
+            return {"city": params["city"]}
+        
+        monkeypatch.setattr(github_tool, "aget_repositories_info", aget_repositories_info)
+        agent = executor()
+        agent.async_tool_map["weather_current"] = weather
+        
+        single = (await agent.aexecute_plan(PLAN))["steps_executed"]
+        batched, counts = await agent.aexecute_plans([PLAN, PLAN])
+        return single, batched, counts
+    
+    single, batched, counts = asyncio.run(main())
+    for steps in (single, batched[0]["steps_executed"], batched[1]["steps_executed"]):
+        assert [step["status"] for step in steps] == ["success"] * 3
+        assert steps[1]["data"] == repository("vuejs", "vue")
+    assert counts == {"planned": 6, "executed": 3}
+
+
+def test_coalesced_callers_get_their_own_copy():
+    agent = executor()
+    release = threading.Event()
+    
+    def fetch(params):
+        release.wait(5)
+        return {"city": params["city"], "alerts": []}
+    
+    wrapper = agent._coalesced("weather_current", fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(wrapper({"city": "London"}))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while agent.single_flight.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    results[0]["alerts"].append("mutated")
+    assert results[1] == results[2] == {"city": "London", "alerts": []}
+    assert agent.single_flight.stats()["executed"] == 1
+
+
+def test_async_coalesced_callers_get_their_own_copy():
+    agent = executor()
+    
+    async def fetch(params):
+        await asyncio.sleep(0.01)
+        return {"city": params["city"], "alerts": []}
+    
+    async def run():
+        wrapper = agent._acoalesced("weather_current", fetch)
+        return await asyncio.gather(*(wrapper({"city": "London"}) for _ in range(3)))
+    
+    results = asyncio.run(run())
+    results[0]["alerts"].append("mutated")
+    assert results[1] == results[2] == {"city": "London", "alerts": []}
+    assert agent.single_flight.stats() == {
+        "executed": 1, "coalesced": 2, "by_label": {"weather_current": {"executed": 1, "coalesced": 2}}
+    }
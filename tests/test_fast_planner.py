@@ -0,0 +1,70 @@
+import pytest
+
+from agents.fast_planner import FastPathPlanner
+
+TOOLS = {
+    "github_search": "", "github_info": "", "weather_current": "", "weather_forecast": "", "weather_batch": ""
+}
+
+
+def steps(task: str):
+    plan = FastPathPlanner(enabled=True, min_confidence=0.9).plan(task, TOOLS)
+    return None if plan is None else [(step["action"], step["parameters"]) for step in plan["steps"]]
+
+
+@pytest.mark.parametrize("task, expected", [
+    ("What's the weather in London?", [("weather_current", {"city": "London"})]),
+    ("Forecast for Berlin", [("weather_forecast", {"city": "Berlin"})]),
+    ("Weather for 3 days in Tokyo", [("weather_forecast", {"city": "Tokyo", "days": 3})]),
+    ("Forecast for Berlin for three days", [("weather_forecast", {"city": "Berlin", "days": 3})]),
+    ("5-day forecast for Oslo", [("weather_forecast", {"city": "Oslo", "days": 5})]),
+    ("Weather in London and Paris", [("weather_batch", {"cities": ["London", "Paris"], "forecast": False})]),
+    ("Weather in London, Paris and Tokyo",
+     [("weather_batch", {"cities": ["London", "Paris", "Tokyo"], "forecast": False})]),
+    ("Forecast for London, Paris, and Rome",
+     [("weather_batch", {"cities": ["London", "Paris", "Rome"], "forecast": True})]),
+    ("Weather in London, then the forecast for Paris",
+     [("weather_current", {"city": "London"}), ("weather_forecast", {"city": "Paris"})]),
+    ("Weather for 2 days in Tokyo and Paris",
+     [("weather_batch", {"cities": ["Tokyo", "Paris"], "forecast": True, "days": 2})]),
+    ("Tell me about facebook/react", [("github_info", {"owner": "facebook", "repo": "react"})]),
+    ("Find the top 3 rust repositories", [("github_search", {"query": "rust", "sort": "stars", "limit": 3})]),
+    ("Find the most forked python repositories",
+     [("github_search", {"query": "python", "sort": "forks", "limit": 5})]),
+    ("Show the top 3 most forked go repositories", [("github_search", {"query": "go", "sort": "forks", "limit": 3})]),
+    ("List recently updated rust repos", [("github_search", {"query": "rust", "sort": "updated", "limit": 5})]),
+])
+def test_recognized_tasks(task, expected):
+    assert steps(task) == expected
+
+
+@pytest.mark.parametrize("task", [
+    "Weather for 9 days in Tokyo",
+    "Weather in Tokyo tomorrow",
+    "Weather in London and Paris in Fahrenheit",
+    "Weather in Portland, Oregon",
+    "Weather in Washington, D.C.",
+    "Weather in Paris, TX and Rome",
+    "Weather in London, Paris",
+    "weather in London this weekend",
+    "temperature in London in Fahrenheit",
+    "temperature in Celsius for London",
+    "weather in London without rain",
+    "weather in London yesterday",
+    "weather in london",
+    "Find the least popular python repositories",
+    "Find the newest python repositories",
+    "Excluding archived ones find python repositories",
+    "Compare facebook/react and vuejs/vue",
+    "Write a poem about the sea",
+])
+def test_unsure_tasks_go_to_the_llm(task):
+    assert steps(task) is None
+
+
+def test_disabled_planner_never_matches():
+    assert FastPathPlanner(enabled=False).plan("Weather in London", TOOLS) is None
+
+
+def test_unavailable_tool_goes_to_the_llm():
+    assert FastPathPlanner(enabled=True).plan("Weather in London", {"github_search": ""}) is None
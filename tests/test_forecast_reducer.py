@@ -0,0 +1,73 @@
+import pytest
+
+from tools.forecast_reducer import ForecastReducer
+
+MIDNIGHT_UTC = 1704067200  # 2024-01-01T00:00:00Z
+HOUR = 60 * 60
+
+
+def readings(count: int, conditions=("Clouds",)):
+    """3-hourly readings from midnight UTC; reading i has temperature i"""
+    return [
+        {
+            "dt": MIDNIGHT_UTC + 3 * HOUR * i,
+            "main": {"temp": float(i), "humidity": 50},
+            "weather": [{"main": conditions[i % len(conditions)], "description": conditions[i % len(conditions)].lower()}]
+        }
+        for i in range(count)
+    ]
+
+
+def test_days_follow_utc_without_an_offset():
+    days = ForecastReducer(aggregation="mean", days=5).reduce(readings(16))
+    assert [day["date"] for day in days] == ["2024-01-01", "2024-01-02"]
+    assert (days[0]["temp_min"], days[0]["temp_max"], days[0]["temperature"]) == (0.0, 7.0, 3.5)
+    assert (days[1]["temp_min"], days[1]["temp_max"]) == (8.0, 15.0)
+
+
+def test_days_follow_local_time_east_of_utc():
+    # Tokyo (UTC+9): 00:00Z is 09:00 local, and 15:00Z already starts the next local day
+    days = ForecastReducer(aggregation="min", days=5).reduce(readings(16), utc_offset=9 * HOUR)
+    assert [day["date"] for day in days] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert (days[0]["temp_min"], days[0]["temp_max"]) == (0.0, 4.0)
+    assert (days[1]["temp_min"], days[1]["temp_max"]) == (5.0, 12.0)
+    assert days[1]["temperature"] == 5.0
+
+
+def test_days_follow_local_time_west_of_utc():
+    # New York (UTC-5): the first two readings are still the previous local day
+    days = ForecastReducer(aggregation="max", days=5).reduce(readings(16), utc_offset=-5 * HOUR)
+    assert [day["date"] for day in days][:2] == ["2023-12-31", "2024-01-01"]
+    assert (days[0]["temp_min"], days[0]["temp_max"], days[0]["temperature"]) == (0.0, 1.0, 1.0)
+
+
+def test_midday_uses_the_reading_closest_to_local_noon():
+    # UTC+2: local times are 02:00, 05:00, ..., 23:00, so 11:00 local (09:00Z, reading 3) is closest
+    days = ForecastReducer(aggregation="midday", days=1).reduce(readings(8), utc_offset=2 * HOUR)
+    assert days[0]["temperature"] == 3.0
+
+
+def test_horizon_limits_the_days_returned():
+    reducer = ForecastReducer(aggregation="mean", days=5)
+    assert len(reducer.reduce(readings(40), days=2)) == 2
+    assert len(reducer.reduce(readings(40), days=9)) == 5
+
+
+def test_dominant_condition_breaks_ties_by_first_seen():
+    days = ForecastReducer(aggregation="first", days=1).reduce(readings(8, conditions=("Rain", "Clear", "Clear", "Rain")))
+    assert (days[0]["weather"], days[0]["description"]) == ("Rain", "rain")
+    assert days[0]["temperature"] == 0.0
+
+
+def test_unknown_aggregation_is_rejected():
+    with pytest.raises(ValueError):
+        ForecastReducer(aggregation="median")
+
+
+@pytest.mark.parametrize("aggregation, days", [("", "5"), ("max", ""), ("max", "0"), ("", "")])
+def test_empty_or_zero_settings_fall_back_to_defaults(monkeypatch, aggregation, days):
+    monkeypatch.setenv("FORECAST_AGGREGATION", aggregation)
+    monkeypatch.setenv("FORECAST_DAYS", days)
+    reducer = ForecastReducer()
+    assert reducer.aggregation == (aggregation or "mean")
+    assert reducer.days == 5
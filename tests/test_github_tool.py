@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from tools.github_tool import GitHubTool
+from utils.cache import MemoryCache
+from utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def tool(upstreams):
+    """GitHub tool against the stand-ins, with its own ETag cache and a slow-refilling core budget"""
+    github = GitHubTool(etag_cache=MemoryCache())
+    github.base_url = f"{upstreams.url}/github"
+    github.core_limiter = RateLimiter("test_github_core", per_minute=0.06, burst=5)
+    return github
+
+
+def tokens(tool) -> float:
+    return tool.core_limiter.stats()["tokens"]
+
+
+def test_repeat_lookup_is_revalidated_and_refunded(tool):
+    first = tool.get_repository_info("facebook", "react")
+    assert tokens(tool) == 4
+    assert tool.etag_cache.get(f"{tool.base_url}/repos/facebook/react")["etag"] == '"facebook/react"'
+    
+    second = tool.get_repository_info("facebook", "react")
+    assert second == first
+    # The 304 took a token to send and got it back
+    assert tokens(tool) == 4
+    assert tool.etag_stats.snapshot()["by_label"] == {"repository": {"hits": 1, "misses": 0}}
+
+
+def test_async_repeat_lookup_is_revalidated_and_refunded(tool):
+    async def lookup():
+        first = await tool.aget_repository_info("vuejs", "vue")
+        second = await tool.aget_repository_info("vuejs", "vue")
+        return first, second
+    
+    first, second = asyncio.run(lookup())
+    assert second == first and first["full_name"] == "vuejs/vue"
+    assert tokens(tool) == 4
+    assert tool.etag_stats.snapshot()["hits"] == 1
+
+
+def test_changed_validator_refreshes_the_stored_body(tool):
+    url = f"{tool.base_url}/repos/facebook/react"
+    tool.get_repository_info("facebook", "react")
+    entry = tool.etag_cache.get(url)
+    tool.etag_cache.set(url, dict(entry, etag='"stale"', repository={"full_name": "stale"}), 60)
+    
+    assert tool.get_repository_info("facebook", "react")["full_name"] == "facebook/react"
+    assert tool.etag_cache.get(url)["etag"] == '"facebook/react"'
+    # A full 200 response is not refunded
+    assert tokens(tool) == 3
+    assert tool.etag_stats.snapshot()["by_label"] == {"repository": {"hits": 0, "misses": 1}}
+
+
+def test_without_a_cache_no_conditional_request_is_sent(upstreams):
+    github = GitHubTool(etag_cache=None)
+    github.base_url = f"{upstreams.url}/github"
+    github.core_limiter = RateLimiter("test_github_core", per_minute=0.06, burst=5)
+    assert github._conditional_headers(github._cached_repository(f"{github.base_url}/repos/a/b")) is None
+    github.get_repository_info("facebook", "react")
+    github.get_repository_info("facebook", "react")
+    assert github.core_limiter.stats()["tokens"] == 3
+    assert github.etag_stats.snapshot()["hits"] == 0
@@ -0,0 +1,44 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_pool import HTTPPool
+from utils.resilience import CircuitBreaker, RetryPolicy, call_with_retry
+
+
+@pytest.fixture
+def unavailable():
+    """Server answering every request with 503, counting hits"""
+    hits = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+
+
+def test_retry_policy_is_the_only_retry_layer(unavailable):
+    url, hits = unavailable
+    pool = HTTPPool()
+    breaker = CircuitBreaker("test", failure_threshold=10, recovery_timeout=30)
+    
+    def attempt():
+        response = pool.session.get(url, timeout=5)
+        response.raise_for_status()
+    
+    with pytest.raises(requests.exceptions.HTTPError):
+        call_with_retry(attempt, RetryPolicy(max_attempts=3, base_delay=0), breaker)
+    pool.close()
+    assert len(hits) == 3
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from llm.json_stream import JSONArrayStreamParser, partial_string_value
+
+PLAN = {
+    "reasoning": "Look up the weather, then the repos",
+    "steps": [
+        {"action": "weather", "parameters": {"city": "Paris"}},
+        {"action": "github_search", "parameters": {"query": "say \"hi\" [then] {leave}"}},
+        "done",
+        3
+    ]
+}
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_elements_survive_any_chunk_boundary(size):
+    text = json.dumps(PLAN)
+    assert feed_in_chunks(JSONArrayStreamParser("steps"), text, size) == PLAN["steps"]
+
+
+def test_each_element_is_emitted_once_it_completes():
+    parser = JSONArrayStreamParser("steps")
+    assert parser.feed('{"steps": [{"action": "a"}, {"act') == [{"action": "a"}]
+    assert parser.feed('ion": "b"}') == []
+    assert parser.feed("]}") == [{"action": "b"}]
+
+
+@pytest.mark.parametrize("decoy", [
+    '"reasoning": "\\"steps\\": [\\"not a step\\"]"',
+    '"context": {"steps": ["nested"]}',
+    '"history": [{"steps": ["nested"]}, "steps"]',
+    '"note": "steps"',
+])
+def test_only_the_top_level_key_is_parsed(decoy):
+    text = '{' + decoy + ', "steps": [{"action": "real"}]}'
+    json.loads(text)
+    assert feed_in_chunks(JSONArrayStreamParser("steps"), text, 3) == [{"action": "real"}]
+
+
+def test_a_key_that_is_not_an_array_emits_nothing():
+    parser = JSONArrayStreamParser("steps")
+    assert parser.feed('{"steps": null, "other": [1, 2]}') == []
+
+
+def test_a_malformed_element_raises_the_parse_error():
+    parser = JSONArrayStreamParser("steps")
+    with pytest.raises(Exception, match="Failed to parse LLM response as JSON") as caught:
+        parser.feed('{"steps": [{"action": nope}, ')
+    assert isinstance(caught.value.__cause__, json.JSONDecodeError)
+
+
+def test_partial_string_value_grows_with_the_buffer():
+    text = json.dumps({"is_complete": True, "summary": "It is 20°C in \"Paris\"\nToday"})
+    values = [partial_string_value(text[:end], "summary") for end in range(len(text) + 1)]
+    assert values[0] is None
+    seen = [value for value in values if value is not None]
+    assert seen[0] == ""
+    assert seen[-1] == "It is 20°C in \"Paris\"\nToday"
+    assert all(later.startswith(earlier) for earlier, later in zip(seen, seen[1:]))
+
+
+def test_partial_string_value_waits_for_complete_escapes():
+    assert partial_string_value('{"summary": "a\\', "summary") == "a"
+    assert partial_string_value('{"summary": "a\\u00', "summary") == "a"
+    assert partial_string_value('{"summary": "a\\u00e9', "summary") == "aé"
+
+
+def test_partial_string_value_ignores_decoy_keys():
+    text = '{"issues": [{"summary": "nested"}], "note": "\\"summary\\": \\"quoted\\"", "summary": "top'
+    assert partial_string_value(text, "summary") == "top"
+    assert partial_string_value('{"details": {"summary": "nested"}}', "summary") is None
@@ -0,0 +1,66 @@
+from agents.executor import ExecutorAgent
+from agents.fast_planner import FastPathPlanner
+from agents.plan_cache import PlanCache
+from agents.planner import PlannerAgent
+from agents.verifier import VerifierAgent
+from main import AIOperationsAssistant
+from tools.tool_cache import ToolResultCache
+
+
+def uncached_assistant() -> AIOperationsAssistant:
+    """Every task goes to the (stub) LLM and upstream APIs"""
+    assistant = AIOperationsAssistant()
+    assistant.planner = PlannerAgent(plan_cache=PlanCache(backend=None), fast_path=FastPathPlanner(enabled=False))
+    assistant.executor = ExecutorAgent(cache=ToolResultCache(backend=None))
+    assistant.verifier = VerifierAgent(mode="llm")
+    return assistant
+
+
+def test_process_batch_repeated_in_one_process(upstreams):
+    # Each call runs on a new event loop; async clients from earlier loops must not be reused
+    assistant = uncached_assistant()
+    tasks = [entry["task"] for entry in upstreams.fixtures["tasks"]][:2]
+    
+    for _ in range(3):
+        batch = assistant.process_batch(tasks)
+        assert len(batch["results"]) == len(tasks)
+        for result in batch["results"]:
+            assert result["status"] == "success", result.get("errors")
+
+
+def test_batch_concurrency_is_capped(upstreams, monkeypatch):
+    monkeypatch.setenv("BATCH_MAX_CONCURRENCY", "2")
+    assistant = uncached_assistant()
+    limits = []
+    execute_plans = assistant.executor.aexecute_plans
+    
+    async def aexecute_plans(plans, max_concurrency=None):
+        limits.append(max_concurrency)
+        return await execute_plans(plans, max_concurrency)
+    
+    monkeypatch.setattr(assistant.executor, "aexecute_plans", aexecute_plans)
+    task = upstreams.fixtures["tasks"][0]["task"]
+    assistant.process_batch([task], max_concurrency=1000)
+    assistant.process_batch([task], max_concurrency=1)
+    assert limits == [2, 1]
+
+
+def test_batch_reports_a_plan_without_steps_as_an_error(upstreams, monkeypatch):
+    assistant = uncached_assistant()
+    tasks = [entry["task"] for entry in upstreams.fixtures["tasks"]][:2]
+    create_plan = assistant.planner.acreate_plan
+    
+    async def acreate_plan(task):
+        if task == tasks[1]:
+            return {"task_summary": "nothing to do"}
+        return await create_plan(task)
+    
+    monkeypatch.setattr(assistant.planner, "acreate_plan", acreate_plan)
+    results = assistant.process_batch(tasks)["results"]
+    assert results[0]["status"] == "success"
+    assert results[1] == {
+        "status": "error",
+        "stage": "planning",
+        "error": "Plan has no steps",
+        "plan": {"task_summary": "nothing to do"}
+    }
@@ -0,0 +1,80 @@
+import pytest
+
+from utils.metrics import MetricsRegistry
+
+
+def test_counter_renders_help_type_and_sorted_series():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests by route", ["route", "status"])
+    requests.inc(route="/process", status="200")
+    requests.inc(2, route="/process", status="200")
+    requests.inc(route="/health", status="200")
+    assert registry.render() == (
+        "# HELP requests_total Requests by route\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/health",status="200"} 1\n'
+        'requests_total{route="/process",status="200"} 3\n'
+    )
+
+
+def test_unlabelled_gauge_keeps_the_last_value():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("queue_depth", "Tasks waiting")
+    gauge.set(4)
+    gauge.set(1.5)
+    assert registry.render().splitlines()[-1] == "queue_depth 1.5"
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ["message"]).inc(message='bad "quote"\\path\nnext')
+    assert registry.render().splitlines()[-1] == 'errors_total{message="bad \\"quote\\"\\\\path\\nnext"} 1'
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram("call_seconds", "Call latency", ["upstream"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, upstream="github")
+    assert registry.render().splitlines()[2:] == [
+        'call_seconds_bucket{upstream="github",le="0.1"} 1',
+        'call_seconds_bucket{upstream="github",le="1"} 3',
+        'call_seconds_bucket{upstream="github",le="+Inf"} 4',
+        'call_seconds_sum{upstream="github"} 4.05',
+        'call_seconds_count{upstream="github"} 4'
+    ]
+
+
+def test_histogram_timer_fills_the_status_label():
+    registry = MetricsRegistry()
+    stage = registry.histogram("stage_seconds", "Stage latency", ["stage", "status"], buckets=(60.0,))
+    with stage.time(stage="planning"):
+        pass
+    with pytest.raises(RuntimeError):
+        with stage.time(stage="planning"):
+            raise RuntimeError("boom")
+    text = registry.render()
+    assert 'stage_seconds_count{stage="planning",status="ok"} 1' in text
+    assert 'stage_seconds_count{stage="planning",status="error"} 1' in text
+
+
+def test_metrics_render_in_name_order():
+    registry = MetricsRegistry()
+    registry.counter("b_total", "B").inc()
+    registry.counter("a_total", "A").inc()
+    types = [line for line in registry.render().splitlines() if line.startswith("# TYPE")]
+    assert types == ["# TYPE a_total counter", "# TYPE b_total counter"]
+
+
+def test_registry_returns_the_existing_metric_and_rejects_type_clashes():
+    registry = MetricsRegistry()
+    assert registry.counter("hits_total", "Hits") is registry.counter("hits_total", "Hits")
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.gauge("hits_total", "Hits")
+
+
+def test_wrong_labels_are_rejected():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ["cache"])
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc(label="x")
@@ -0,0 +1,31 @@
+from agents.payload_compactor import PayloadCompactor
+
+DATA = [{
+    "step": 1,
+    "action": "github_search",
+    "data": [
+        {"full_name": f"owner/repo-{i}", "stars": 1000 - i, "language": "Python", "description": "x" * 500, "url": "u"}
+        for i in range(200)
+    ]
+}]
+ERRORS = [{"step": 2, "action": "weather_current", "error": "City not found"}]
+
+
+def test_payload_fits_the_budget():
+    compactor = PayloadCompactor(token_budget=500)
+    data_json, errors_json = compactor.compact(DATA, ERRORS)
+    assert compactor.count_tokens(data_json) + compactor.count_tokens(errors_json) <= 500
+    assert '"omitted"' in data_json
+    
+    stats = compactor.stats()
+    assert stats["payloads"] == 1
+    assert stats["raw_bytes"] > stats["compact_bytes"] > 0
+    assert stats["raw_tokens"] > stats["compact_tokens"] > 0
+
+
+def test_raw_measurement_can_be_turned_off():
+    compactor = PayloadCompactor(token_budget=500, measure_raw=False)
+    compactor.compact(DATA, ERRORS)
+    stats = compactor.stats()
+    assert stats["compact_tokens"] > 0
+    assert "raw_bytes" not in stats and "tokens_saved" not in stats
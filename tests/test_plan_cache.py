@@ -0,0 +1,101 @@
+from agents.plan_cache import PlanCache
+from utils.cache import MemoryCache
+
+TOOLS = {"weather_current": "Get current weather for a city", "github_info": "Get repository details"}
+MODEL = "test-model"
+
+
+def weather_plan(city: str) -> dict:
+    return {
+        "task_summary": f"Current weather in {city}",
+        "steps": [{
+            "step_number": 1,
+            "action": "weather_current",
+            "parameters": {"city": city},
+            "reasoning": f"Look up the weather in {city}"
+        }]
+    }
+
+
+def cache(template_mode: bool = True) -> PlanCache:
+    return PlanCache(backend=MemoryCache(), ttl=60, template_mode=template_mode)
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    plans = cache(template_mode=False)
+    plans.put("What's the weather in London?", TOOLS, MODEL, weather_plan("London"))
+    assert plans.get("  what's the WEATHER in london ", TOOLS, MODEL) == weather_plan("London")
+    assert plans.get("What's the weather in Paris?", TOOLS, MODEL) is None
+
+
+def test_template_substitutes_the_new_city():
+    plans = cache()
+    plans.put("What's the weather in London?", TOOLS, MODEL, weather_plan("London"))
+    assert plans.get("What's the weather in Paris?", TOOLS, MODEL) == weather_plan("Paris")
+    assert plans.stats()["by_label"]["template"]["hits"] == 1
+
+
+def test_template_substitutes_owner_and_repo():
+    plan = {
+        "task_summary": "Details for facebook/react",
+        "steps": [{
+            "step_number": 1,
+            "action": "github_info",
+            "parameters": {"owner": "facebook", "repo": "react"},
+            "reasoning": "Fetch facebook/react"
+        }]
+    }
+    plans = cache()
+    plans.put("Tell me about facebook/react", TOOLS, MODEL, plan)
+    filled = plans.get("Tell me about vuejs/vue", TOOLS, MODEL)
+    assert filled["steps"][0]["parameters"] == {"owner": "vuejs", "repo": "vue"}
+    assert filled["steps"][0]["reasoning"] == "Fetch vuejs/vue"
+    assert filled["task_summary"] == "Details for vuejs/vue"
+
+
+def test_plan_using_values_not_in_the_task_is_not_templated():
+    plans = cache()
+    # The plan also looks up a city the task never mentioned
+    plan = weather_plan("London")
+    plan["steps"].append(dict(plan["steps"][0], step_number=2, parameters={"city": "Paris"}))
+    plans.put("What's the weather in London?", TOOLS, MODEL, plan)
+    assert plans.get("What's the weather in Rome?", TOOLS, MODEL) is None
+
+
+def test_catalog_or_model_change_misses():
+    plans = cache()
+    plans.put("What's the weather in London?", TOOLS, MODEL, weather_plan("London"))
+    assert plans.get("What's the weather in London?", {"weather_current": "changed"}, MODEL) is None
+    assert plans.get("What's the weather in London?", TOOLS, "other-model") is None
+
+
+def test_disabled_cache_stores_nothing():
+    plans = PlanCache(backend=MemoryCache(), ttl=0, template_mode=True)
+    plans.put("What's the weather in London?", TOOLS, MODEL, weather_plan("London"))
+    assert plans.get("What's the weather in London?", TOOLS, MODEL) is None
+
+
+def test_template_substitutes_every_city_of_a_batch():
+    plan = {
+        "task_summary": "Weather in London and Paris",
+        "steps": [{
+            "step_number": 1,
+            "action": "weather_batch",
+            "parameters": {"cities": ["London", "Paris"], "forecast": False},
+            "reasoning": "Both cities in one call"
+        }]
+    }
+    plans = cache()
+    plans.put("Weather in London and Paris", TOOLS, MODEL, plan)
+    filled = plans.get("Weather in Tokyo and Oslo", TOOLS, MODEL)
+    assert filled["steps"][0]["parameters"] == {"cities": ["Tokyo", "Oslo"], "forecast": False}
+    assert filled["task_summary"] == "Weather in Tokyo and Oslo"
+    # A different number of cities is a different template
+    assert plans.get("Weather in Tokyo, Oslo and Rome", TOOLS, MODEL) is None
+
+
+def test_batch_with_a_city_not_in_the_task_is_not_templated():
+    plan = {"steps": [{"step_number": 1, "action": "weather_batch", "parameters": {"cities": ["London", "Berlin"]}}]}
+    plans = cache()
+    plans.put("Weather in London and Paris", TOOLS, MODEL, plan)
+    assert plans.get("Weather in Tokyo and Oslo", TOOLS, MODEL) is None
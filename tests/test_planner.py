@@ -0,0 +1,15 @@
+from agents.fast_planner import FastPathPlanner
+from agents.plan_cache import PlanCache
+from agents.planner import PlannerAgent
+
+
+def test_system_prompt_follows_the_catalog():
+    planner = PlannerAgent(plan_cache=PlanCache(backend=None), fast_path=FastPathPlanner(enabled=False))
+    version, prompt = planner.catalog_version, planner.system_prompt()
+    assert "- weather_batch:" in prompt
+    assert planner.system_prompt() is prompt
+    
+    planner.available_tools = {"github_search": "Search GitHub repositories"}
+    assert planner.catalog_version != version
+    assert "- github_search: Search GitHub repositories" in planner.system_prompt()
+    assert "weather_batch" not in planner.system_prompt()
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import BATCH, INTERACTIVE, RateLimiter
+
+
+class FakeClock:
+    """Stands in for the time module; sleeping advances the clock"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def time(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+
+def test_burst_is_served_then_calls_wait_for_refill(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=2, batch_reserve=0)
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.slept == []
+    
+    limiter.acquire()
+    assert sum(clock.slept) == pytest.approx(1.0)
+    assert limiter.stats()["delayed"] == 1
+
+
+def test_refill_is_capped_at_capacity(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=3)
+    limiter.acquire()
+    clock.now += 0.5
+    assert limiter.stats()["tokens"] == 2.5
+    clock.now += 100
+    assert limiter.stats()["tokens"] == 3
+
+
+def test_batch_traffic_leaves_the_reserve_to_interactive_calls(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=10, batch_reserve=0.2)
+    for _ in range(8):
+        limiter.acquire(BATCH)
+    assert clock.slept == []
+    
+    # Interactive calls may use the reserve
+    limiter.acquire(INTERACTIVE)
+    assert clock.slept == []
+    
+    # A batch call waits until a token is free above the 2-token reserve
+    limiter.acquire(BATCH)
+    assert sum(clock.slept) == pytest.approx(2.0)
+
+
+def test_wait_longer_than_max_wait_fails_fast(clock):
+    limiter = RateLimiter("test", per_minute=1, burst=1, max_wait=5)
+    limiter.acquire()
+    with pytest.raises(Exception, match="Rate limit budget exhausted for test"):
+        limiter.acquire()
+    assert clock.slept == []
+
+
+def test_retry_after_blocks_the_bucket(clock):
+    limiter = RateLimiter("test", per_minute=600, burst=5)
+    assert limiter.update(429, {"Retry-After": "3"}) is True
+    limiter.acquire()
+    assert sum(clock.slept) == pytest.approx(3.0)
+    assert limiter.stats()["rate_limited_responses"] == 1
+
+
+def test_exhausted_quota_waits_for_the_reset(clock):
+    limiter = RateLimiter("test", per_minute=600, burst=5)
+    assert limiter.update(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(clock.now) + 4)}) is False
+    assert limiter.stats()["upstream_remaining"] == 0
+    limiter.acquire()
+    assert sum(clock.slept) == pytest.approx(4.0)
+
+
+def test_429_without_guidance_backs_off_one_token(clock):
+    limiter = RateLimiter("test", per_minute=30, burst=5)
+    assert limiter.update(429, {}) is True
+    assert limiter.stats()["blocked_seconds"] == 2.0
+
+
+def test_refund_returns_a_token_up_to_capacity(clock):
+    limiter = RateLimiter("test", per_minute=60, burst=2)
+    limiter.acquire()
+    limiter.refund()
+    assert limiter.stats()["tokens"] == 2
+    limiter.refund()
+    assert limiter.stats()["tokens"] == 2
+
+
+def test_async_acquire_waits_without_blocking_the_loop():
+    limiter = RateLimiter("test", per_minute=600, burst=1)
+    ticks = []
+    
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+    
+    async def run():
+        background = asyncio.ensure_future(ticker())
+        started = time.monotonic()
+        await limiter.aacquire()
+        await limiter.aacquire()
+        background.cancel()
+        return time.monotonic() - started
+    
+    elapsed = asyncio.run(run())
+    assert elapsed >= 0.08
+    assert len(ticks) > 3
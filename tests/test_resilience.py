@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from llm.llm_client import LLMClient
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, acall_with_retry, call_with_retry
+
+
+def open_breaker(recovery_timeout: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=recovery_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = open_breaker()
+    time.sleep(0.06)
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_one_probe():
+    breaker = half_open_breaker()
+    assert breaker.before_call() is True
+    assert breaker.stats()["state"] == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+    assert breaker.before_call() is False
+
+
+def test_failed_probe_reopens():
+    breaker = half_open_breaker()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_retries_stop_when_the_circuit_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    calls = []
+    
+    def fail():
+        calls.append(1)
+        raise requests.exceptions.ConnectionError("down")
+    
+    # The second failure opens the circuit, so the third attempt fails fast
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fail, RetryPolicy(max_attempts=3, base_delay=0), breaker)
+    assert len(calls) == 2
+
+
+def test_cancelled_probe_releases_the_slot():
+    breaker = half_open_breaker()
+    
+    async def hang():
+        await asyncio.sleep(10)
+    
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(acall_with_retry(hang, RetryPolicy(), breaker), timeout=0.01)
+        
+        async def ok():
+            return "ok"
+        return await acall_with_retry(ok, RetryPolicy(), breaker)
+    
+    assert asyncio.run(main()) == "ok"
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+
+
+def test_interrupted_sync_probe_releases_the_slot():
+    breaker = half_open_breaker()
+    
+    def interrupted():
+        raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        call_with_retry(interrupted, RetryPolicy(), breaker)
+    assert call_with_retry(lambda: "ok", RetryPolicy(), breaker) == "ok"
+
+
+def streaming_client(chunks, breaker: CircuitBreaker) -> LLMClient:
+    client = LLMClient("ollama")
+    client.breaker = breaker
+    client._stream_ollama = lambda *args: iter(chunks)
+    
+    async def astream(*args):
+        for chunk in chunks:
+            await asyncio.sleep(0.01)
+            yield chunk
+    client._astream_ollama = astream
+    return client
+
+
+def test_empty_stream_closes_the_circuit():
+    breaker = half_open_breaker()
+    client = streaming_client([], breaker)
+    assert list(client.generate_stream("prompt")) == []
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+
+
+def test_abandoned_stream_releases_the_probe():
+    breaker = half_open_breaker()
+    client = streaming_client(["", "", "text"], breaker)
+    
+    async def main():
+        async def first_chunk():
+            async for chunk in client.agenerate_stream("prompt"):
+                return chunk
+        # Cancelled while waiting for the first non-empty chunk
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(first_chunk(), timeout=0.015)
+    
+    asyncio.run(main())
+    assert breaker.before_call() is True
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from typing import Optional
+
+import pytest
+
+from llm.llm_client import BaseLLMClient, LLMClient
+from llm.router import LLMRouter
+from utils.resilience import CircuitBreaker
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FakeClient(BaseLLMClient):
+    def __init__(self, provider: str, error: Optional[Exception] = None, delay: float = 0.0):
+        super().__init__()
+        self.provider = self.model = provider
+        self.breaker = CircuitBreaker(f"test:{provider}", failure_threshold=5, recovery_timeout=30)
+        self.error = error
+        self.delay = delay
+    
+    def _generate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.provider
+    
+    async def _agenerate(self, prompt, system_prompt, json_mode, temperature) -> str:
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.provider
+
+
+def wrapped(cause: Exception) -> Exception:
+    """How LLMClient reports provider errors"""
+    try:
+        raise Exception("LLM API Error (primary): request failed") from cause
+    except Exception as e:
+        return e
+
+
+def cooldown(router: LLMRouter, provider: str) -> float:
+    return router.stats()["providers"][provider]["cooldown_seconds"]
+
+
+def test_rate_limit_found_through_the_cause_chain():
+    router = LLMRouter([FakeClient("primary", wrapped(RateLimited())), FakeClient("backup")],
+                       error_cooldown=5, rate_limit_cooldown=60)
+    assert router.generate("hello") == "backup"
+    assert cooldown(router, "primary") == 60
+
+
+def test_429_in_the_message_is_not_a_rate_limit():
+    router = LLMRouter([FakeClient("primary", wrapped(ValueError("prompt is 4290 tokens"))), FakeClient("backup")],
+                       error_cooldown=5, rate_limit_cooldown=60)
+    assert router.generate("hello") == "backup"
+    assert cooldown(router, "primary") == 5
+
+
+def test_router_shares_the_client_interface():
+    router = LLMRouter([FakeClient("primary")])
+    assert isinstance(router, BaseLLMClient)
+    assert router.generate("hello") == "primary"
+
+
+def rate_limited_client(monkeypatch) -> LLMClient:
+    """An LLMClient whose provider always answers 429, counting the calls"""
+    monkeypatch.setenv("RETRY_BASE_DELAY", "0")
+    client = LLMClient("ollama")
+    client.breaker = CircuitBreaker("test:rate-limited", failure_threshold=100, recovery_timeout=30)
+    client.calls = 0
+    
+    def dispatch(*args):
+        client.calls += 1
+        raise RateLimited()
+    
+    client._dispatch = dispatch
+    return client
+
+
+def test_429_fails_over_without_retrying_the_provider(monkeypatch):
+    primary = rate_limited_client(monkeypatch)
+    router = LLMRouter([primary, FakeClient("backup")])
+    assert router.generate("hello") == "backup"
+    assert primary.calls == 1
+    assert primary.retry_policy.is_retryable(type("Unavailable", (Exception,), {"status_code": 503})())
+
+
+def test_429_is_retried_without_a_fallback(monkeypatch):
+    primary = rate_limited_client(monkeypatch)
+    router = LLMRouter([primary])
+    with pytest.raises(Exception, match="All LLM providers failed"):
+        router.generate("hello")
+    assert primary.calls == primary.retry_policy.max_attempts > 1
+
+
+def test_sequential_failover_is_not_a_hedge_win():
+    router = LLMRouter([FakeClient("primary", RuntimeError("down")), FakeClient("backup")], hedge_after=10)
+    assert router.generate("sync") == "backup"
+    assert asyncio.run(router.agenerate("async")) == "backup"
+    assert router.stats()["hedges"] == {"fired": 0, "won": 0}
+
+
+def test_hedge_win_is_counted():
+    router = LLMRouter([FakeClient("primary", delay=0.5), FakeClient("backup")], hedge_after=0.01)
+    assert router.generate("sync") == "backup"
+    assert asyncio.run(router.agenerate("async")) == "backup"
+    assert router.stats()["hedges"] == {"fired": 2, "won": 2}
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_failure_fails_over_while_a_hedge_is_in_flight(use_async):
+    # The primary fails after the hedge fired; the third provider starts then, not a hedge interval later
+    router = LLMRouter([
+        FakeClient("primary", RuntimeError("down"), delay=0.2),
+        FakeClient("hedge", delay=2),
+        FakeClient("third")
+    ], hedge_after=0.1)
+    result = asyncio.run(router.agenerate("hello")) if use_async else router.generate("hello")
+    assert result == "third"
+    assert router.stats()["hedges"] == {"fired": 1, "won": 0}
@@ -0,0 +1,111 @@
+import datetime
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from utils import serialization
+from utils.serialization import ResponseEncoder, dumps, parse_fields, project
+
+RESULT = {
+    "task": "weather",
+    "status": "success",
+    "verification": {"is_complete": True, "summary": "Sunny"},
+    "data": [
+        {"step": 1, "action": "weather_current", "data": {"city": "Paris", "temperature": 20}},
+        {"step": 2, "action": "github_info", "data": {"full_name": "a/b"}}
+    ]
+}
+
+
+def test_dumps_is_minified_utf8_json():
+    body = dumps({"city": "Zürich", "n": [1, 2], "when": datetime.date(2024, 1, 1), "path": Path("a")})
+    assert body == '{"city":"Zürich","n":[1,2],"when":"2024-01-01","path":"a"}'.encode("utf-8")
+
+
+@pytest.mark.parametrize("fields, tree", [
+    (None, None),
+    ("", None),
+    (" , ", None),
+    ("status", {"status": {}}),
+    ("verification.summary, data.step", {"verification": {"summary": {}}, "data": {"step": {}}}),
+    ("data,data.step", {"data": {}}),
+    ("data.step,data", {"data": {}}),
+    ("data..data.city", {"data": {"data": {"city": {}}}}),
+])
+def test_parse_fields(fields, tree):
+    assert parse_fields(fields) == tree
+
+
+def test_project_keeps_requested_paths_and_maps_over_lists():
+    projected = project(RESULT, parse_fields("status,verification.summary,data.step,data.data.city"))
+    assert projected == {
+        "status": "success",
+        "verification": {"summary": "Sunny"},
+        "data": [{"step": 1, "data": {"city": "Paris"}}, {"step": 2, "data": {}}]
+    }
+
+
+def test_project_leaves_out_missing_fields_and_keeps_everything_without_a_tree():
+    assert project(RESULT, parse_fields("errors,verification.missing")) == {"verification": {}}
+    assert project(RESULT, None) is RESULT
+    assert project("scalar", parse_fields("a")) == "scalar"
+
+
+@pytest.fixture
+def encoder():
+    return ResponseEncoder(encodings=["gzip"], min_bytes=10)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("deflate, gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=abc", None),
+    ("br", None),
+    ("*", "gzip"),
+    ("*;q=0.5, gzip;q=0", None),
+    ("identity", None),
+])
+def test_negotiate_gzip_only(encoder, header, expected):
+    assert encoder.negotiate(header) == expected
+
+
+@pytest.mark.skipif(serialization.zstandard is None, reason="zstandard not installed")
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, zstd", "zstd"),
+    ("gzip, zstd;q=0.9", "gzip"),
+    ("gzip;q=0.1, zstd;q=0.2", "zstd"),
+    ("*", "zstd"),
+    ("zstd;q=0, *", "gzip"),
+])
+def test_negotiate_prefers_weight_then_server_order(header, expected):
+    assert ResponseEncoder(encodings=["gzip", "zstd"], min_bytes=0).negotiate(header) == expected
+
+
+def test_disabled_encodings_are_never_chosen():
+    assert ResponseEncoder(encodings=["none"], min_bytes=0).negotiate("gzip, zstd, *") is None
+
+
+def test_small_bodies_are_not_compressed(encoder):
+    assert encoder.encode({"a": 1}, "gzip") == (b'{"a":1}', None)
+
+
+def test_large_bodies_are_compressed_for_the_client(encoder):
+    body, encoding = encoder.encode(RESULT, "gzip")
+    assert encoding == "gzip"
+    assert json.loads(gzip.decompress(body)) == RESULT
+    # mtime=0 keeps the output stable for identical bodies
+    assert encoder.encode(RESULT, "gzip")[0] == body
+    assert encoder.encode(RESULT, "br") == (dumps(RESULT), None)
+
+
+@pytest.mark.skipif(serialization.zstandard is None, reason="zstandard not installed")
+def test_zstd_round_trip():
+    body, encoding = ResponseEncoder(encodings=["zstd"], min_bytes=0).encode(RESULT, "zstd")
+    assert encoding == "zstd"
+    assert json.loads(serialization.zstandard.ZstdDecompressor().decompress(body)) == RESULT
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def wait_for_coalesced(flight, count):
+    while flight.stats()["coalesced"] < count:
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fetch, label="tool"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+    assert flight.stats()["by_label"] == {"tool": {"executed": 1, "coalesced": 3}}
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["executed"] == 2
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    
+    def fail():
+        release.wait(5)
+        raise ValueError("upstream down")
+    
+    errors = []
+    
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced(flight, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert len(errors) == 3 and all(str(e) == "upstream down" for e in errors)
+    # The failed call isn't remembered
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_async_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+    
+    async def run():
+        return await asyncio.gather(*(flight.ado("key", fetch) for _ in range(4)))
+    
+    assert asyncio.run(run()) == ["value"] * 4
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 3
+
+
+def test_async_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+    
+    async def run():
+        return await asyncio.gather(*(flight.ado("key", fail) for _ in range(3)), return_exceptions=True)
+    
+    errors = asyncio.run(run())
+    assert [type(e) for e in errors] == [ValueError] * 3
+    assert flight.stats()["executed"] == 1
+
+
+def test_cancelled_leader_fails_followers_with_an_ordinary_error():
+    flight = SingleFlight()
+    
+    async def run():
+        leader = asyncio.ensure_future(flight.ado("key", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("key", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(Exception, match="Coalesced call was cancelled"):
+            await follower
+        assert leader.cancelled()
+    
+    asyncio.run(run())
@@ -0,0 +1,41 @@
+import pytest
+
+from tools.forecast_reducer import ForecastReducer
+from tools.tool_cache import ToolResultCache
+from utils.cache import MemoryCache
+
+
+@pytest.fixture
+def cache() -> ToolResultCache:
+    return ToolResultCache(backend=MemoryCache(), forecast_reducer=ForecastReducer(aggregation="mean", days=5))
+
+
+def test_defaults_case_and_whitespace_share_a_key(cache):
+    assert cache.make_key("github_search", {"query": "  Machine   Learning "}) == cache.make_key(
+        "github_search", {"query": "machine learning", "sort": "stars", "limit": "5"}
+    )
+    assert cache.make_key("weather_current", {"city": "San  Francisco"}) == cache.make_key(
+        "weather_current", {"city": "san francisco", "units": "metric"}
+    )
+
+
+def test_forecast_defaults_share_a_key(cache):
+    defaulted = cache.make_key("weather_forecast", {"city": "London"})
+    assert defaulted == cache.make_key("weather_forecast", {"city": "London", "days": 5, "aggregation": "mean"})
+    assert defaulted == cache.make_key("weather_forecast", {"city": "London", "days": 9, "aggregation": "MEAN"})
+    assert defaulted != cache.make_key("weather_forecast", {"city": "London", "days": 3})
+    assert cache.make_key("weather_batch", {"cities": ["London"], "forecast": True}) == cache.make_key(
+        "weather_batch", {"cities": ["London"], "forecast": True, "days": 5}
+    )
+
+
+def test_separators_inside_values_do_not_collide(cache):
+    assert cache.make_key("github_info", {"owner": "a&repo=b"}) != cache.make_key(
+        "github_info", {"owner": "a", "repo": "b"}
+    )
+
+
+def test_distinct_parameters_do_not_share_entries(cache):
+    cache.set("weather_current", {"city": "London"}, {"temperature": 10})
+    assert cache.get("weather_current", {"city": " london "}) == (True, {"temperature": 10})
+    assert cache.get("weather_current", {"city": "London", "units": "imperial"}) == (False, None)
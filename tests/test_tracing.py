@@ -0,0 +1,143 @@
+import asyncio
+import contextvars
+import json
+import threading
+
+import pytest
+
+from utils.tracing import ConsoleExporter, FileExporter, Tracer, create_exporter, otlp_payload
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.traces = []
+    
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(CollectingExporter())
+
+
+def test_nested_spans_share_a_trace_and_export_once(tracer):
+    with tracer.span("request", route="/process") as root:
+        with tracer.span("planning") as planning:
+            with tracer.span("llm") as llm:
+                assert tracer.current_span() is llm
+        with tracer.span("execution") as execution:
+            tracer.set_attributes(steps=3)
+    
+    assert tracer.current_span() is None
+    [spans] = tracer.exporter.traces
+    assert [span.name for span in spans] == ["llm", "planning", "execution", "request"]
+    assert {span.trace_id for span in spans} == {root.trace_id}
+    assert root.parent_id is None
+    assert planning.parent_id == execution.parent_id == root.span_id
+    assert llm.parent_id == planning.span_id
+    assert execution.attributes == {"steps": 3}
+    assert all(span.end_ns >= span.start_ns for span in spans)
+
+
+def test_separate_roots_are_separate_traces(tracer):
+    with tracer.span("first") as first:
+        pass
+    with tracer.span("second") as second:
+        pass
+    assert first.trace_id != second.trace_id
+    assert len(tracer.exporter.traces) == 2
+
+
+def test_errors_mark_the_span_and_propagate(tracer):
+    with pytest.raises(ValueError):
+        with tracer.span("request"):
+            with tracer.span("step"):
+                raise ValueError("bad input")
+    [spans] = tracer.exporter.traces
+    assert [(span.name, span.error) for span in spans] == [("step", "bad input"), ("request", "bad input")]
+    assert spans[0].to_otlp()["status"] == {"code": 2, "message": "bad input"}
+
+
+def test_spans_attach_across_tasks_and_context_copying_threads(tracer):
+    async def child(name):
+        with tracer.span(name):
+            await asyncio.sleep(0)
+    
+    async def run():
+        with tracer.span("batch") as root:
+            await asyncio.gather(child("a"), child("b"))
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(lambda: child_sync("c"),))
+            thread.start()
+            thread.join()
+        return root
+    
+    def child_sync(name):
+        with tracer.span(name):
+            pass
+    
+    root = asyncio.run(run())
+    [spans] = tracer.exporter.traces
+    assert sorted(span.name for span in spans if span.parent_id == root.span_id) == ["a", "b", "c"]
+
+
+def test_exporter_failures_do_not_reach_the_caller():
+    class Broken:
+        def export(self, spans):
+            raise RuntimeError("collector down")
+    
+    with Tracer(Broken()).span("request") as span:
+        pass
+    assert span.end_ns is not None
+
+
+def test_otlp_payload_encodes_spans_and_attribute_types(tracer):
+    with tracer.span("request", ok=True, count=2, ratio=0.5, route="/x", skipped=None) as root:
+        with tracer.span("child"):
+            pass
+    payload = otlp_payload(tracer.exporter.traces[0], "svc")
+    resource = payload["resourceSpans"][0]
+    assert resource["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "svc"}}]
+    child, request = resource["scopeSpans"][0]["spans"]
+    assert request["traceId"] == root.trace_id and "parentSpanId" not in request
+    assert child["parentSpanId"] == root.span_id
+    assert request["attributes"] == [
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "count", "value": {"intValue": "2"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "route", "value": {"stringValue": "/x"}}
+    ]
+    assert request["status"] == {"code": 1}
+
+
+def test_file_exporter_appends_one_document_per_trace(tmp_path):
+    path = tmp_path / "traces" / "out.jsonl"
+    tracer = Tracer(FileExporter("svc", str(path)))
+    for name in ("first", "second"):
+        with tracer.span(name):
+            with tracer.span("child"):
+                pass
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    spans = json.loads(lines[1])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["child", "second"]
+
+
+def test_console_exporter_prints_an_indented_tree(capsys):
+    tracer = Tracer(ConsoleExporter("svc"))
+    with tracer.span("request", route="/x"):
+        with tracer.span("planning"):
+            pass
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("trace ")
+    assert lines[1].startswith("  - request ") and lines[1].endswith("route=/x")
+    assert lines[2].startswith("    - planning ")
+
+
+def test_create_exporter_by_name(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACING_FILE", str(tmp_path / "t.jsonl"))
+    assert create_exporter("none") is None
+    assert isinstance(create_exporter("console"), ConsoleExporter)
+    assert isinstance(create_exporter("file"), FileExporter)
+    with pytest.raises(ValueError, match="Unknown tracing exporter"):
+        create_exporter("zipkin")
@@ -0,0 +1,101 @@
+import pytest
+
+from agents.verifier import VerifierAgent
+
+LLM_VERDICT = {"is_complete": False, "missing_items": ["llm"], "summary": "From the LLM", "confidence": "medium"}
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_json(self, prompt, system_prompt=None):
+        self.calls += 1
+        return dict(LLM_VERDICT)
+
+
+def verifier(mode):
+    agent = VerifierAgent(mode=mode)
+    agent.llm = FakeLLM()
+    return agent
+
+
+def step(number, action, data):
+    return {"step_number": number, "action": action, "status": "success", "data": data, "error": None}
+
+
+def weather(city):
+    return {
+        "city": city, "country": "GB", "temperature": 12, "feels_like": 11, "units": "°C",
+        "description": "light rain", "humidity": 80
+    }
+
+
+def results(*steps):
+    return {"task_summary": "", "steps_executed": list(steps), "errors": []}
+
+
+LONDON = results(step(1, "weather_current", weather("London")))
+REPO = {"full_name": "tensorflow/tensorflow", "stars": 180000, "forks": 74000, "language": "C++"}
+
+
+def test_llm_mode_always_asks_the_llm():
+    agent = verifier("llm")
+    output = agent.verify_and_format("What's the weather in London?", LONDON)
+    assert agent.llm.calls == 1
+    assert output["verification"]["summary"] == "From the LLM"
+
+
+def test_rule_first_certifies_results_that_cover_the_task():
+    agent = verifier("rule_first")
+    output = agent.verify_and_format("What's the weather in London?", LONDON)
+    assert agent.llm.calls == 0
+    assert output["verification"]["is_complete"] is True
+    assert output["verification"]["confidence"] == "high"
+    assert "London" in output["verification"]["summary"]
+
+
+@pytest.mark.parametrize("task, execution", [
+    ("Weather in London and Paris", LONDON),
+    ("Weather in London and info about tensorflow/tensorflow", LONDON),
+    ("Show the 5-day forecast for London", LONDON),
+    ("Get details for pytorch/pytorch", results(step(1, "github_info", REPO))),
+    ("Find popular rust repositories", LONDON),
+    ("Tell me a joke", LONDON),
+])
+def test_rule_first_defers_when_the_results_may_not_cover_the_task(task, execution):
+    agent = verifier("rule_first")
+    output = agent.verify_and_format(task, execution)
+    assert agent.llm.calls == 1
+    assert output["verification"]["summary"] == "From the LLM"
+
+
+def test_rule_first_defers_on_step_errors():
+    agent = verifier("rule_first")
+    failed = {"step_number": 2, "action": "weather_current", "status": "error", "data": None, "error": "timeout"}
+    agent.verify_and_format("Weather in London", results(step(1, "weather_current", weather("London")), failed))
+    assert agent.llm.calls == 1
+
+
+def test_rule_first_matches_batch_cities_by_query():
+    agent = verifier("rule_first")
+    batch = [{"query": city, "data": weather(city)} for city in ("Paris", "Berlin", "Tokyo")]
+    output = agent.verify_and_format("Compare the weather in Paris, Berlin and Tokyo", results(step(1, "weather_batch", batch)))
+    assert agent.llm.calls == 0
+    assert output["verification"]["is_complete"] is True
+
+
+def test_rule_only_reports_coverage_gaps_without_the_llm():
+    agent = verifier("rule_only")
+    output = agent.verify_and_format("Weather in London and Paris", LONDON)
+    assert agent.llm.calls == 0
+    assert output["verification"]["is_complete"] is False
+    assert output["verification"]["missing_items"] == ["No weather data for Paris"]
+
+
+def test_rule_only_is_less_confident_when_nothing_can_be_checked():
+    agent = verifier("rule_only")
+    output = agent.verify_and_format("Tell me a joke", LONDON)
+    assert agent.llm.calls == 0
+    assert output["verification"]["is_complete"] is True
+    assert output["verification"]["confidence"] == "medium"
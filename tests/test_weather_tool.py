@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+from tools.weather_tool import WeatherTool
+from utils.cache import MemoryCache, SQLiteCache
+
+
+class RecordingCache(SQLiteCache):
+    """SQLite cache that remembers which threads touched it"""
+
+    def __init__(self, path):
+        super().__init__(str(path))
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ttl):
+        self.threads.add(threading.get_ident())
+        return super().set(key, value, ttl)
+
+
+def stubbed_tool(upstreams, geocode_cache):
+    """A weather tool pointed at the upstream stand-ins"""
+    tool = WeatherTool(geocode_cache=geocode_cache)
+    tool.base_url = f"{upstreams.url}/openweather/data/2.5"
+    tool.geo_url = f"{upstreams.url}/openweather/geo/1.0"
+    return tool
+
+
+def test_async_geocode_keeps_sqlite_off_the_event_loop(tmp_path, upstreams):
+    cache = RecordingCache(tmp_path / "geocode.sqlite3")
+    tool = stubbed_tool(upstreams, cache)
+
+    async def lookup():
+        first = await tool.ageocode("London")
+        second = await tool.ageocode("london")
+        return threading.get_ident(), first, second
+
+    loop_thread, first, second = asyncio.run(lookup())
+    assert first == second
+    assert cache.threads and loop_thread not in cache.threads
+    assert tool.geocode_stats.snapshot()["hits"] == 1
+
+
+def test_async_geocode_reads_a_memory_cache_inline(upstreams):
+    tool = stubbed_tool(upstreams, MemoryCache())
+
+    async def lookup():
+        await tool.ageocode("Paris")
+        return await tool.ageocode("Paris")
+
+    assert asyncio.run(lookup())["name"]
+    assert tool.geocode_stats.snapshot()["hits"] == 1
@@ -1,4 +1,5 @@
 from .github_tool import github_tool, GitHubTool
 from .weather_tool import weather_tool, WeatherTool
+from .tool_cache import ToolResultCache
 
-__all__ = ['github_tool', 'GitHubTool', 'weather_tool', 'WeatherTool']
+__all__ = ['github_tool', 'GitHubTool', 'weather_tool', 'WeatherTool', 'ToolResultCache']
@@ -0,0 +1,180 @@
+"""
+Single-pass reduction of 3-hourly forecasts to daily summaries
+
+OpenWeather's /forecast endpoint returns up to 40 readings at 3-hour
+steps. The reducer walks them once, grouping by the city's local calendar
+day (from the Unix timestamp and the city's UTC offset, so no date
+strings are parsed), and keeps running min/max/sum and condition counts
+for the open day only.
+"""
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# How a day's readings become its "temperature"; temp_min/temp_max are always reported
+AGGREGATIONS = ("mean", "min", "max", "midday", "first")
+
+READINGS_PER_DAY = 8
+MAX_READINGS = 40
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+_NOON = 12 * 60 * 60
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _summary(
+    day: int,
+    aggregation: str,
+    low: float,
+    high: float,
+    total: float,
+    count: int,
+    first: float,
+    midday: float,
+    conditions: Dict[str, list]
+) -> Dict[str, Any]:
+    """Compact record for one local day"""
+    if aggregation == "mean":
+        temperature = round(total / count, 2)
+    elif aggregation == "min":
+        temperature = low
+    elif aggregation == "max":
+        temperature = high
+    elif aggregation == "midday":
+        temperature = midday
+    else:
+        temperature = first
+    
+    condition, (_, description) = max(conditions.items(), key=lambda item: item[1][0])
+    return {
+        "date": date.fromordinal(_EPOCH_ORDINAL + day).isoformat(),
+        "temperature": temperature,
+        "temp_min": low,
+        "temp_max": high,
+        "weather": condition,
+        "description": description
+    }
+
+
+class ForecastReducer:
+    def __init__(self, aggregation: Optional[str] = None, days: Optional[int] = None):
+        """
+        Args:
+            aggregation: Default daily temperature aggregation (FORECAST_AGGREGATION):
+                mean, min, max, midday (reading closest to local noon) or first
+            days: Default horizon in days (FORECAST_DAYS)
+        """
+        # resolve() falls back to these when a setting is empty or zero
+        self.aggregation, self.days = "mean", 5
+        self.aggregation, self.days = self.resolve(
+            aggregation or os.getenv("FORECAST_AGGREGATION"),
+            days or int(os.getenv("FORECAST_DAYS") or 0)
+        )
+    
+    def resolve(self, aggregation: Optional[str] = None, days: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Validate per-call options, falling back to the defaults
+        
+        Args:
+            aggregation: Daily temperature aggregation
+            days: Horizon in days
+        
+        Returns:
+            (aggregation, days) with days clamped to what the endpoint covers
+        """
+        aggregation = (aggregation or self.aggregation).lower()
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown forecast aggregation: {aggregation}")
+        days = int(days or self.days)
+        return aggregation, max(1, min(days, MAX_READINGS // READINGS_PER_DAY))
+    
+    def readings_needed(self, days: int) -> int:
+        """
+        Readings to request for a horizon: the first (partial) local day
+        plus the following full days never need more than 8 per day
+        """
+        return min(MAX_READINGS, days * READINGS_PER_DAY)
+    
+    def reduce(
+        self,
+        readings: List[Dict[str, Any]],
+        utc_offset: int = 0,
+        aggregation: Optional[str] = None,
+        days: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarize chronological 3-hourly readings per local day
+        
+        Args:
+            readings: OpenWeather forecast "list" entries
+            utc_offset: City's offset from UTC in seconds
+            aggregation: Daily temperature aggregation (default from settings)
+            days: Maximum number of days to return (default from settings)
+        
+        Returns:
+            One record per day with date, temperature, temp_min, temp_max,
+            weather (dominant condition) and its description
+        """
+        aggregation, days = self.resolve(aggregation, days)
+        summaries: List[Dict[str, Any]] = []
+        current = None
+        
+        # Running totals for the open day are plain locals: this loop runs for every reading
+        for item in readings:
+            day, seconds_into_day = divmod(item["dt"] + utc_offset, _SECONDS_PER_DAY)
+            temp = item["main"]["temp"]
+            weather = item["weather"][0]
+            
+            if day != current:
+                if current is not None:
+                    summaries.append(_summary(current, aggregation, low, high, total, count, first, midday, conditions))
+                    if len(summaries) == days:
+                        return summaries
+                current, low, high, total, count, first = day, temp, temp, 0.0, 0, temp
+                midday, midday_distance = temp, _SECONDS_PER_DAY
+                # Condition -> [readings, first description]; insertion order breaks ties
+                conditions: Dict[str, list] = {}
+            
+            if temp < low:
+                low = temp
+            elif temp > high:
+                high = temp
+            total += temp
+            count += 1
+            
+            distance = abs(seconds_into_day - _NOON)
+            if distance < midday_distance:
+                midday, midday_distance = temp, distance
+            
+            seen = conditions.get(weather["main"])
+            if seen is None:
+                conditions[weather["main"]] = [1, weather["description"]]
+            else:
+                seen[0] += 1
+        
+        if current is not None:
+            summaries.append(_summary(current, aggregation, low, high, total, count, first, midday, conditions))
+        return summaries
+    
+    def series(self, readings: List[Dict[str, Any]], days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        The raw 3-hour readings in compact form
+        
+        Args:
+            readings: OpenWeather forecast "list" entries
+            days: Horizon in days (default from settings)
+        
+        Returns:
+            Records with time (UTC), temperature, humidity, weather and description
+        """
+        _, days = self.resolve(None, days)
+        return [
+            {
+                "time": item.get("dt_txt"),
+                "temperature": item["main"]["temp"],
+                "humidity": item["main"].get("humidity"),
+                "weather": item["weather"][0]["main"],
+                "description": item["weather"][0]["description"]
+            }
+            for item in readings[:self.readings_needed(days)]
+        ]
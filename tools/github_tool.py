@@ -1,16 +1,44 @@
 """
 GitHub Tool for searching repositories and fetching information
 """
+import asyncio
 import os
 import requests
-from typing import Dict, Any, List
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple
+from utils.http_pool import http_pool, HTTPPool
+from utils.cache import CacheStats, create_cache_backend, MISSING
+from utils.rate_limiter import rate_limits
+from utils.tracing import tracer
+from utils.resilience import RetryPolicy, circuit_breakers, call_with_retry, acall_with_retry
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
+
+# Fields requested per repository in bulk lookups, matching _parse_repository
+REPOSITORY_FIELDS = """
+fragment RepositoryFields on Repository {
+  name
+  nameWithOwner
+  description
+  stargazerCount
+  forkCount
+  primaryLanguage { name }
+  url
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  createdAt
+  updatedAt
+}
+"""
 
 
 class GitHubTool:
-    def __init__(self):
+    def __init__(self, http: Optional[HTTPPool] = None, etag_cache: Any = MISSING):
+        """
+        Args:
+            http: Connection pool (defaults to the shared pool)
+            etag_cache: Cache backend for repository validators and bodies; None disables
+                conditional requests. Defaults to GITHUB_ETAG_CACHE_BACKEND (memory, sqlite or none)
+        """
         self.token = os.getenv("GITHUB_TOKEN")
         self.base_url = "https://api.github.com"
         self.headers = {
@@ -18,6 +46,42 @@ class GitHubTool:
         }
         if self.token:
             self.headers["Authorization"] = f"token {self.token}"
+        self.http = http or http_pool
+        
+        # Search API: 30 req/min authenticated, 10 unauthenticated;
+        # core API: 5000 req/hour authenticated, 60 unauthenticated
+        self.search_limiter = rate_limits.register(
+            "github_search",
+            float(os.getenv("GITHUB_SEARCH_RATE_PER_MIN", "30" if self.token else "10"))
+        )
+        self.core_limiter = rate_limits.register(
+            "github_core",
+            float(os.getenv("GITHUB_CORE_RATE_PER_HOUR", "5000" if self.token else "60")) / 60.0,
+            burst=100 if self.token else 10
+        )
+        # GraphQL: 5000 points/hour, and a bulk lookup of up to 100 repositories costs one point
+        self.graphql_limiter = rate_limits.register(
+            "github_graphql",
+            float(os.getenv("GITHUB_GRAPHQL_RATE_PER_HOUR", "5000")) / 60.0,
+            burst=100
+        )
+        self.bulk_batch_size = int(os.getenv("GITHUB_BULK_BATCH_SIZE", "50"))
+        
+        # 429s are handled by the rate limiters, so only retry server errors
+        self.retry_policy = RetryPolicy(retry_on_status=(500, 502, 503, 504))
+        self.breaker = circuit_breakers.get("github")
+        
+        # Repository lookups are revalidated with If-None-Match/If-Modified-Since;
+        # GitHub answers 304 without counting the request against the rate limit
+        if etag_cache is MISSING:
+            etag_cache = create_cache_backend(
+                os.getenv("GITHUB_ETAG_CACHE_BACKEND", "memory"),
+                path=os.getenv("GITHUB_ETAG_CACHE_PATH", os.path.join(".cache", "github_etags.sqlite3")),
+                max_entries=int(os.getenv("GITHUB_ETAG_CACHE_MAX_ENTRIES", "1024"))
+            )
+        self.etag_cache = etag_cache
+        self.etag_ttl = float(os.getenv("GITHUB_ETAG_CACHE_TTL", str(7 * 24 * 60 * 60)))
+        self.etag_stats = CacheStats("github_etag")
     
     def search_repositories(
         self, 
@@ -38,34 +102,32 @@ class GitHubTool:
         """
         try:
             url = f"{self.base_url}/search/repositories"
-            params = {
-                "q": query,
-                "sort": sort,
-                "order": "desc",
-                "per_page": limit
-            }
+            params = self._search_params(query, sort, limit)
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, self.search_limiter, params)
             
-            data = response.json()
-            repositories = []
+            return self._parse_search(response.json())
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"GitHub API Error: {str(e)}")
+    
+    async def asearch_repositories(
+        self, 
+        query: str, 
+        sort: str = "stars", 
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Async variant of search_repositories"""
+        import httpx  # imported with the async client, not at startup
+        try:
+            url = f"{self.base_url}/search/repositories"
+            params = self._search_params(query, sort, limit)
             
-            for repo in data.get("items", []):
-                repositories.append({
-                    "name": repo["name"],
-                    "full_name": repo["full_name"],
-                    "description": repo.get("description", "No description"),
-                    "stars": repo["stargazers_count"],
-                    "forks": repo["forks_count"],
-                    "language": repo.get("language", "Unknown"),
-                    "url": repo["html_url"],
-                    "updated_at": repo["updated_at"]
-                })
+            response = await self._aget(url, self.search_limiter, params)
             
-            return repositories
+            return self._parse_search(response.json())
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"GitHub API Error: {str(e)}")
     
     def get_repository_info(self, owner: str, repo: str) -> Dict[str, Any]:
@@ -81,26 +143,285 @@ class GitHubTool:
         """
         try:
             url = f"{self.base_url}/repos/{owner}/{repo}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            cached = self._cached_repository(url)
+            response = self._get(url, self.core_limiter, headers=self._conditional_headers(cached))
             
-            data = response.json()
+            return self._revalidated_repository(url, response, cached)
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"GitHub API Error: {str(e)}")
+    
+    async def aget_repository_info(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Async variant of get_repository_info"""
+        import httpx  # imported with the async client, not at startup
+        try:
+            url = f"{self.base_url}/repos/{owner}/{repo}"
+            cached = self._cached_repository(url)
+            response = await self._aget(url, self.core_limiter, headers=self._conditional_headers(cached))
             
-            return {
-                "name": data["name"],
-                "full_name": data["full_name"],
-                "description": data.get("description", "No description"),
-                "stars": data["stargazers_count"],
-                "forks": data["forks_count"],
-                "language": data.get("language", "Unknown"),
-                "url": data["html_url"],
-                "topics": data.get("topics", []),
-                "created_at": data["created_at"],
-                "updated_at": data["updated_at"]
-            }
+            return self._revalidated_repository(url, response, cached)
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"GitHub API Error: {str(e)}")
+    
+    @property
+    def bulk_enabled(self) -> bool:
+        """Bulk lookups use the GraphQL API, which requires a token"""
+        return bool(self.token)
+    
+    def get_repositories_info(self, repositories: Sequence[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get details for many repositories with one GraphQL request per batch
+        
+        Args:
+            repositories: (owner, repo) pairs
+        
+        Returns:
+            Repository details in input order; None for repositories that could not be resolved
+        """
+        try:
+            results = []
+            for start in range(0, len(repositories), self.bulk_batch_size):
+                batch = repositories[start:start + self.bulk_batch_size]
+                response = self._post(f"{self.base_url}/graphql", self.graphql_limiter, self._bulk_query(batch))
+                results.extend(self._parse_bulk(response.json(), len(batch)))
+            return results
         
         except requests.exceptions.RequestException as e:
             raise Exception(f"GitHub API Error: {str(e)}")
+    
+    async def aget_repositories_info(self, repositories: Sequence[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Async variant of get_repositories_info; batches are sent concurrently"""
+        import httpx  # imported with the async client, not at startup
+        
+        async def fetch(batch: Sequence[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+            response = await self._apost(f"{self.base_url}/graphql", self.graphql_limiter, self._bulk_query(batch))
+            return self._parse_bulk(response.json(), len(batch))
+        
+        try:
+            batches = await asyncio.gather(*(
+                fetch(repositories[start:start + self.bulk_batch_size])
+                for start in range(0, len(repositories), self.bulk_batch_size)
+            ))
+            return [repository for batch in batches for repository in batch]
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"GitHub API Error: {str(e)}")
+    
+    def _get(
+        self,
+        url: str,
+        limiter,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """GET with retries on transient errors, failing fast while the circuit is open"""
+        return call_with_retry(lambda: self._get_once(url, limiter, params, headers), self.retry_policy, self.breaker)
+    
+    async def _aget(
+        self,
+        url: str,
+        limiter,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> "httpx.Response":
+        """Async variant of _get"""
+        return await acall_with_retry(lambda: self._aget_once(url, limiter, params, headers), self.retry_policy, self.breaker)
+    
+    def _get_once(
+        self,
+        url: str,
+        limiter,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """GET within the rate budget, waiting and retrying once if rate limited"""
+        with tracer.span("http.get", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                limiter.acquire()
+                response = self.http.session.get(
+                    url, headers={**self.headers, **(headers or {})}, params=params, timeout=10
+                )
+                if not limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            if response.status_code == 304:
+                limiter.refund()
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+    
+    async def _aget_once(
+        self,
+        url: str,
+        limiter,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> "httpx.Response":
+        """Async variant of _get_once"""
+        with tracer.span("http.get", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                await limiter.aacquire()
+                response = await self.http.async_client.get(
+                    url, headers={**self.headers, **(headers or {})}, params=params, timeout=10
+                )
+                if not limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            if response.status_code == 304:
+                limiter.refund()
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            # httpx treats every non-2xx status as an error, including 304 Not Modified
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+    
+    def _post(self, url: str, limiter, payload: Dict[str, Any]) -> requests.Response:
+        """POST with retries on transient errors, failing fast while the circuit is open"""
+        return call_with_retry(lambda: self._post_once(url, limiter, payload), self.retry_policy, self.breaker)
+    
+    async def _apost(self, url: str, limiter, payload: Dict[str, Any]) -> "httpx.Response":
+        """Async variant of _post"""
+        return await acall_with_retry(lambda: self._apost_once(url, limiter, payload), self.retry_policy, self.breaker)
+    
+    def _post_once(self, url: str, limiter, payload: Dict[str, Any]) -> requests.Response:
+        """POST within the rate budget, waiting and retrying once if rate limited"""
+        with tracer.span("http.post", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                limiter.acquire()
+                response = self.http.session.post(url, headers=self.headers, json=payload, timeout=10)
+                if not limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            return response
+    
+    async def _apost_once(self, url: str, limiter, payload: Dict[str, Any]) -> "httpx.Response":
+        """Async variant of _post_once"""
+        with tracer.span("http.post", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                await limiter.aacquire()
+                response = await self.http.async_client.post(url, headers=self.headers, json=payload, timeout=10)
+                if not limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            return response
+    
+    def _bulk_query(self, repositories: Sequence[Tuple[str, str]]) -> Dict[str, Any]:
+        """GraphQL request with one aliased repository field per (owner, repo)"""
+        variables, arguments, fields = {}, [], []
+        for i, (owner, repo) in enumerate(repositories):
+            variables[f"owner{i}"], variables[f"name{i}"] = owner, repo
+            arguments.append(f"$owner{i}: String!, $name{i}: String!")
+            fields.append(f"  r{i}: repository(owner: $owner{i}, name: $name{i}) {{ ...RepositoryFields }}")
+        query = f"query({', '.join(arguments)}) {{\n" + "\n".join(fields) + "\n}\n" + REPOSITORY_FIELDS
+        return {"query": query, "variables": variables}
+    
+    def _parse_bulk(self, body: Dict[str, Any], count: int) -> List[Optional[Dict[str, Any]]]:
+        """Repository details per alias; unresolved repositories come back as null with an error"""
+        data = body.get("data")
+        if data is None:
+            errors = body.get("errors") or [{"message": "empty GraphQL response"}]
+            raise Exception(f"GitHub API Error: {errors[0].get('message')}")
+        
+        repositories = []
+        for i in range(count):
+            node = data.get(f"r{i}")
+            repositories.append(None if node is None else {
+                "name": node["name"],
+                "full_name": node["nameWithOwner"],
+                "description": node.get("description"),
+                "stars": node["stargazerCount"],
+                "forks": node["forkCount"],
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "url": node["url"],
+                "topics": [topic["topic"]["name"] for topic in node["repositoryTopics"]["nodes"]],
+                "created_at": node["createdAt"],
+                "updated_at": node["updatedAt"]
+            })
+        return repositories
+    
+    def _cached_repository(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored validators and parsed body for a repository URL, if any"""
+        if self.etag_cache is None:
+            return None
+        entry = self.etag_cache.get(url)
+        return entry if entry is not MISSING else None
+    
+    def _conditional_headers(self, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """If-None-Match/If-Modified-Since headers from stored validators"""
+        if cached is None:
+            return None
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+    
+    def _revalidated_repository(self, url: str, response, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Serve the stored body on 304 Not Modified; otherwise parse the
+        response and store it with its validators
+        """
+        not_modified = cached is not None and response.status_code == 304
+        if cached is not None:
+            self.etag_stats.record("repository", not_modified)
+        tracer.set_attributes(not_modified=not_modified)
+        if not_modified:
+            return cached["repository"]
+        
+        repository = self._parse_repository(response.json())
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if self.etag_cache is not None and (etag or last_modified):
+            self.etag_cache.set(
+                url,
+                {"etag": etag, "last_modified": last_modified, "repository": repository},
+                self.etag_ttl
+            )
+        return repository
+    
+    def _search_params(self, query: str, sort: str, limit: int) -> Dict[str, Any]:
+        """Build query parameters for the search endpoint"""
+        return {
+            "q": query,
+            "sort": sort,
+            "order": "desc",
+            "per_page": limit
+        }
+    
+    def _parse_search(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract repository summaries from a search response"""
+        repositories = []
+        
+        for repo in data.get("items", []):
+            repositories.append({
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "description": repo.get("description", "No description"),
+                "stars": repo["stargazers_count"],
+                "forks": repo["forks_count"],
+                "language": repo.get("language", "Unknown"),
+                "url": repo["html_url"],
+                "updated_at": repo["updated_at"]
+            })
+        
+        return repositories
+    
+    def _parse_repository(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract repository details from a repos response"""
+        return {
+            "name": data["name"],
+            "full_name": data["full_name"],
+            "description": data.get("description", "No description"),
+            "stars": data["stargazers_count"],
+            "forks": data["forks_count"],
+            "language": data.get("language", "Unknown"),
+            "url": data["html_url"],
+            "topics": data.get("topics", []),
+            "created_at": data["created_at"],
+            "updated_at": data["updated_at"]
+        }
 
 
 # Singleton instance
@@ -0,0 +1,132 @@
+"""
+Result cache for tool calls, keyed by normalized parameters
+"""
+import json
+import os
+from typing import Dict, Any, Optional, Tuple
+
+from tools.forecast_reducer import ForecastReducer
+from utils.cache import CacheStats, create_cache_backend, MISSING
+
+
+class ToolResultCache:
+    # Seconds each tool's results stay fresh
+    DEFAULT_TTLS = {
+        "weather_current": 10 * 60,
+        "weather_forecast": 3 * 60 * 60,
+        "weather_batch": 10 * 60,
+        "github_search": 60 * 60,
+        "github_info": 12 * 60 * 60
+    }
+    
+    # Defaults applied before keying so omitted and explicit defaults share entries
+    DEFAULT_PARAMS = {
+        "github_search": {"sort": "stars", "limit": 5},
+        "weather_current": {"units": "metric"},
+        "weather_forecast": {"units": "metric", "series": False},
+        "weather_batch": {"units": "metric", "forecast": False}
+    }
+    
+    def __init__(
+        self,
+        backend: Any = MISSING,
+        ttls: Optional[Dict[str, float]] = None,
+        forecast_reducer: Optional[ForecastReducer] = None
+    ):
+        """
+        Args:
+            backend: Cache backend (MemoryCache/SQLiteCache); None disables caching.
+                Defaults to TOOL_CACHE_BACKEND (memory, sqlite or none)
+            ttls: Per-tool TTL overrides in seconds
+            forecast_reducer: Source of the default forecast days and aggregation
+                (FORECAST_DAYS/FORECAST_AGGREGATION, as for the weather tool)
+        """
+        if backend is MISSING:
+            backend = create_cache_backend(
+                os.getenv("TOOL_CACHE_BACKEND", "memory"),
+                path=os.getenv("TOOL_CACHE_PATH", os.path.join(".cache", "tool_cache.sqlite3")),
+                max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024"))
+            )
+        self.backend = backend
+        self.forecast_reducer = forecast_reducer or ForecastReducer()
+        
+        self.ttls = dict(self.DEFAULT_TTLS)
+        for action in self.DEFAULT_TTLS:
+            override = os.getenv(f"TOOL_CACHE_TTL_{action.upper()}")
+            if override:
+                self.ttls[action] = float(override)
+        self.ttls.update(ttls or {})
+        
+        self.counters = CacheStats("tool")
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    def is_cacheable(self, action: str) -> bool:
+        """Whether results of this action are cached"""
+        return self.enabled and self.ttls.get(action, 0) > 0
+    
+    def get(self, action: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up a cached tool result
+        
+        Args:
+            action: Tool name
+            params: Step parameters
+        
+        Returns:
+            (found, value) tuple
+        """
+        value = self.backend.get(self.make_key(action, params))
+        found = value is not MISSING
+        self.counters.record(action, found)
+        return found, (value if found else None)
+    
+    def set(self, action: str, params: Dict[str, Any], value: Any):
+        """Store a tool result under its normalized key"""
+        self.backend.set(self.make_key(action, params), value, self.ttls[action])
+    
+    def make_key(self, action: str, params: Dict[str, Any]) -> str:
+        """Build a cache key from the action and normalized parameters"""
+        normalized = self.normalize(action, params)
+        # JSON keeps "&" or "=" inside a value from colliding with another parameter set
+        return f"{action}?" + json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    
+    def normalize(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize parameters: apply defaults, lowercase and collapse whitespace
+        
+        Args:
+            action: Tool name
+            params: Step parameters
+        
+        Returns:
+            Normalized parameter dictionary
+        """
+        normalized = dict(self.DEFAULT_PARAMS.get(action, {}))
+        normalized.update({k: v for k, v in params.items() if v is not None})
+        
+        for name, value in normalized.items():
+            if isinstance(value, str):
+                normalized[name] = " ".join(value.split()).lower()
+            elif isinstance(value, list):
+                normalized[name] = [" ".join(item.split()).lower() if isinstance(item, str) else item for item in value]
+        
+        if "limit" in normalized:
+            normalized["limit"] = int(normalized["limit"])
+        
+        # Omitted, explicit and out-of-range horizons resolve as the weather tool resolves them
+        if action == "weather_forecast" or (action == "weather_batch" and normalized.get("forecast")):
+            normalized["aggregation"], normalized["days"] = self.forecast_reducer.resolve(
+                normalized.get("aggregation"), normalized.get("days")
+            )
+        
+        return normalized
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        snapshot = self.counters.snapshot()
+        snapshot["enabled"] = self.enabled
+        snapshot["entries"] = len(self.backend) if self.enabled else 0
+        return snapshot
@@ -1,18 +1,113 @@
 """
 Weather Tool for fetching current weather information
 """
+import asyncio
+import contextvars
 import os
+import re
+import threading
 import requests
-from typing import Dict, Any
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from tools.forecast_reducer import ForecastReducer
+from utils.http_pool import http_pool, HTTPPool
+from utils.cache import CacheStats, MemoryCache, create_cache_backend, MISSING
+from utils.rate_limiter import rate_limits
+from utils.tracing import tracer
+from utils.resilience import RetryPolicy, circuit_breakers, call_with_retry, acall_with_retry
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
 
 
 class WeatherTool:
-    def __init__(self):
+    def __init__(
+        self,
+        http: Optional[HTTPPool] = None,
+        geocode_cache: Any = MISSING,
+        forecast_reducer: Optional[ForecastReducer] = None
+    ):
+        """
+        Args:
+            http: Connection pool (defaults to the shared pool)
+            geocode_cache: Cache backend for city coordinates; None queries by city name instead.
+                Defaults to GEOCODE_CACHE_BACKEND (sqlite, memory or none), opened on first use
+            forecast_reducer: Daily forecast summarizer (defaults from FORECAST_AGGREGATION/FORECAST_DAYS)
+        """
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.geo_url = "https://api.openweathermap.org/geo/1.0"
+        self.http = http or http_pool
+        
+        # Free tier allows 60 calls/minute
+        self.limiter = rate_limits.register(
+            "openweather",
+            float(os.getenv("OPENWEATHER_RATE_PER_MIN", "60"))
+        )
+        
+        # 429s are handled by the rate limiter, so only retry server errors
+        self.retry_policy = RetryPolicy(retry_on_status=(500, 502, 503, 504))
+        self.breaker = circuit_breakers.get("openweather")
+        
+        # City names are resolved to coordinates once and remembered across restarts
+        self._geocode_cache = geocode_cache
+        self._geocode_lock = threading.Lock()
+        self.geocode_ttl = float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 60 * 60)))
+        self.geocode_stats = CacheStats("geocode")
+        self.batch_concurrency = max(1, int(os.getenv("WEATHER_BATCH_CONCURRENCY", "8")))
+        
+        self.forecast_reducer = forecast_reducer or ForecastReducer()
+    
+    @property
+    def geocode_cache(self):
+        """Geocode cache backend (opened on first use), or None when disabled"""
+        if self._geocode_cache is MISSING:
+            with self._geocode_lock:
+                if self._geocode_cache is MISSING:
+                    self._geocode_cache = create_cache_backend(
+                        os.getenv("GEOCODE_CACHE_BACKEND", "sqlite"),
+                        path=os.getenv("GEOCODE_CACHE_PATH", os.path.join(".cache", "geocode.sqlite3")),
+                        max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "4096"))
+                    )
+        return self._geocode_cache
+    
+    def geocode(self, city: str) -> Dict[str, Any]:
+        """
+        Resolve a city name to coordinates, using the geocode cache
+        
+        Args:
+            city: City name (e.g., "San Francisco" or "London,UK")
+        
+        Returns:
+            Location with name, country, lat and lon
+        """
+        key = self._geocode_key(city)
+        location = self._cached_location(key)
+        if location is not None:
+            return location
+        
+        try:
+            response = self._get(f"{self.geo_url}/direct", self._geocode_params(city))
+            return self._store_location(key, city, response.json())
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    async def ageocode(self, city: str) -> Dict[str, Any]:
+        """Async variant of geocode"""
+        import httpx  # imported with the async client, not at startup
+        key = self._geocode_key(city)
+        await self._ageocode_cache()
+        location = await self._off_loop(self._cached_location, key)
+        if location is not None:
+            return location
+        
+        try:
+            response = await self._aget(f"{self.geo_url}/direct", self._geocode_params(city))
+            return await self._off_loop(self._store_location, key, city, response.json())
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"Weather API Error: {str(e)}")
     
     def get_current_weather(self, city: str, units: str = "metric") -> Dict[str, Any]:
         """
@@ -27,87 +122,396 @@ class WeatherTool:
         """
         try:
             url = f"{self.base_url}/weather"
-            params = {
-                "q": city,
-                "appid": self.api_key,
-                "units": units
-            }
+            params = self._city_params(city, units)
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._get(url, params)
             
-            data = response.json()
+            return self._parse_current(response.json(), units)
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    async def aget_current_weather(self, city: str, units: str = "metric") -> Dict[str, Any]:
+        """Async variant of get_current_weather"""
+        import httpx  # imported with the async client, not at startup
+        try:
+            url = f"{self.base_url}/weather"
+            params = await self._acity_params(city, units)
             
-            # Extract relevant information
-            weather_info = {
-                "city": data["name"],
-                "country": data["sys"]["country"],
-                "temperature": data["main"]["temp"],
-                "feels_like": data["main"]["feels_like"],
-                "temp_min": data["main"]["temp_min"],
-                "temp_max": data["main"]["temp_max"],
-                "humidity": data["main"]["humidity"],
-                "pressure": data["main"]["pressure"],
-                "weather": data["weather"][0]["main"],
-                "description": data["weather"][0]["description"],
-                "wind_speed": data["wind"]["speed"],
-                "clouds": data["clouds"]["all"],
-                "units": "°C" if units == "metric" else "°F" if units == "imperial" else "K"
-            }
+            response = await self._aget(url, params)
             
-            return weather_info
+            return self._parse_current(response.json(), units)
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Weather API Error: {str(e)}")
     
-    def get_forecast(self, city: str, units: str = "metric") -> Dict[str, Any]:
+    def get_forecast(
+        self,
+        city: str,
+        units: str = "metric",
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None,
+        series: bool = False
+    ) -> Dict[str, Any]:
         """
-        Get 5-day weather forecast for a city
+        Get a daily weather forecast (up to 5 days) for a city
         
         Args:
             city: City name
             units: Temperature units
+            days: Horizon in days (defaults to FORECAST_DAYS)
+            aggregation: Daily temperature: mean, min, max, midday or first
+                (defaults to FORECAST_AGGREGATION)
+            series: Also return the raw 3-hour readings
         
         Returns:
-            Forecast information
+            Forecast information with one record per day
         """
+        aggregation, days = self.forecast_reducer.resolve(aggregation, days)
         try:
             url = f"{self.base_url}/forecast"
-            params = {
-                "q": city,
-                "appid": self.api_key,
-                "units": units
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            params = self._forecast_params(self._city_params(city, units), days)
             
-            data = response.json()
+            response = self._get(url, params)
             
-            # Extract forecast for next 5 days (taking one per day)
-            forecasts = []
-            seen_dates = set()
+            return self._parse_forecast(response.json(), units, days, aggregation, series)
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    async def aget_forecast(
+        self,
+        city: str,
+        units: str = "metric",
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None,
+        series: bool = False
+    ) -> Dict[str, Any]:
+        """Async variant of get_forecast"""
+        import httpx  # imported with the async client, not at startup
+        aggregation, days = self.forecast_reducer.resolve(aggregation, days)
+        try:
+            url = f"{self.base_url}/forecast"
+            params = self._forecast_params(await self._acity_params(city, units), days)
             
-            for item in data["list"]:
-                date = item["dt_txt"].split()[0]
-                if date not in seen_dates and len(forecasts) < 5:
-                    seen_dates.add(date)
-                    forecasts.append({
-                        "date": date,
-                        "temperature": item["main"]["temp"],
-                        "weather": item["weather"][0]["main"],
-                        "description": item["weather"][0]["description"]
-                    })
+            response = await self._aget(url, params)
             
-            return {
-                "city": data["city"]["name"],
-                "country": data["city"]["country"],
-                "forecasts": forecasts,
-                "units": "°C" if units == "metric" else "°F" if units == "imperial" else "K"
-            }
+            return self._parse_forecast(response.json(), units, days, aggregation, series)
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    def get_current_weather_at(self, lat: float, lon: float, units: str = "metric") -> Dict[str, Any]:
+        """
+        Get current weather at coordinates
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            units: Temperature units (metric, imperial, standard)
+        
+        Returns:
+            Weather information dictionary
+        """
+        try:
+            response = self._get(f"{self.base_url}/weather", self._coordinate_params(lat, lon, units))
+            return self._parse_current(response.json(), units)
         
         except requests.exceptions.RequestException as e:
             raise Exception(f"Weather API Error: {str(e)}")
+    
+    async def aget_current_weather_at(self, lat: float, lon: float, units: str = "metric") -> Dict[str, Any]:
+        """Async variant of get_current_weather_at"""
+        import httpx  # imported with the async client, not at startup
+        try:
+            response = await self._aget(f"{self.base_url}/weather", self._coordinate_params(lat, lon, units))
+            return self._parse_current(response.json(), units)
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    def get_forecast_at(
+        self,
+        lat: float,
+        lon: float,
+        units: str = "metric",
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None,
+        series: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get a daily weather forecast (up to 5 days) at coordinates
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            units: Temperature units
+            days: Horizon in days (defaults to FORECAST_DAYS)
+            aggregation: Daily temperature: mean, min, max, midday or first
+            series: Also return the raw 3-hour readings
+        
+        Returns:
+            Forecast information with one record per day
+        """
+        aggregation, days = self.forecast_reducer.resolve(aggregation, days)
+        try:
+            params = self._forecast_params(self._coordinate_params(lat, lon, units), days)
+            response = self._get(f"{self.base_url}/forecast", params)
+            return self._parse_forecast(response.json(), units, days, aggregation, series)
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    async def aget_forecast_at(
+        self,
+        lat: float,
+        lon: float,
+        units: str = "metric",
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None,
+        series: bool = False
+    ) -> Dict[str, Any]:
+        """Async variant of get_forecast_at"""
+        import httpx  # imported with the async client, not at startup
+        aggregation, days = self.forecast_reducer.resolve(aggregation, days)
+        try:
+            params = self._forecast_params(self._coordinate_params(lat, lon, units), days)
+            response = await self._aget(f"{self.base_url}/forecast", params)
+            return self._parse_forecast(response.json(), units, days, aggregation, series)
+        
+        except httpx.HTTPError as e:
+            raise Exception(f"Weather API Error: {str(e)}")
+    
+    def get_weather_batch(
+        self,
+        cities: List[str],
+        units: str = "metric",
+        forecast: bool = False,
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get current weather (or forecasts) for several cities concurrently
+        
+        Args:
+            cities: City names
+            units: Temperature units
+            forecast: Fetch daily forecasts instead of current weather
+            days: Forecast horizon in days
+            aggregation: Daily forecast temperature aggregation
+        
+        Returns:
+            One entry per city, in input order: {"query", "data"} on
+            success or {"query", "error"} if that city failed
+        """
+        if forecast:
+            aggregation, days = self.forecast_reducer.resolve(aggregation, days)
+            fetch = lambda city: self.get_forecast(city, units, days, aggregation)
+        else:
+            fetch = lambda city: self.get_current_weather(city, units)
+        
+        def one(city: str) -> Dict[str, Any]:
+            try:
+                return {"query": city, "data": fetch(city)}
+            except Exception as e:
+                return {"query": city, "error": str(e)}
+        
+        if len(cities) < 2:
+            return [one(city) for city in cities]
+        
+        with ThreadPoolExecutor(
+            max_workers=min(self.batch_concurrency, len(cities)),
+            thread_name_prefix="weather-batch"
+        ) as pool:
+            # Copy the caller's context so request spans attach to the current trace
+            futures = [pool.submit(contextvars.copy_context().run, one, city) for city in cities]
+            return [future.result() for future in futures]
+    
+    async def aget_weather_batch(
+        self,
+        cities: List[str],
+        units: str = "metric",
+        forecast: bool = False,
+        days: Optional[int] = None,
+        aggregation: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Async variant of get_weather_batch"""
+        if forecast:
+            aggregation, days = self.forecast_reducer.resolve(aggregation, days)
+            fetch = lambda city: self.aget_forecast(city, units, days, aggregation)
+        else:
+            fetch = lambda city: self.aget_current_weather(city, units)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        async def one(city: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {"query": city, "data": await fetch(city)}
+                except Exception as e:
+                    return {"query": city, "error": str(e)}
+        
+        return list(await asyncio.gather(*(one(city) for city in cities)))
+    
+    def _get(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """GET with retries on transient errors, failing fast while the circuit is open"""
+        return call_with_retry(lambda: self._get_once(url, params), self.retry_policy, self.breaker)
+    
+    async def _aget(self, url: str, params: Dict[str, Any]) -> "httpx.Response":
+        """Async variant of _get"""
+        return await acall_with_retry(lambda: self._aget_once(url, params), self.retry_policy, self.breaker)
+    
+    def _get_once(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """GET within the rate budget, waiting and retrying once if rate limited"""
+        # Query parameters stay out of the span; they carry the API key
+        with tracer.span("http.get", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                self.limiter.acquire()
+                response = self.http.session.get(url, params=params, timeout=10)
+                if not self.limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            return response
+    
+    async def _aget_once(self, url: str, params: Dict[str, Any]) -> "httpx.Response":
+        """Async variant of _get_once"""
+        with tracer.span("http.get", upstream=self.breaker.name, url=url) as span:
+            for attempt in range(2):
+                await self.limiter.aacquire()
+                response = await self.http.async_client.get(url, params=params, timeout=10)
+                if not self.limiter.update(response.status_code, response.headers) or attempt:
+                    break
+            span.set_attributes(status_code=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            return response
+    
+    def _params(self, city: str, units: str) -> Dict[str, Any]:
+        """Build query parameters for OpenWeather endpoints"""
+        return {
+            "q": city,
+            "appid": self.api_key,
+            "units": units
+        }
+    
+    def _coordinate_params(self, lat: float, lon: float, units: str) -> Dict[str, Any]:
+        """Build query parameters for a coordinate lookup"""
+        return {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": units
+        }
+    
+    def _geocode_params(self, city: str) -> Dict[str, Any]:
+        """Build query parameters for the geocoding endpoint"""
+        return {
+            "q": city,
+            "limit": 1,
+            "appid": self.api_key
+        }
+    
+    def _forecast_params(self, params: Dict[str, Any], days: int) -> Dict[str, Any]:
+        """Limit the forecast to the readings the horizon needs"""
+        params["cnt"] = self.forecast_reducer.readings_needed(days)
+        return params
+    
+    def _city_params(self, city: str, units: str) -> Dict[str, Any]:
+        """Coordinates for the city when geocoding is cached; otherwise look up by name"""
+        if self.geocode_cache is None:
+            return self._params(city, units)
+        location = self.geocode(city)
+        return self._coordinate_params(location["lat"], location["lon"], units)
+    
+    async def _acity_params(self, city: str, units: str) -> Dict[str, Any]:
+        """Async variant of _city_params"""
+        if await self._ageocode_cache() is None:
+            return self._params(city, units)
+        location = await self.ageocode(city)
+        return self._coordinate_params(location["lat"], location["lon"], units)
+    
+    async def _ageocode_cache(self):
+        """geocode_cache, opened on a worker thread so SQLite setup stays off the event loop"""
+        if self._geocode_cache is MISSING:
+            return await asyncio.to_thread(lambda: self.geocode_cache)
+        return self._geocode_cache
+    
+    async def _off_loop(self, func, *args):
+        """Run a geocode cache call on a worker thread unless the cache is in memory"""
+        if self._geocode_cache is None or isinstance(self._geocode_cache, MemoryCache):
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    
+    def _geocode_key(self, city: str) -> str:
+        """Normalized city name: case-folded, single spaces, no spaces around commas"""
+        return re.sub(r"\s*,\s*", ",", " ".join(city.split())).casefold()
+    
+    def _cached_location(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached coordinates for a normalized city name, if any"""
+        cache = self.geocode_cache
+        if cache is None:
+            return None
+        location = cache.get(key)
+        self.geocode_stats.record("city", location is not MISSING)
+        return location if location is not MISSING else None
+    
+    def _store_location(self, key: str, city: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Take the best geocoding match and cache it"""
+        if not results:
+            raise Exception(f"Weather API Error: city not found: {city}")
+        
+        match = results[0]
+        location = {
+            "name": match["name"],
+            "country": match.get("country"),
+            "lat": match["lat"],
+            "lon": match["lon"]
+        }
+        if self.geocode_cache is not None:
+            self.geocode_cache.set(key, location, self.geocode_ttl)
+        return location
+    
+    def _units_label(self, units: str) -> str:
+        """Display label for the requested units"""
+        return "°C" if units == "metric" else "°F" if units == "imperial" else "K"
+    
+    def _parse_current(self, data: Dict[str, Any], units: str) -> Dict[str, Any]:
+        """Extract relevant information from a current weather response"""
+        return {
+            "city": data["name"],
+            "country": data["sys"]["country"],
+            "temperature": data["main"]["temp"],
+            "feels_like": data["main"]["feels_like"],
+            "temp_min": data["main"]["temp_min"],
+            "temp_max": data["main"]["temp_max"],
+            "humidity": data["main"]["humidity"],
+            "pressure": data["main"]["pressure"],
+            "weather": data["weather"][0]["main"],
+            "description": data["weather"][0]["description"],
+            "wind_speed": data["wind"]["speed"],
+            "clouds": data["clouds"]["all"],
+            "units": self._units_label(units)
+        }
+    
+    def _parse_forecast(
+        self,
+        data: Dict[str, Any],
+        units: str,
+        days: int,
+        aggregation: str,
+        series: bool = False
+    ) -> Dict[str, Any]:
+        """Summarize the 3-hour readings per local day, optionally keeping the raw series"""
+        city = data["city"]
+        forecast = {
+            "city": city["name"],
+            "country": city["country"],
+            "forecasts": self.forecast_reducer.reduce(data["list"], city.get("timezone", 0), aggregation, days),
+            "aggregation": aggregation,
+            "units": self._units_label(units)
+        }
+        if series:
+            forecast["series"] = self.forecast_reducer.series(data["list"], days)
+        return forecast
 
 
 # Singleton instance
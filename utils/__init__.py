@@ -0,0 +1,25 @@
+from .config import load_config
+
+# Settings must be in the environment before any module reads them
+load_config()
+
+from .http_pool import http_pool, HTTPPool
+from .cache import MemoryCache, SQLiteCache, create_cache_backend
+from .single_flight import SingleFlight
+from .rate_limiter import rate_limits, RateLimiter, RateLimitScheduler, request_priority
+from .metrics import metrics, MetricsRegistry
+from .resilience import (
+    circuit_breakers, CircuitBreaker, CircuitOpenError, RetryPolicy,
+    call_with_retry, acall_with_retry
+)
+
+__all__ = [
+    'load_config',
+    'http_pool', 'HTTPPool',
+    'MemoryCache', 'SQLiteCache', 'create_cache_backend',
+    'SingleFlight',
+    'rate_limits', 'RateLimiter', 'RateLimitScheduler', 'request_priority',
+    'metrics', 'MetricsRegistry',
+    'circuit_breakers', 'CircuitBreaker', 'CircuitOpenError', 'RetryPolicy',
+    'call_with_retry', 'acall_with_retry'
+]
@@ -0,0 +1,231 @@
+"""
+TTL + LRU cache backends
+
+MemoryCache keeps entries in-process; SQLiteCache persists them to disk
+so they survive restarts. Both store JSON-serializable values.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from utils.metrics import metrics
+
+MISSING = object()
+
+CACHE_LOOKUPS = metrics.counter(
+    "cache_lookups_total", "Cache lookups by cache, label and result", ["cache", "label", "result"]
+)
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value, or MISSING if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, payload = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+        # Values are stored serialized so callers can't mutate cached data
+        return json.loads(payload)
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds"""
+        payload = json.dumps(value)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        """Number of unexpired entries"""
+        now = time.time()
+        with self._lock:
+            return sum(1 for expires_at, _ in self._entries.values() if expires_at >= now)
+
+
+class SQLiteCache:
+    # Hits are remembered in memory and written in one batch, not committed one by one
+    TOUCH_BATCH = 256
+    
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value, or MISSING if absent or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING
+            if row[1] < now:
+                self._touched.pop(key, None)
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return MISSING
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._flush_touches()
+                self._conn.commit()
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds"""
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+    
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        """Number of unexpired entries"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+    
+    def _flush_touches(self):
+        """Write the access times of recent hits (the caller commits)"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+    
+    def _evict(self, now: float):
+        """Drop expired rows, then least recently used rows over max_entries"""
+        self._flush_touches()
+        self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+def create_cache_backend(
+    backend: str,
+    path: Optional[str] = None,
+    max_entries: int = 1024
+):
+    """
+    Build a cache backend by name
+    
+    Args:
+        backend: "memory", "sqlite" or "none"
+        path: Database file for the sqlite backend
+        max_entries: LRU size bound
+    
+    Returns:
+        Cache backend, or None when caching is disabled
+    """
+    backend = backend.lower()
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return SQLiteCache(path or os.path.join(".cache", "cache.sqlite3"), max_entries)
+    if backend == "memory":
+        return MemoryCache(max_entries)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters, optionally broken down by label"""
+    
+    def __init__(self, name: str = "cache"):
+        """
+        Args:
+            name: Cache name used in exported metrics
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+    
+    def record(self, label: str, hit: bool):
+        with self._lock:
+            counts = self._counts.setdefault(label, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+        CACHE_LOOKUPS.inc(cache=self.name, label=label, result="hit" if hit else "miss")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_label = {label: dict(counts) for label, counts in self._counts.items()}
+        hits = sum(c["hits"] for c in by_label.values())
+        misses = sum(c["misses"] for c in by_label.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "by_label": by_label
+        }
@@ -0,0 +1,33 @@
+"""
+Process configuration
+
+Settings come from environment variables; a .env file in the working
+directory fills in any that are not already set. The file is read once
+per process, before any module reads its settings.
+"""
+import threading
+from typing import Optional
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_config(path: Optional[str] = None, override: bool = False) -> bool:
+    """
+    Load .env into the environment, once per process
+    
+    Args:
+        path: .env file to read (found by searching upwards from the project if omitted)
+        override: Replace variables that are already set; forces a reload
+    
+    Returns:
+        True if this call read the file
+    """
+    global _loaded
+    with _lock:
+        if _loaded and not override:
+            return False
+        from dotenv import load_dotenv
+        load_dotenv(path, override=override)
+        _loaded = True
+        return True
@@ -0,0 +1,153 @@
+"""
+Shared HTTP connection pool for tools and LLM providers
+
+Keeps TCP/TLS connections alive between calls so repeated requests to
+GitHub, OpenWeather and Ollama skip the handshake.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class HTTPPool:
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None
+    ):
+        """
+        Args:
+            pool_connections: Number of per-host pools to keep
+            pool_maxsize: Maximum connections kept alive per host
+            keepalive_expiry: Seconds an idle async connection is kept open
+        """
+        self.pool_connections = pool_connections or int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+        self.pool_maxsize = pool_maxsize or int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        
+        self._lock = threading.Lock()
+        self._requests_by_host: Dict[str, int] = defaultdict(int)
+        self._session: Optional[requests.Session] = None
+        # httpx clients are bound to the loop they were created in, and
+        # asyncio.run() starts a new loop each time, so keep one per loop
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @property
+    def session(self) -> requests.Session:
+        """Pooled requests session (created on first use)"""
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+    
+    @property
+    def async_client(self) -> "httpx.AsyncClient":
+        """Pooled httpx async client for the running event loop (imported and created on first use)"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            import httpx
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_connections * self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                event_hooks={"request": [self._acount_request]}
+            )
+            self._async_clients[loop] = client
+        return client
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Connection pool statistics for monitoring
+        
+        Returns:
+            Pool configuration, request counts per host and open sync connections
+        """
+        with self._lock:
+            requests_by_host = dict(self._requests_by_host)
+        
+        connections_by_host = {}
+        if self._session is not None:
+            adapter = self._session.get_adapter("https://")
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                connections_by_host[host] = {
+                    "opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+                }
+        
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "keepalive_expiry": self.keepalive_expiry,
+            "requests_by_host": requests_by_host,
+            "sync_connections": connections_by_host,
+            "async_clients_open": sum(1 for client in list(self._async_clients.values()) if not client.is_closed)
+        }
+    
+    def close(self):
+        """Close the sync session"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    async def aclose(self):
+        """Close the running loop's async client"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    def _build_session(self) -> requests.Session:
+        """Create a session with pooled adapters"""
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            # utils.resilience.RetryPolicy is the only retry layer; retrying
+            # here as well would multiply attempts per logical call
+            max_retries=Retry(total=0, raise_on_status=False)
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].append(self._count_response)
+        return session
+    
+    def _count_request(self, url: str):
+        """Record a request against its host"""
+        parts = urlsplit(str(url))
+        with self._lock:
+            self._requests_by_host[f"{parts.scheme}://{parts.netloc}"] += 1
+    
+    def _count_response(self, response: requests.Response, *args, **kwargs):
+        """requests response hook"""
+        self._count_request(response.request.url)
+    
+    async def _acount_request(self, request: "httpx.Request"):
+        """httpx request event hook"""
+        self._count_request(request.url)
+
+
+# Singleton instance
+http_pool = HTTPPool()
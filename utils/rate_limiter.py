@@ -0,0 +1,209 @@
+"""
+Rate-limit-aware scheduling for upstream APIs
+
+Each upstream (GitHub search, GitHub core, OpenWeather) gets a token
+bucket sized to its published limits. Calls wait for a token instead of
+failing, the bucket is corrected from X-RateLimit-* / Retry-After
+response headers, and batch traffic yields to interactive traffic.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from typing import Dict, Any, Mapping, Optional
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+# Priority of the current request; batch processing sets this to BATCH
+request_priority: contextvars.ContextVar = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        per_minute: float,
+        burst: Optional[float] = None,
+        batch_reserve: float = 0.2,
+        max_wait: float = 30.0
+    ):
+        """
+        Args:
+            name: Upstream name, used in errors and stats
+            per_minute: Sustained request rate
+            burst: Bucket capacity (defaults to one minute of requests)
+            batch_reserve: Fraction of the bucket batch traffic may not use
+            max_wait: Longest a call will queue before giving up (seconds)
+        """
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = burst or max(1.0, per_minute)
+        self.batch_reserve = self.capacity * batch_reserve
+        self.max_wait = max_wait
+        
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting = {INTERACTIVE: 0, BATCH: 0}
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._delayed = 0
+        self._rate_limited = 0
+    
+    def acquire(self, priority: Optional[str] = None):
+        """Block until a request may be sent"""
+        priority = priority or request_priority.get()
+        deadline = time.monotonic() + self.max_wait
+        self._set_waiting(priority, 1)
+        try:
+            while True:
+                delay = self._try_acquire(priority)
+                if delay == 0:
+                    return
+                self._check_deadline(delay, deadline)
+                time.sleep(min(delay, 1.0))
+        finally:
+            self._set_waiting(priority, -1)
+    
+    async def aacquire(self, priority: Optional[str] = None):
+        """Async variant of acquire"""
+        priority = priority or request_priority.get()
+        deadline = time.monotonic() + self.max_wait
+        self._set_waiting(priority, 1)
+        try:
+            while True:
+                delay = self._try_acquire(priority)
+                if delay == 0:
+                    return
+                self._check_deadline(delay, deadline)
+                await asyncio.sleep(min(delay, 1.0))
+        finally:
+            self._set_waiting(priority, -1)
+    
+    def update(self, status_code: int, headers: Mapping[str, str]) -> bool:
+        """
+        Sync the bucket with the upstream's rate-limit headers
+        
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+        
+        Returns:
+            True if the response was a rate-limit rejection worth retrying
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        retry_after = headers.get("Retry-After")
+        now = time.monotonic()
+        
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self._remaining = int(remaining)
+                self._tokens = min(self._tokens, float(self._remaining))
+            if reset is not None and reset.isdigit():
+                self._reset_at = float(reset)
+            
+            if self._remaining == 0 and self._reset_at is not None:
+                self._blocked_until = max(self._blocked_until, now + max(0.0, self._reset_at - time.time()))
+            if retry_after is not None and retry_after.isdigit():
+                self._blocked_until = max(self._blocked_until, now + float(retry_after))
+            
+            limited = status_code == 429 or (
+                status_code == 403 and (self._remaining == 0 or retry_after is not None)
+            )
+            if limited:
+                self._rate_limited += 1
+                if self._blocked_until <= now:
+                    # Rejected without guidance: back off for one token's worth of time
+                    self._blocked_until = now + 1.0 / self.rate
+            return limited
+    
+    def refund(self):
+        """Return a token for a response the upstream did not count against its quota (e.g. 304 Not Modified)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + 1.0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current budget for monitoring"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "tokens": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "per_minute": round(self.rate * 60, 2),
+                "upstream_remaining": self._remaining,
+                "upstream_reset": self._reset_at,
+                "blocked_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+                "waiting": dict(self._waiting),
+                "delayed": self._delayed,
+                "rate_limited_responses": self._rate_limited
+            }
+    
+    def _try_acquire(self, priority: str) -> float:
+        """Take a token if allowed; otherwise return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            if self._blocked_until > now:
+                delay = self._blocked_until - now
+            elif priority == BATCH and self._waiting[INTERACTIVE]:
+                delay = 0.05
+            else:
+                needed = 1.0 + (self.batch_reserve if priority == BATCH else 0.0)
+                if self._tokens >= needed:
+                    self._tokens -= 1.0
+                    return 0
+                delay = (needed - self._tokens) / self.rate
+            
+            self._delayed += 1
+            return delay
+    
+    def _refill(self, now: float):
+        """Add tokens for elapsed time; caller holds the lock"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def _set_waiting(self, priority: str, delta: int):
+        with self._lock:
+            self._waiting[priority] = self._waiting.get(priority, 0) + delta
+    
+    def _check_deadline(self, delay: float, deadline: float):
+        if time.monotonic() + delay > deadline:
+            raise Exception(f"Rate limit budget exhausted for {self.name}: retry in {delay:.0f}s")
+
+
+class RateLimitScheduler:
+    """Registry of per-upstream rate limiters"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, RateLimiter] = {}
+    
+    def register(self, name: str, per_minute: float, burst: Optional[float] = None) -> RateLimiter:
+        """Create (or return the existing) limiter for an upstream"""
+        with self._lock:
+            if name not in self._limiters:
+                self._limiters[name] = RateLimiter(
+                    name,
+                    per_minute,
+                    burst,
+                    max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+                )
+            return self._limiters[name]
+    
+    def get(self, name: str) -> RateLimiter:
+        return self._limiters[name]
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+# Singleton instance
+rate_limits = RateLimitScheduler()
@@ -0,0 +1,283 @@
+"""
+Retry with exponential backoff and per-upstream circuit breakers
+
+Transient failures (timeouts, connection errors, retryable HTTP status
+codes) are retried with jittered exponential backoff. Each upstream has
+a circuit breaker that opens after repeated transient failures and fails
+calls fast until a recovery probe succeeds, so a dead upstream doesn't
+tie up workers waiting on timeouts.
+"""
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+import requests
+
+from utils.metrics import metrics
+
+UPSTREAM_EVENTS = metrics.counter(
+    "upstream_events_total", "Upstream retries, transient failures, fast-failed calls and circuit openings", ["upstream", "event"]
+)
+CIRCUIT_OPEN = metrics.gauge(
+    "circuit_breaker_open", "1 while an upstream's circuit is open", ["upstream"]
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status carried by a requests/httpx/SDK exception, if any"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether an error, or one it was raised from, is an HTTP 429 or an SDK rate-limit error"""
+    while error is not None:
+        if _status_code(error) == 429 or type(error).__name__ in ("RateLimitError", "ResourceExhausted"):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _is_transport_error(error: Exception) -> bool:
+    """Timeouts and connection failures, including SDK equivalents"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    # httpx is only imported once the async client is in use
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        retry_on_status: Iterable[int] = (429, 500, 502, 503, 504)
+    ):
+        """
+        Args:
+            max_attempts: Total attempts including the first (RETRY_MAX_ATTEMPTS)
+            base_delay: Delay before the first retry in seconds (RETRY_BASE_DELAY)
+            max_delay: Upper bound on any delay (RETRY_MAX_DELAY)
+            retry_on_status: HTTP status codes worth retrying
+        """
+        self.max_attempts = max(1, max_attempts or int(os.getenv("RETRY_MAX_ATTEMPTS", "3")))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("RETRY_MAX_DELAY", "8"))
+        self.retry_on_status = frozenset(retry_on_status)
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether an error is transient"""
+        if isinstance(error, CircuitOpenError):
+            return False
+        status = _status_code(error)
+        if status is not None:
+            return status in self.retry_on_status
+        return _is_transport_error(error)
+    
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            name: Upstream name
+            failure_threshold: Consecutive transient failures that open the circuit
+            recovery_timeout: Seconds to stay open before letting a probe through
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.recovery_timeout = recovery_timeout or float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+        
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counts = {"calls": 0, "failures": 0, "retries": 0, "rejected": 0, "opened": 0}
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected"""
+        with self._lock:
+            if self._state == self.OPEN:
+                return time.monotonic() - self._opened_at < self.recovery_timeout
+            return self._state == self.HALF_OPEN and self._probe_in_flight
+    
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError unless a call may proceed
+        
+        Returns:
+            True if this call is the recovery probe; it must end in
+            record_success, record_failure or release
+        """
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            
+            if self._state == self.OPEN or (self._state == self.HALF_OPEN and self._probe_in_flight):
+                self._counts["rejected"] += 1
+                UPSTREAM_EVENTS.inc(upstream=self.name, event="rejected")
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+                raise CircuitOpenError(f"Circuit open for {self.name}: failing fast (retry in {retry_in:.0f}s)")
+            
+            probe = self._state == self.HALF_OPEN
+            if probe:
+                self._probe_in_flight = True
+            self._counts["calls"] += 1
+            return probe
+    
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                CIRCUIT_OPEN.set(0, upstream=self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._counts["failures"] += 1
+            UPSTREAM_EVENTS.inc(upstream=self.name, event="failure")
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._counts["opened"] += 1
+                    UPSTREAM_EVENTS.inc(upstream=self.name, event="opened")
+                    CIRCUIT_OPEN.set(1, upstream=self.name)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+    
+    def release(self):
+        """Free the probe slot without a verdict, e.g. when the probe was cancelled"""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_retry(self):
+        with self._lock:
+            self._counts["retries"] += 1
+        UPSTREAM_EVENTS.inc(upstream=self.name, event="retry")
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, **self._counts}
+
+
+class CircuitBreakerRegistry:
+    """One breaker per upstream name"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+    
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name)
+            return self._breakers[name]
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+
+def call_with_retry(fn: Callable[[], Any], policy: RetryPolicy, breaker: CircuitBreaker) -> Any:
+    """
+    Call fn through the circuit breaker, retrying transient failures
+    
+    Args:
+        fn: Zero-argument function performing one attempt
+        policy: Retry policy
+        breaker: Circuit breaker for the upstream
+    
+    Returns:
+        Result of the first successful attempt
+    """
+    attempt = 0
+    while True:
+        probe = breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            retryable = policy.is_retryable(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                # The upstream answered; the request itself was bad
+                breaker.record_success()
+            attempt += 1
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            breaker.record_retry()
+            time.sleep(policy.delay(attempt))
+            continue
+        except BaseException:
+            # Interrupted, so no verdict on the upstream; don't hold the probe slot forever
+            if probe:
+                breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+
+async def acall_with_retry(fn: Callable[[], Awaitable[Any]], policy: RetryPolicy, breaker: CircuitBreaker) -> Any:
+    """Async variant of call_with_retry"""
+    attempt = 0
+    while True:
+        probe = breaker.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            retryable = policy.is_retryable(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            attempt += 1
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            breaker.record_retry()
+            await asyncio.sleep(policy.delay(attempt))
+            continue
+        except BaseException:
+            # Cancelled (step timeout, losing hedge): free the probe slot
+            if probe:
+                breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+
+# Singleton instance
+circuit_breakers = CircuitBreakerRegistry()
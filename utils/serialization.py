@@ -0,0 +1,181 @@
+"""
+Response serialization, field projection and compression
+
+JSON is written straight to bytes with orjson when it is installed (the
+standard library json module otherwise). Responses are compressed with
+zstd (when the zstandard package is installed) or gzip, whichever the
+client accepts, and only above a minimum size.
+"""
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Preferred first when the client weighs several encodings equally
+ENCODINGS = ("zstd", "gzip")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Minified UTF-8 JSON
+    
+    Args:
+        value: JSON-compatible value; other types are written as str()
+    
+    Returns:
+        Encoded bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a comma-separated list of dotted paths into a projection tree
+    
+    Args:
+        fields: e.g. "verification,data.step" (None or empty keeps everything)
+    
+    Returns:
+        Nested dict where an empty dict keeps the whole value, or None
+    """
+    if not fields:
+        return None
+    tree: Dict[str, Any] = {}
+    for path in fields.split(","):
+        keys = [key for key in path.strip().split(".") if key]
+        node = tree
+        for key in keys[:-1]:
+            if key in node and not node[key]:
+                break  # A shorter path already keeps the whole value
+            node = node.setdefault(key, {})
+        else:
+            if keys:
+                node[keys[-1]] = {}
+    return tree or None
+
+
+def project(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    """
+    Keep only the fields in a projection tree; lists are projected per item
+    
+    Args:
+        value: Decoded JSON value
+        tree: From parse_fields (None keeps everything)
+    
+    Returns:
+        The projected value; missing fields are left out
+    """
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub_tree) for key, sub_tree in tree.items() if key in value}
+    return value
+
+
+class ResponseEncoder:
+    def __init__(
+        self,
+        encodings: Optional[Iterable[str]] = None,
+        min_bytes: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        zstd_level: Optional[int] = None
+    ):
+        """
+        Args:
+            encodings: Encodings the server may use (API_COMPRESSION, comma-separated; none disables)
+            min_bytes: Smaller bodies go out uncompressed (API_COMPRESSION_MIN_BYTES)
+            gzip_level: gzip level 1-9 (API_GZIP_LEVEL)
+            zstd_level: zstd level 1-22 (API_ZSTD_LEVEL)
+        """
+        if encodings is None:
+            encodings = os.getenv("API_COMPRESSION", ",".join(ENCODINGS)).split(",")
+        enabled = {encoding.strip().lower() for encoding in encodings}
+        # zstd is only offered when its package is installed
+        self.encodings = [
+            encoding for encoding in ENCODINGS
+            if encoding in enabled and (encoding != "zstd" or zstandard is not None)
+        ]
+        self.min_bytes = min_bytes if min_bytes is not None else int(os.getenv("API_COMPRESSION_MIN_BYTES", "1024"))
+        self.gzip_level = gzip_level or int(os.getenv("API_GZIP_LEVEL", "5"))
+        self.zstd_level = zstd_level or int(os.getenv("API_ZSTD_LEVEL", "3"))
+    
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """
+        Pick an encoding from an Accept-Encoding header
+        
+        Args:
+            accept_encoding: Header value, e.g. "gzip, zstd;q=0.9"
+        
+        Returns:
+            The accepted encoding with the highest weight, or None for identity
+        """
+        if not accept_encoding or not self.encodings:
+            return None
+        
+        weights: Dict[str, float] = {}
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            weight = 1.0
+            for param in params.split(";"):
+                key, _, number = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        weight = float(number)
+                    except ValueError:
+                        weight = 0.0
+            weights[name.strip().lower()] = weight
+        
+        wildcard = weights.get("*", 0.0)
+        ranked: List[Tuple[float, int, str]] = [
+            (weights.get(encoding, wildcard), -i, encoding) for i, encoding in enumerate(self.encodings)
+        ]
+        weight, _, encoding = max(ranked)
+        return encoding if weight > 0 else None
+    
+    def encode(self, value: Any, accept_encoding: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+        """
+        Serialize and, if the client accepts it and the body is large enough, compress
+        
+        Args:
+            value: JSON-compatible value
+            accept_encoding: Request's Accept-Encoding header
+        
+        Returns:
+            (body, content encoding or None)
+        """
+        return self.compress(dumps(value), accept_encoding)
+    
+    def compress(self, body: bytes, accept_encoding: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+        """
+        Compress an encoded body for the client
+        
+        Args:
+            body: Serialized response
+            accept_encoding: Request's Accept-Encoding header
+        
+        Returns:
+            (body, content encoding or None)
+        """
+        if len(body) < self.min_bytes:
+            return body, None
+        encoding = self.negotiate(accept_encoding)
+        if encoding == "zstd":
+            # Compressor objects are not thread-safe; they are cheap to create
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body), encoding
+        if encoding == "gzip":
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0), encoding
+        return body, None
@@ -0,0 +1,123 @@
+"""
+Single-flight request coalescing
+
+Concurrent calls with the same key share one execution: the first caller
+runs the function, later callers wait for and receive its result (or its
+exception). Nothing is kept once the call finishes, so this complements
+rather than replaces caching.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, asyncio.Future] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+    
+    def do(self, key: str, fn: Callable[[], Any], label: str = "default") -> Any:
+        """
+        Run fn, or wait for an identical in-flight call from another thread
+        
+        Args:
+            key: Identity of the call
+            fn: Zero-argument function performing the call
+            label: Counter bucket (e.g. tool name)
+        
+        Returns:
+            Result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._record(label, coalesced=not leader)
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]], label: str = "default") -> Any:
+        """
+        Async variant of do for coroutines sharing an event loop
+        
+        Args:
+            key: Identity of the call
+            fn: Zero-argument function returning the awaitable call
+            label: Counter bucket (e.g. tool name)
+        
+        Returns:
+            Result of the shared call
+        """
+        loop = asyncio.get_running_loop()
+        
+        with self._lock:
+            future = self._async_calls.get(key)
+            leader = future is None or future.get_loop() is not loop
+            if leader:
+                future = self._async_calls[key] = loop.create_future()
+            self._record(label, coalesced=not leader)
+        
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+        
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Followers didn't ask to be cancelled; give them an ordinary error
+            future.set_exception(Exception("Coalesced call was cancelled"))
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when there are no followers
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._async_calls.get(key) is future:
+                    del self._async_calls[key]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Executed vs coalesced call counts"""
+        with self._lock:
+            by_label = {label: dict(counts) for label, counts in self._counts.items()}
+        return {
+            "executed": sum(c["executed"] for c in by_label.values()),
+            "coalesced": sum(c["coalesced"] for c in by_label.values()),
+            "by_label": by_label
+        }
+    
+    def _record(self, label: str, coalesced: bool):
+        """Update counters; caller holds the lock"""
+        counts = self._counts.setdefault(label, {"executed": 0, "coalesced": 0})
+        counts["coalesced" if coalesced else "executed"] += 1
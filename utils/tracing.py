@@ -0,0 +1,245 @@
+"""
+Lightweight request tracing
+
+Spans nest through a context variable, so child spans opened in asyncio
+tasks or context-copying worker threads attach to the active request.
+When a root span ends, its whole trace is handed to the configured
+exporter: OTLP/HTTP JSON for a collector (Jaeger, Tempo, ...), a local
+JSON-lines file, or a console tree for development.
+"""
+import contextvars
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class _Trace:
+    """Spans collected for one trace until its root span ends"""
+    
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List["Span"] = []
+        self.lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, name: str, trace: _Trace, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+    
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+    
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+    
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span in the OTLP JSON encoding"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def otlp_payload(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """ExportTraceServiceRequest body for a batch of spans"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": "ai-operations-assistant"},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class ConsoleExporter:
+    """Print each finished trace as an indented tree"""
+    
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+    
+    def export(self, spans: List[Span]):
+        children: Dict[Optional[str], List[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+        
+        lines = [f"trace {spans[0].trace_id}"]
+        
+        def walk(parent_id: Optional[str], depth: int):
+            for span in sorted(children.get(parent_id, []), key=lambda s: s.start_ns):
+                status = f" ERROR {span.error}" if span.error else ""
+                attributes = " ".join(f"{k}={v}" for k, v in span.attributes.items() if v is not None)
+                lines.append(f"{'  ' * depth}- {span.name} {span.duration_ms:.1f}ms {attributes}{status}")
+                walk(span.span_id, depth + 1)
+        
+        walk(None, 1)
+        print("\n".join(lines), flush=True)
+
+
+class FileExporter:
+    """Append one OTLP JSON document per trace to a JSON-lines file"""
+    
+    def __init__(self, service_name: str, path: str):
+        self.service_name = service_name
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def export(self, spans: List[Span]):
+        line = json.dumps(otlp_payload(spans, self.service_name), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class OTLPExporter:
+    """
+    POST traces to an OTLP/HTTP collector endpoint (JSON encoding)
+    
+    Export runs on a background thread so requests never wait on the
+    collector; traces are dropped if the queue is full.
+    """
+    
+    def __init__(self, service_name: str, endpoint: str, max_queue: int = 1000):
+        self.service_name = service_name
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._worker.start()
+    
+    def export(self, spans: List[Span]):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass
+    
+    def _run(self):
+        from utils.http_pool import http_pool
+        while True:
+            spans = self._queue.get()
+            try:
+                http_pool.session.post(self.url, json=otlp_payload(spans, self.service_name), timeout=5)
+            except Exception:
+                pass
+
+
+def create_exporter(kind: Optional[str] = None, service_name: Optional[str] = None):
+    """
+    Build the exporter named by TRACING_EXPORTER (none, console, file, otlp)
+    
+    Returns:
+        Exporter instance, or None when tracing export is disabled
+    """
+    kind = (kind or os.getenv("TRACING_EXPORTER", "none")).lower()
+    service_name = service_name or os.getenv("OTEL_SERVICE_NAME", "ai-operations-assistant")
+    if kind == "console":
+        return ConsoleExporter(service_name)
+    if kind == "file":
+        return FileExporter(service_name, os.getenv("TRACING_FILE", ".cache/traces.jsonl"))
+    if kind == "otlp":
+        endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+        return OTLPExporter(service_name, endpoint)
+    if kind in ("none", ""):
+        return None
+    raise ValueError(f"Unknown tracing exporter: {kind}")
+
+
+class Tracer:
+    def __init__(self, exporter: Any = None):
+        """
+        Args:
+            exporter: Object with export(spans); None keeps trace ids but exports nothing
+        """
+        self.exporter = exporter
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        Open a span as a child of the current one (or as a new root)
+        
+        Exceptions mark the span as failed and propagate.
+        """
+        parent = _current_span.get()
+        span = Span(name, parent.trace if parent else _Trace(), parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span, is_root=parent is None)
+    
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+    
+    def set_attributes(self, **attributes):
+        """Set attributes on the current span, if there is one"""
+        span = _current_span.get()
+        if span is not None:
+            span.set_attributes(**attributes)
+    
+    def _finish(self, span: Span, is_root: bool):
+        trace = span.trace
+        with trace.lock:
+            trace.spans.append(span)
+            if not is_root:
+                return
+            spans, trace.spans = trace.spans, []
+        
+        if self.exporter is not None:
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                pass
+
+
+# Singleton instance
+tracer = Tracer(create_exporter())